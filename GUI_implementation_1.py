@@ -270,6 +270,7 @@ def create_calculator():
 
 
 # Uncomment to run: create_calculator()
+# A runnable version with an expression engine: calculator.py
 
 
 EXAMPLE 3: TO-DO LIST APPLICATION
@@ -382,6 +383,7 @@ def create_todo_app():
 
 
 # Uncomment to run: create_todo_app()
+# A runnable version with incremental list updates: todo_app.py
 
 
 EXAMPLE 4: TEXT EDITOR APPLICATION
@@ -505,6 +507,7 @@ def create_text_editor():
 
 
 # Uncomment to run: create_text_editor()
+# A runnable version that pages through multi-GB files: text_editor.py
 
 EXAMPLE 5: STUDENT GRADE CALCULATOR
 ===================================
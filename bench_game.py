@@ -0,0 +1,142 @@
+"""Throughput and latency benchmarks for the guessing game engine.
+
+Measures, single-threaded and without any terminal or GUI:
+
+* games_per_sec       whole games played by the batch simulator
+* guess_latency_ns    time to handle one valid guess (submit_guess)
+* validation_ns       cost of the out-of-range and not-a-number paths
+* session_memory      bytes held per active server Session / GuessingGame
+
+Results are printed (or written with --output) as JSON, tagged with the
+current git commit so runs can be compared across commits.
+
+Example:
+    python bench_game.py --output bench_output.json
+    python bench_game.py --quick
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from game_server import Session
+from game_simulator import STRATEGIES, simulate
+from secret_stream import SecretStream
+from simple_game import DIFFICULTIES, GuessingGame, submit_guess
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    count = len(samples)
+    return {
+        "mean": sum(samples) / count,
+        "p50": samples[count // 2],
+        "p99": samples[min(count - 1, int(count * 0.99))],
+    }
+
+
+def bench_games_per_sec(games):
+    """Games/sec of the simulator for each difficulty with bisection, the optimal strategy."""
+    results = {}
+    for name, max_number in DIFFICULTIES.values():
+        start = time.perf_counter()
+        simulate(STRATEGIES["bisection"], games, max_number, seed=0)
+        results[name] = games / (time.perf_counter() - start)
+    return results
+
+
+def bench_guess_latency(samples):
+    """Per-call latency of submit_guess on valid, always-wrong guesses."""
+    clock = time.perf_counter_ns
+    secrets = SecretStream(500, seed=0)
+    game = GuessingGame(500, secret_number=next(secrets))
+    timings = []
+    for _ in range(samples):
+        if game.over:
+            game.reset(next(secrets))
+        # Guess 1 or 500 so most calls take the low/high path
+        text = "1" if game.secret_number != 1 else "500"
+        start = clock()
+        submit_guess(game, text)
+        timings.append(clock() - start)
+    return percentiles(timings)
+
+
+def bench_validation(iterations):
+    """Average ns per submit_guess for valid, out-of-range and non-numeric input."""
+    game = GuessingGame(500, max_attempts=iterations + 1, secret_number=250)
+    results = {}
+    for label, text in (("valid", "1"), ("out_of_range", "9999"), ("not_a_number", "abc")):
+        game.reset(250)
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            submit_guess(game, text)
+        results[label] = (time.perf_counter_ns() - start) / iterations
+    results["out_of_range_overhead"] = results["out_of_range"] / results["valid"]
+    results["not_a_number_overhead"] = results["not_a_number"] / results["valid"]
+    return results
+
+
+def bench_session_memory(sessions):
+    """Bytes per active game_server.Session with a game in progress."""
+    rng = SecretStream(500, seed=0)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    active = []
+    for _ in range(sessions):
+        session = Session()
+        session.game = GuessingGame(500, secret_number=next(rng))
+        active.append(session)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return {
+        "sessions": sessions,
+        "bytes_per_session": used / sessions,
+        "shallow_session_bytes": sys.getsizeof(active[0]),
+        "shallow_game_bytes": sys.getsizeof(active[0].game),
+    }
+
+
+def run(quick=False):
+    scale = 10 if quick else 1
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "games_per_sec": bench_games_per_sec(200_000 // scale),
+        "guess_latency_ns": bench_guess_latency(1_000_000 // scale),
+        "validation_ns": bench_validation(1_000_000 // scale),
+        "session_memory": bench_session_memory(100_000 // scale),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the guessing game engine.")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--quick", action="store_true", help="10x fewer iterations")
+    args = parser.parse_args()
+
+    results = json.dumps(run(args.quick), indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(results + "\n")
+    else:
+        print(results)
+
+
+if __name__ == "__main__":
+    main()
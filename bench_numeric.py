@@ -0,0 +1,80 @@
+"""Cost of each calculator numeric backend on large batches.
+
+For every backend in calc_numeric and every operation, parses a batch of
+decimal strings and runs calculate_batch over it. Two input sets are used:
+"binary" values that are exact in floating point (multiples of 1/4) and
+"decimal" values with two decimal places, like prices, which are not.
+The auto backend stays on the float path for the first and escalates for
+the second.
+
+Results are printed (or written with --output) as JSON, like bench_game.py.
+
+Example:
+    python bench_numeric.py --size 1000000 --output bench_numeric.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import time
+
+from bench_game import git_commit
+from calc_numeric import BACKENDS, OPERATORS, make_backend
+
+
+def make_inputs(size, kind, seed=0):
+    """size (a, b) string pairs; b is never zero."""
+    rng = random.Random(seed)
+    if kind == "binary":
+        values = [str(rng.randint(1, 400_000) / 4) for _ in range(2 * size)]
+    else:
+        values = [f"{rng.randint(1, 10_000_000) / 100:.2f}" for _ in range(2 * size)]
+    return values[:size], values[size:]
+
+
+def bench_backend(name, a_text, b_text):
+    backend = make_backend(name)
+    start = time.perf_counter()
+    a_values = [backend.parse(text) for text in a_text]
+    b_values = [backend.parse(text) for text in b_text]
+    result = {"parse_ns": (time.perf_counter() - start) * 1e9 / (2 * len(a_text))}
+    for operation in OPERATORS:
+        start = time.perf_counter()
+        backend.calculate_batch(operation, a_values, b_values)
+        result[f"{operation}_ns"] = (time.perf_counter() - start) * 1e9 / len(a_text)
+    if name == "auto":
+        result["escalations"] = backend.escalations
+    return result
+
+
+def run(size):
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "size": size,
+    }
+    for kind in ("binary", "decimal"):
+        a_text, b_text = make_inputs(size, kind)
+        results[kind] = {name: bench_backend(name, a_text, b_text) for name in BACKENDS}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the calculator numeric backends.")
+    parser.add_argument("--size", type=int, default=200_000, help="operand pairs per batch")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    results = json.dumps(run(args.size), indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(results + "\n")
+    else:
+        print(results)
+
+
+if __name__ == "__main__":
+    main()
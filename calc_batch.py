@@ -0,0 +1,170 @@
+"""Headless batch evaluation of the calculator operations.
+
+apply() runs add/subtract/multiply/divide element-wise over NumPy arrays.
+Instead of the GUI's "Error: Division by zero" string, every result comes
+with a boolean error mask: elements divided by zero (or fed unparseable
+input) are flagged there and set to NaN in the result.
+
+For data that does not fit in memory, process_csv() streams two columns of
+a CSV file in fixed-size chunks and process_npy() does the same for .npy
+files through memory maps. Memory use is bounded by the chunk size, not by
+the size of the input.
+
+Example:
+    python calc_batch.py data.csv out.csv --op divide --a price --b quantity
+    python calc_batch.py a.npy out.npy --b-file b.npy --op multiply
+"""
+
+import argparse
+import csv
+import time
+
+import numpy as np
+
+# Same operation names as calc_numeric.OPERATORS
+UFUNCS = {
+    "add": np.add,
+    "subtract": np.subtract,
+    "multiply": np.multiply,
+    "divide": np.divide,
+}
+
+DEFAULT_CHUNK_ROWS = 1 << 18
+
+
+def apply(operation, a, b, out=None):
+    """Return (result, error_mask) for a <operation> b, element-wise."""
+    if operation not in UFUNCS:
+        raise ValueError(f"unknown operation {operation!r}")
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if out is None:
+        out = np.empty(np.broadcast_shapes(a.shape, b.shape), dtype=np.float64)
+    if operation == "divide":
+        errors = np.broadcast_to(b == 0, out.shape)
+        out.fill(np.nan)
+        np.divide(a, b, out=out, where=~errors)
+    else:
+        errors = np.zeros(out.shape, dtype=bool)
+        UFUNCS[operation](a, b, out=out)
+    return out, errors
+
+
+def parse_column(values):
+    """Strings to float64 plus a mask of the values that failed to parse."""
+    try:
+        return np.array(values, dtype=np.float64), np.zeros(len(values), dtype=bool)
+    except ValueError:
+        pass
+    # Slow path only for chunks that contain bad input
+    parsed = np.empty(len(values), dtype=np.float64)
+    invalid = np.zeros(len(values), dtype=bool)
+    for index, value in enumerate(values):
+        try:
+            parsed[index] = float(value)
+        except ValueError:
+            parsed[index] = np.nan
+            invalid[index] = True
+    return parsed, invalid
+
+
+def format_results(result, errors):
+    """Result column strings; failed elements are written as empty cells."""
+    text = result.astype(str)
+    text[errors] = ""
+    return text.tolist()
+
+
+def column_index(header, column):
+    """Position of column in the CSV header, with a readable error if absent."""
+    try:
+        return header.index(column)
+    except ValueError:
+        raise ValueError(f"missing column {column!r} (columns: {', '.join(header)})") from None
+
+
+def process_csv(input_path, output_path, operation, a_column, b_column, chunk_rows=DEFAULT_CHUNK_ROWS,
+                result_column="result"):
+    """Stream input_path, append a result column, write output_path.
+
+    Blank or short rows are padded with empty cells, which count as
+    errors. Returns (rows, error_rows).
+    """
+    rows = errors_total = 0
+    with open(input_path, newline="") as source, open(output_path, "w", newline="") as target:
+        reader = csv.reader(source)
+        writer = csv.writer(target)
+        header = next(reader, [])
+        a_index, b_index = column_index(header, a_column), column_index(header, b_column)
+        writer.writerow(header + [result_column])
+
+        while True:
+            chunk = [row for _, row in zip(range(chunk_rows), reader)]
+            if not chunk:
+                break
+            for row in chunk:
+                if len(row) < len(header):
+                    row.extend([""] * (len(header) - len(row)))
+            a, a_invalid = parse_column([row[a_index] for row in chunk])
+            b, b_invalid = parse_column([row[b_index] for row in chunk])
+            result, errors = apply(operation, a, b)
+            errors = errors | a_invalid | b_invalid
+            for row, value in zip(chunk, format_results(result, errors)):
+                row.append(value)
+            writer.writerows(chunk)
+            rows += len(chunk)
+            errors_total += int(errors.sum())
+    return rows, errors_total
+
+
+def process_npy(a_path, b_path, output_path, operation, chunk_rows=DEFAULT_CHUNK_ROWS, mask_path=None):
+    """Apply operation to two memory-mapped .npy arrays chunk by chunk.
+
+    The result is written to output_path as float64 .npy; the error mask
+    goes to mask_path if given. Returns (elements, error_elements).
+    """
+    a = np.load(a_path, mmap_mode="r")
+    b = np.load(b_path, mmap_mode="r")
+    if a.shape != b.shape:
+        raise ValueError(f"shape mismatch: {a.shape} vs {b.shape}")
+    a_flat, b_flat = a.reshape(-1), b.reshape(-1)
+    out = np.lib.format.open_memmap(output_path, mode="w+", dtype=np.float64, shape=a.shape)
+    out_flat = out.reshape(-1)
+    mask = None
+    if mask_path:
+        mask = np.lib.format.open_memmap(mask_path, mode="w+", dtype=bool, shape=a.shape).reshape(-1)
+
+    errors_total = 0
+    for start in range(0, a_flat.size, chunk_rows):
+        stop = start + chunk_rows
+        _, errors = apply(operation, a_flat[start:stop], b_flat[start:stop], out=out_flat[start:stop])
+        errors_total += int(errors.sum())
+        if mask is not None:
+            mask[start:stop] = errors
+    out.flush()
+    return a_flat.size, errors_total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply a calculator operation to whole columns or arrays.")
+    parser.add_argument("input", help="CSV file, or the first .npy operand")
+    parser.add_argument("output")
+    parser.add_argument("--op", choices=sorted(UFUNCS), required=True)
+    parser.add_argument("--a", default="a", help="CSV column for the first operand")
+    parser.add_argument("--b", default="b", help="CSV column for the second operand")
+    parser.add_argument("--b-file", help="second .npy operand (switches to .npy mode)")
+    parser.add_argument("--mask", help="with --b-file, also write the error mask to this .npy file")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.b_file:
+        rows, errors = process_npy(args.input, args.b_file, args.output, args.op, args.chunk_rows, args.mask)
+    else:
+        rows, errors = process_csv(args.input, args.output, args.op, args.a, args.b, args.chunk_rows)
+    elapsed = time.perf_counter() - start
+    print(f"{rows:,} rows, {errors:,} errors, {elapsed:.2f}s ({rows / elapsed:,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
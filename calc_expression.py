@@ -0,0 +1,239 @@
+"""Expression engine for the calculator.
+
+Supports numbers, variables, + - * / % and ^ (or **) with the usual
+precedence, unary minus, parentheses and a fixed set of functions.
+
+Expressions are parsed once into a small syntax tree, translated to an
+equivalent Python lambda over the variables and compiled once. Compiled
+expressions are cached in an LRU keyed by the expression text, so
+evaluating the same formula with new variable values skips parsing
+entirely.
+
+Example:
+    >>> evaluate("sqrt(a^2 + b^2)", {"a": 3, "b": 4})
+    5.0
+    >>> area = compile_expression("pi * r ^ 2")
+    >>> [round(area.evaluate({"r": r}), 2) for r in (1, 2)]
+    [3.14, 12.57]
+"""
+
+import math
+import re
+from functools import lru_cache
+
+CACHE_SIZE = 4096
+
+FUNCTIONS = {
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "ln": math.log,
+    "log": math.log10,
+    "log2": math.log2,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "floor": math.floor,
+    "ceil": math.ceil,
+}
+
+CONSTANTS = {
+    "pi": math.pi,
+    "e": math.e,
+}
+
+# Binary operators: symbol -> (precedence, right associative, Python operator)
+BINARY_OPERATORS = {
+    "+": (1, False, "+"),
+    "-": (1, False, "-"),
+    "*": (2, False, "*"),
+    "/": (2, False, "/"),
+    "%": (2, False, "%"),
+    "^": (4, True, "**"),
+    "**": (4, True, "**"),
+}
+UNARY_PRECEDENCE = 3
+
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<name>[A-Za-z_][A-Za-z_0-9]*)
+      | (?P<operator>\*\*|[-+*/%^(),])
+    )""", re.VERBOSE)
+
+# Names available while evaluating; builtins are disabled
+EVAL_GLOBALS = {"__builtins__": {}, **FUNCTIONS}
+
+
+class ExpressionError(ValueError):
+    """The expression could not be parsed or evaluated."""
+
+
+def tokenize(text):
+    """Split text into (kind, value) tokens."""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if match is None or match.end() == position:
+            raise ExpressionError(f"unexpected character {text[position:].lstrip()[:1]!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class Parser:
+    """Precedence-climbing parser producing a nested-tuple syntax tree.
+
+    Nodes: ("num", float), ("var", name), ("neg", node),
+    ("call", name, [args]) and ("bin", operator, left, right).
+    """
+
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return (None, None)
+
+    def advance(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def expect(self, value):
+        kind, found = self.advance()
+        if found != value:
+            raise ExpressionError(f"expected {value!r}, found {found or 'end of expression'!r}")
+
+    def parse(self):
+        if not self.tokens:
+            raise ExpressionError("empty expression")
+        node = self.expression(0)
+        if self.position < len(self.tokens):
+            raise ExpressionError(f"unexpected {self.peek()[1]!r}")
+        return node
+
+    def expression(self, min_precedence):
+        left = self.unary()
+        while True:
+            kind, value = self.peek()
+            if kind != "operator" or value not in BINARY_OPERATORS:
+                return left
+            precedence, right_assoc, _ = BINARY_OPERATORS[value]
+            if precedence < min_precedence:
+                return left
+            self.advance()
+            right = self.expression(precedence if right_assoc else precedence + 1)
+            left = ("bin", value, left, right)
+
+    def unary(self):
+        kind, value = self.peek()
+        if kind == "operator" and value in "+-":
+            self.advance()
+            # -2^2 is -(2^2), like in mathematics and Python
+            operand = self.expression(UNARY_PRECEDENCE)
+            return ("neg", operand) if value == "-" else operand
+        return self.primary()
+
+    def primary(self):
+        kind, value = self.advance()
+        if kind == "number":
+            return ("num", float(value))
+        if kind == "name":
+            if self.peek()[1] == "(":
+                return self.call(value)
+            return ("var", value)
+        if value == "(":
+            node = self.expression(0)
+            self.expect(")")
+            return node
+        raise ExpressionError(f"unexpected {value or 'end of expression'!r}")
+
+    def call(self, name):
+        if name not in FUNCTIONS:
+            raise ExpressionError(f"unknown function {name!r}")
+        self.expect("(")
+        args = []
+        if self.peek()[1] != ")":
+            args.append(self.expression(0))
+            while self.peek()[1] == ",":
+                self.advance()
+                args.append(self.expression(0))
+        self.expect(")")
+        return ("call", name, args)
+
+
+def to_python(node, names):
+    """Translate a syntax tree to Python source, collecting variable names."""
+    kind = node[0]
+    if kind == "num":
+        return repr(node[1])
+    if kind == "var":
+        name = node[1]
+        if name in CONSTANTS:
+            return repr(CONSTANTS[name])
+        names.add(name)
+        # Prefix avoids clashes with function names and Python keywords
+        return "v_" + name
+    if kind == "neg":
+        return f"(-{to_python(node[1], names)})"
+    if kind == "call":
+        args = ", ".join(to_python(arg, names) for arg in node[2])
+        return f"{node[1]}({args})"
+    _, operator, left, right = node
+    return f"({to_python(left, names)} {BINARY_OPERATORS[operator][2]} {to_python(right, names)})"
+
+
+class Expression:
+    """A parsed and compiled expression, ready to evaluate many times."""
+
+    __slots__ = ("text", "variables", "function")
+
+    def __init__(self, text):
+        names = set()
+        source = to_python(Parser(text).parse(), names)
+        self.text = text
+        self.variables = tuple(sorted(names))
+        parameters = ", ".join("v_" + name for name in self.variables)
+        self.function = eval(compile(f"lambda {parameters}: {source}", "<expression>", "eval"), EVAL_GLOBALS)
+
+    def evaluate(self, variables=None):
+        """Evaluate with the given {name: value} mapping."""
+        try:
+            if self.variables:
+                return self.function(*[variables[name] for name in self.variables])
+            return self.function()
+        except (KeyError, TypeError) as error:
+            missing = [name for name in self.variables if name not in (variables or {})]
+            if missing:
+                raise ExpressionError(f"undefined variable {missing[0]!r}") from None
+            raise ExpressionError(str(error)) from None
+        except ZeroDivisionError:
+            raise ExpressionError("Division by zero") from None
+        except (ArithmeticError, ValueError) as error:
+            raise ExpressionError(str(error)) from None
+
+    def __repr__(self):
+        return f"Expression({self.text!r})"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(text):
+    """Parse and compile text, reusing the cached result for repeated text."""
+    return Expression(text)
+
+
+def evaluate(text, variables=None):
+    """Evaluate an expression string with optional variables."""
+    return compile_expression(text).evaluate(variables)
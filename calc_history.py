@@ -0,0 +1,151 @@
+"""Calculation history and result cache for the calculator.
+
+CalculationHistory keeps the most recent calculations in a fixed-capacity
+ring buffer, so memory stays constant however long the calculator runs.
+It supports undo/redo (like a text editor: a new calculation after undo
+drops the redo tail), recall of the n-th most recent entry, and bulk export
+to CSV.
+
+ResultCache is an LRU cache of results keyed by (backend, operation,
+operand types and text), so repeating a calculation on an expensive
+backend such as Fraction or high-precision Decimal is answered without
+recomputing.
+"""
+
+import csv
+from collections import OrderedDict
+
+DEFAULT_HISTORY_SIZE = 1000
+DEFAULT_CACHE_SIZE = 4096
+
+
+class HistoryEntry:
+    """One calculation shown by the calculator."""
+
+    __slots__ = ("operation", "a", "b", "result", "backend")
+
+    def __init__(self, operation, a, b, result, backend="float"):
+        self.operation = operation
+        self.a = a
+        self.b = b
+        self.result = result
+        self.backend = backend
+
+    def as_row(self):
+        return [self.backend, self.operation, str(self.a), str(self.b), str(self.result)]
+
+    def __repr__(self):
+        return f"HistoryEntry({self.operation!r}, {self.a!r}, {self.b!r}, {self.result!r})"
+
+
+class CalculationHistory:
+    """Fixed-capacity ring buffer of HistoryEntry with undo/redo."""
+
+    def __init__(self, capacity=DEFAULT_HISTORY_SIZE):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.entries = [None] * capacity
+        self.start = 0
+        # Entries [0, cursor) are done; [cursor, size) can be redone
+        self.size = 0
+        self.cursor = 0
+
+    def _slot(self, index):
+        return (self.start + index) % self.capacity
+
+    def __len__(self):
+        """Number of entries that are not undone."""
+        return self.cursor
+
+    def __iter__(self):
+        """Entries that are not undone, oldest first."""
+        for index in range(self.cursor):
+            yield self.entries[self._slot(index)]
+
+    def push(self, entry):
+        """Add a new calculation, dropping the oldest when full."""
+        # Anything undone is no longer redoable
+        for index in range(self.cursor, self.size):
+            self.entries[self._slot(index)] = None
+        self.size = self.cursor
+        if self.size == self.capacity:
+            self.entries[self.start] = None
+            self.start = (self.start + 1) % self.capacity
+            self.size -= 1
+        self.entries[self._slot(self.size)] = entry
+        self.size += 1
+        self.cursor = self.size
+        return entry
+
+    @property
+    def current(self):
+        """The most recent entry that is not undone, or None."""
+        return self.entries[self._slot(self.cursor - 1)] if self.cursor else None
+
+    def undo(self):
+        """Step back one entry; return the entry that is now current."""
+        if self.cursor:
+            self.cursor -= 1
+        return self.current
+
+    def redo(self):
+        """Re-apply one undone entry and return it, or None."""
+        if self.cursor == self.size:
+            return None
+        self.cursor += 1
+        return self.current
+
+    def recall(self, n=0):
+        """The n-th most recent entry (0 is the current one), or None."""
+        if not 0 <= n < self.cursor:
+            return None
+        return self.entries[self._slot(self.cursor - 1 - n)]
+
+    def clear(self):
+        self.entries = [None] * self.capacity
+        self.start = self.size = self.cursor = 0
+
+    def export(self, path):
+        """Write all entries that are not undone to a CSV file in one pass."""
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["backend", "operation", "a", "b", "result"])
+            writer.writerows(entry.as_row() for entry in self)
+        return self.cursor
+
+
+class ResultCache:
+    """LRU cache for backend.calculate results."""
+
+    def __init__(self, capacity=DEFAULT_CACHE_SIZE):
+        self.capacity = capacity
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def calculate(self, backend, operation, a, b):
+        """backend.calculate(operation, a, b), served from the cache when possible.
+
+        Errors such as division by zero are raised every time, not cached.
+        """
+        # The backend object itself is part of the key, so two Decimal
+        # backends with different precision never share results. Operands
+        # are keyed by type and text: Decimal("1.00") == Decimal("1") and
+        # Fraction(2) == 2, but their results differ in scale or type
+        key = (backend, operation, type(a), str(a), type(b), str(b))
+        results = self.results
+        if key in results:
+            self.hits += 1
+            results.move_to_end(key)
+            return results[key]
+        self.misses += 1
+        result = backend.calculate(operation, a, b)
+        results[key] = result
+        if len(results) > self.capacity:
+            results.popitem(last=False)
+        return result
+
+    def clear(self):
+        self.results.clear()
+        self.hits = self.misses = 0
@@ -0,0 +1,82 @@
+"""Matrix and vector operations for the calculator's matrix mode.
+
+Operands are typed as text, with rows separated by ";" or new lines and
+values by spaces or commas ("1 2; 3 4" is a 2x2 matrix, "1, 2, 3" a
+vector), or given as "@path/to/array.npy". .npy files are memory-mapped,
+so loading a large operand costs nothing until an operation reads it.
+
+Element-wise operations reuse calc_batch.apply (division by zero gives
+NaN and is counted); dot, solve and inverse go to NumPy's BLAS/LAPACK
+routines. preview() formats a result for the window without turning the
+whole array into a string.
+"""
+
+import numpy as np
+
+from calc_batch import UFUNCS, apply
+
+# Operations that take only the first operand
+UNARY = {"inverse"}
+OPERATIONS = list(UFUNCS) + ["dot", "solve", "inverse"]
+
+PREVIEW_EDGE_ITEMS = 3
+PREVIEW_PRECISION = 6
+
+
+def parse_array(text):
+    """Vector or matrix from text such as "1 2; 3 4"."""
+    rows = [row.replace(",", " ").split() for row in text.replace("\n", ";").split(";")]
+    rows = [row for row in rows if row]
+    if not rows:
+        raise ValueError("empty operand")
+    if len({len(row) for row in rows}) != 1:
+        raise ValueError("rows have different lengths")
+    array = np.array(rows, dtype=np.float64)
+    return array[0] if len(rows) == 1 else array
+
+
+def load_array(path):
+    """Memory-map a numeric .npy file (read-only)."""
+    array = np.load(path, mmap_mode="r")
+    if array.dtype.kind not in "biuf":
+        raise ValueError(f"{path}: unsupported dtype {array.dtype}")
+    return array
+
+
+def parse_operand(text):
+    """"@file.npy" is loaded via load_array, anything else via parse_array."""
+    text = text.strip()
+    if text.startswith("@"):
+        return load_array(text[1:].strip())
+    return parse_array(text)
+
+
+def calculate(operation, a, b=None):
+    """Return (result, error_count); bad shapes or singular matrices raise ValueError."""
+    if operation in UFUNCS:
+        try:
+            np.broadcast_shapes(np.shape(a), np.shape(b))
+        except ValueError:
+            raise ValueError(f"shapes {np.shape(a)} and {np.shape(b)} do not match") from None
+        result, errors = apply(operation, a, b)
+        return result, int(errors.sum())
+    if operation == "dot":
+        if np.ndim(a) == 0 or np.ndim(b) == 0:
+            raise ValueError("dot needs vectors or matrices")
+        return np.matmul(a, b), 0
+    if operation == "solve":
+        return np.linalg.solve(a, b), 0
+    if operation == "inverse":
+        return np.linalg.inv(a), 0
+    raise ValueError(f"unknown operation {operation!r}")
+
+
+def preview(result, edge_items=PREVIEW_EDGE_ITEMS, precision=PREVIEW_PRECISION):
+    """Shape line plus the corners of the array; cost is independent of its size."""
+    result = np.asarray(result)
+    if result.ndim == 0:
+        return np.format_float_positional(result[()], precision=precision, trim="-")
+    body = np.array2string(result, threshold=4 * edge_items * edge_items, edgeitems=edge_items,
+                           precision=precision, suppress_small=True)
+    shape = " x ".join(str(size) for size in result.shape)
+    return f"{shape} {result.dtype}\n{body}"
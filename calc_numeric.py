@@ -0,0 +1,188 @@
+"""Selectable numeric backends for the calculator.
+
+* FloatBackend: the original behaviour, fast binary floats.
+* DecimalBackend: decimal.Decimal arithmetic under a configurable context
+  (precision, rounding), for financial inputs such as 0.1 + 0.2.
+* FractionBackend: exact rationals; also accepts inputs like "1/3".
+* AutoBackend: keeps values that are exactly representable as floats on
+  the float path and checks every float result for rounding error; only
+  inputs or results that would lose precision escalate to Decimal.
+
+Every backend has the same small interface: parse(text), calculate(operation,
+a, b) for the calculator's add/subtract/multiply/divide, and
+calculate_batch(operation, a_values, b_values). Division by zero raises
+ZeroDivisionError and bad input raises ValueError, whatever the backend.
+"""
+
+import decimal
+import math
+import operator
+from decimal import Decimal
+from fractions import Fraction
+
+OPERATORS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv,
+}
+
+
+class FloatBackend:
+    name = "float"
+
+    def parse(self, text):
+        return float(text)
+
+    def calculate(self, operation, a, b):
+        return OPERATORS[operation](a, b)
+
+    def calculate_batch(self, operation, a_values, b_values):
+        function = OPERATORS[operation]
+        return [function(a, b) for a, b in zip(a_values, b_values)]
+
+
+class DecimalBackend:
+    name = "decimal"
+
+    def __init__(self, precision=28, rounding=decimal.ROUND_HALF_EVEN):
+        self.context = decimal.Context(prec=precision, rounding=rounding,
+                                       traps=[decimal.DivisionByZero, decimal.InvalidOperation,
+                                              decimal.Overflow])
+        self.functions = {
+            "add": self.context.add,
+            "subtract": self.context.subtract,
+            "multiply": self.context.multiply,
+            "divide": self.context.divide,
+        }
+
+    def parse(self, text):
+        try:
+            return Decimal(text.strip())
+        except decimal.InvalidOperation:
+            raise ValueError(f"invalid number {text!r}") from None
+
+    def calculate(self, operation, a, b):
+        try:
+            return self.functions[operation](a, b)
+        except decimal.DivisionByZero:
+            raise ZeroDivisionError("division by zero") from None
+        except decimal.InvalidOperation as error:
+            # 0 / 0 is "undefined" rather than DivisionByZero
+            if operation == "divide" and not b:
+                raise ZeroDivisionError("division by zero") from None
+            raise ValueError(str(error)) from None
+
+    def calculate_batch(self, operation, a_values, b_values):
+        function = self.functions[operation]
+        return [function(a, b) for a, b in zip(a_values, b_values)]
+
+
+class FractionBackend:
+    name = "fraction"
+
+    def parse(self, text):
+        return Fraction(text.strip())
+
+    def calculate(self, operation, a, b):
+        return OPERATORS[operation](a, b)
+
+    def calculate_batch(self, operation, a_values, b_values):
+        function = OPERATORS[operation]
+        return [function(a, b) for a, b in zip(a_values, b_values)]
+
+
+# Veltkamp splitting constant for IEEE doubles (2**27 + 1)
+SPLITTER = 134217729.0
+
+
+def _split(value):
+    scaled = SPLITTER * value
+    high = scaled - (scaled - value)
+    return high, value - high
+
+
+def _sum_is_exact(a, b, total):
+    """True if total == a + b exactly (Knuth's TwoSum error is zero)."""
+    b_virtual = total - a
+    a_virtual = total - b_virtual
+    return (a - a_virtual) + (b - b_virtual) == 0.0
+
+
+def _product_is_exact(a, b, product):
+    """True if product == a * b exactly (Dekker's TwoProduct error is zero)."""
+    if not math.isfinite(product) or abs(product) > 1e300 or (product and abs(product) < 1e-290):
+        # Splitting is unreliable near overflow and underflow
+        return False
+    a_high, a_low = _split(a)
+    b_high, b_low = _split(b)
+    error = ((a_high * b_high - product) + a_high * b_low + a_low * b_high) + a_low * b_low
+    return error == 0.0
+
+
+class AutoBackend:
+    """Float when exact, Decimal when float would round."""
+
+    name = "auto"
+
+    def __init__(self, precision=28, rounding=decimal.ROUND_HALF_EVEN):
+        self.decimal = DecimalBackend(precision, rounding)
+        self.escalations = 0
+
+    def parse(self, text):
+        digits = text.strip().lstrip("+-")
+        if len(digits) <= 15 and digits.isdigit():
+            # Integers below 10**15 are always exact floats
+            return float(text)
+        value = float(text)
+        exact = self.decimal.parse(text)
+        if not math.isfinite(value):
+            # "inf" and "nan" stay floats; "1e400" only overflowed float
+            if not exact.is_finite():
+                return value
+        elif Decimal(value) == exact:
+            return value
+        self.escalations += 1
+        return exact
+
+    def _float_result(self, operation, a, b):
+        """The float result if it is exact, else None."""
+        if operation == "add":
+            result = a + b
+            return result if math.isfinite(result) and _sum_is_exact(a, b, result) else None
+        if operation == "subtract":
+            result = a - b
+            return result if math.isfinite(result) and _sum_is_exact(a, -b, result) else None
+        if operation == "multiply":
+            result = a * b
+            return result if _product_is_exact(a, b, result) else None
+        if b == 0.0:
+            raise ZeroDivisionError("division by zero")
+        result = a / b
+        # a / b is exact exactly when result * b reproduces a without rounding
+        return result if _product_is_exact(result, b, result * b) and result * b == a else None
+
+    def calculate(self, operation, a, b):
+        if type(a) is float and type(b) is float:
+            result = self._float_result(operation, a, b)
+            if result is not None:
+                return result
+        self.escalations += 1
+        return self.decimal.calculate(operation, Decimal(a), Decimal(b))
+
+    def calculate_batch(self, operation, a_values, b_values):
+        calculate = self.calculate
+        return [calculate(operation, a, b) for a, b in zip(a_values, b_values)]
+
+
+BACKENDS = {
+    "float": FloatBackend,
+    "decimal": DecimalBackend,
+    "fraction": FractionBackend,
+    "auto": AutoBackend,
+}
+
+
+def make_backend(name, **options):
+    """Instantiate a backend by name; options go to Decimal-based backends."""
+    return BACKENDS[name](**options)
@@ -0,0 +1,265 @@
+"""Calculator GUI from Example 2 of GUI_implementation_1, backed by calc_expression.
+
+The four operation buttons work as in the tutorial, using the numeric
+backend picked in the window (float, Decimal, Fraction or auto, see
+calc_numeric). The Expression field accepts full formulas such as
+``sqrt(a^2 + b^2)`` or ``(a + b) / 2``, where ``a`` and ``b`` are Number 1
+and Number 2; expressions are always evaluated with floats.
+
+Results of the buttons are kept in a bounded history (see calc_history)
+with undo/redo, recall by double-click and CSV export, and repeated
+calculations are served from an LRU result cache.
+
+In matrix mode the inputs are vectors or matrices ("1 2; 3 4", or
+"@file.npy" for a memory-mapped array, see calc_matrix). The buttons then
+work element-wise, the extra buttons do dot products, solve a = b·x and
+invert a, and only a preview of the result is shown.
+"""
+
+import tkinter as tk
+from tkinter import filedialog, messagebox
+
+import numpy as np
+
+import calc_matrix
+from calc_expression import ExpressionError, compile_expression
+from calc_history import CalculationHistory, HistoryEntry, ResultCache
+from calc_numeric import BACKENDS, make_backend
+
+SYMBOLS = {"add": "+", "subtract": "-", "multiply": "×", "divide": "÷"}
+
+
+def read_variables(num1_text, num2_text):
+    """Variables for an expression; empty inputs are left undefined."""
+    variables = {}
+    for name, text in (("a", num1_text), ("b", num2_text)):
+        if text.strip():
+            variables[name] = float(text)
+    return variables
+
+
+def history_line(entry):
+    return f"{entry.a} {SYMBOLS[entry.operation]} {entry.b} = {entry.result}"
+
+
+def create_calculator():
+
+    root = tk.Tk()
+    root.title("Simple Calculator")
+    root.geometry("360x800")
+
+    # Variables to store numbers, expression and result
+    num1_var = tk.StringVar()
+    num2_var = tk.StringVar()
+    expression_var = tk.StringVar()
+    result_var = tk.StringVar()
+    backend_var = tk.StringVar(value="float")
+    mode_var = tk.StringVar(value="scalar")
+    matrix_result = {"value": None}
+    backends = {name: make_backend(name) for name in BACKENDS}
+    history = CalculationHistory()
+    cache = ResultCache()
+
+    def show(entry):
+        if entry is None:
+            num1_var.set("")
+            num2_var.set("")
+            result_var.set("")
+        else:
+            backend_var.set(entry.backend)
+            num1_var.set(str(entry.a))
+            num2_var.set(str(entry.b))
+            result_var.set(str(entry.result))
+
+    def calculate(operation):
+        if mode_var.get() == "matrix":
+            calculate_matrix(operation)
+            return
+        backend = backends[backend_var.get()]
+        try:
+            num1 = backend.parse(num1_var.get())
+            num2 = backend.parse(num2_var.get())
+            result = cache.calculate(backend, operation, num1, num2)
+        except ZeroDivisionError:
+            result_var.set("Error: Division by zero")
+            return
+        except ValueError:
+            result_var.set("Error: Invalid input")
+            return
+        result_var.set(str(result))
+
+        if len(history) == history.capacity:
+            # The oldest entry falls out of the ring buffer
+            history_listbox.delete(0)
+        entry = history.push(HistoryEntry(operation, num1, num2, result, backend.name))
+        history_listbox.insert(tk.END, history_line(entry))
+        history_listbox.see(tk.END)
+
+    def calculate_matrix(operation):
+        matrix_result["value"] = None
+        try:
+            a = calc_matrix.parse_operand(num1_var.get())
+            b = None if operation in calc_matrix.UNARY else calc_matrix.parse_operand(num2_var.get())
+            result, errors = calc_matrix.calculate(operation, a, b)
+        except (OSError, ValueError) as error:
+            result_var.set(f"Error: {error}")
+            return
+        matrix_result["value"] = result
+        text = calc_matrix.preview(result)
+        if errors:
+            text += f"\n({errors} division(s) by zero)"
+        result_var.set(text)
+
+    def load_operand(variable):
+        file_path = filedialog.askopenfilename(
+            title="Load Array",
+            filetypes=[("NumPy arrays", "*.npy"), ("All files", "*.*")]
+        )
+        if file_path:
+            mode_var.set("matrix")
+            variable.set("@" + file_path)
+
+    def save_matrix_result():
+        if matrix_result["value"] is None:
+            messagebox.showwarning("Warning", "No matrix result to save.")
+            return
+        file_path = filedialog.asksaveasfilename(
+            title="Save Result",
+            defaultextension=".npy",
+            filetypes=[("NumPy arrays", "*.npy"), ("All files", "*.*")]
+        )
+        if file_path:
+            try:
+                np.save(file_path, matrix_result["value"])
+            except OSError as e:
+                messagebox.showerror("Error", f"Could not save result: {str(e)}")
+
+    def undo():
+        if len(history):
+            history_listbox.delete(tk.END)
+            show(history.undo())
+
+    def redo():
+        entry = history.redo()
+        if entry is not None:
+            history_listbox.insert(tk.END, history_line(entry))
+            show(entry)
+
+    def recall(event=None):
+        selection = history_listbox.curselection()
+        if selection:
+            show(history.recall(len(history) - 1 - selection[0]))
+
+    def export_history():
+        file_path = filedialog.asksaveasfilename(
+            title="Export History",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if file_path:
+            try:
+                count = history.export(file_path)
+                messagebox.showinfo("Success", f"Exported {count} calculation(s).")
+            except OSError as e:
+                messagebox.showerror("Error", f"Could not export history: {str(e)}")
+
+    def calculate_expression():
+        try:
+            variables = read_variables(num1_var.get(), num2_var.get())
+        except ValueError:
+            result_var.set("Error: Invalid input")
+            return
+        try:
+            result_var.set(str(compile_expression(expression_var.get()).evaluate(variables)))
+        except ExpressionError as error:
+            result_var.set(f"Error: {error}")
+
+    # Create input fields
+    tk.Label(root, text="Number 1 (a):", font=("Arial", 12)).pack(pady=5)
+    entry1 = tk.Entry(root, textvariable=num1_var, font=("Arial", 12))
+    entry1.pack(pady=5)
+
+    tk.Label(root, text="Number 2 (b):", font=("Arial", 12)).pack(pady=5)
+    entry2 = tk.Entry(root, textvariable=num2_var, font=("Arial", 12))
+    entry2.pack(pady=5)
+
+    # Create operation buttons
+    button_frame = tk.Frame(root)
+    button_frame.pack(pady=20)
+
+    tk.Button(button_frame, text="+", command=lambda: calculate("add"),
+              font=("Arial", 12), width=5).grid(row=0, column=0, padx=5)
+    tk.Button(button_frame, text="-", command=lambda: calculate("subtract"),
+              font=("Arial", 12), width=5).grid(row=0, column=1, padx=5)
+    tk.Button(button_frame, text="×", command=lambda: calculate("multiply"),
+              font=("Arial", 12), width=5).grid(row=0, column=2, padx=5)
+    tk.Button(button_frame, text="÷", command=lambda: calculate("divide"),
+              font=("Arial", 12), width=5).grid(row=0, column=3, padx=5)
+
+    # Numeric backend for the buttons
+    backend_frame = tk.Frame(root)
+    backend_frame.pack()
+    for column, name in enumerate(BACKENDS):
+        tk.Radiobutton(backend_frame, text=name.capitalize(), variable=backend_var, value=name,
+                       font=("Arial", 9)).grid(row=0, column=column)
+
+    # Matrix mode
+    mode_frame = tk.Frame(root)
+    mode_frame.pack(pady=(10, 0))
+    tk.Radiobutton(mode_frame, text="Scalar", variable=mode_var, value="scalar",
+                   font=("Arial", 9)).grid(row=0, column=0)
+    tk.Radiobutton(mode_frame, text="Matrix", variable=mode_var, value="matrix",
+                   font=("Arial", 9)).grid(row=0, column=1)
+
+    matrix_frame = tk.Frame(root)
+    matrix_frame.pack(pady=5)
+    matrix_buttons = [
+        ("a·b", lambda: calculate_matrix("dot")),
+        ("Solve", lambda: calculate_matrix("solve")),
+        ("a⁻¹", lambda: calculate_matrix("inverse")),
+        ("Load a", lambda: load_operand(num1_var)),
+        ("Load b", lambda: load_operand(num2_var)),
+        ("Save", save_matrix_result),
+    ]
+    for index, (text, command) in enumerate(matrix_buttons):
+        tk.Button(matrix_frame, text=text, command=command, font=("Arial", 9),
+                  width=6).grid(row=index // 3, column=index % 3, padx=3, pady=2)
+
+    # Expression input
+    tk.Label(root, text="Expression:", font=("Arial", 12)).pack(pady=5)
+    expression_frame = tk.Frame(root)
+    expression_frame.pack(pady=5)
+    expression_entry = tk.Entry(expression_frame, textvariable=expression_var, font=("Arial", 12), width=16)
+    expression_entry.pack(side=tk.LEFT, padx=5)
+    tk.Button(expression_frame, text="=", command=calculate_expression,
+              font=("Arial", 12), width=3).pack(side=tk.LEFT)
+    expression_entry.bind("<Return>", lambda event: calculate_expression())
+
+    # Result display
+    tk.Label(root, text="Result:", font=("Arial", 12)).pack(pady=(20, 5))
+    result_label = tk.Label(root, textvariable=result_var, font=("Courier", 10),
+                            bg="white", relief="sunken", width=36, justify=tk.LEFT)
+    result_label.pack(pady=5)
+
+    # History
+    history_frame = tk.Frame(root)
+    history_frame.pack(pady=10, fill=tk.BOTH, expand=True)
+    history_listbox = tk.Listbox(history_frame, font=("Arial", 10), height=8)
+    history_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0))
+    history_scrollbar = tk.Scrollbar(history_frame, command=history_listbox.yview)
+    history_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, padx=(0, 10))
+    history_listbox.config(yscrollcommand=history_scrollbar.set)
+    history_listbox.bind("<Double-Button-1>", recall)
+
+    history_buttons = tk.Frame(root)
+    history_buttons.pack(pady=(0, 10))
+    tk.Button(history_buttons, text="Undo", command=undo, font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+    tk.Button(history_buttons, text="Redo", command=redo, font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+    tk.Button(history_buttons, text="Export...", command=export_history,
+              font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    create_calculator()
@@ -0,0 +1,519 @@
+"""Piece-table document buffer for the text editor.
+
+The document is a sequence of pieces, each a (source, start, length)
+slice of one of two buffers: the original file, memory-mapped and never
+written, or the add buffer, which only ever grows with typed or pasted
+text. The pieces are kept in a treap (a randomized balanced binary tree)
+ordered by position and annotated with subtree byte sizes, so finding,
+inserting and deleting at any offset takes O(log n) in the number of
+pieces, whatever the size of the file.
+
+Undo and redo work on pieces too: an edit records the pieces it removed
+and inserted, so undoing the deletion of a gigabyte re-links a few pieces
+instead of copying the text back. Reading (save, search, display) walks the
+pieces in order and yields bounded chunks of bytes.
+
+After a save, rebase() makes the saved file the new original: the pieces
+that were saved are pointed into it, so the document is one piece again
+and the edit journal (editor_journal) can describe it relative to what is
+on disk. Earlier originals stay in buffers for the undo history.
+
+Offsets are byte offsets into the UTF-8 encoded document. PieceTable is an
+editor_paging.LineReader, so PageWindow can page through it exactly like
+through a MappedFile.
+"""
+
+import random
+from bisect import bisect_right
+from itertools import accumulate
+
+from editor_paging import LineReader
+
+# Piece sources: indexes into PieceTable.buffers; rebase() adds more
+ORIGINAL = 0
+ADD = 1
+
+# Reads never materialize more than this many bytes at once
+CHUNK_BYTES = 1 << 20
+FIRST_CHUNK_BYTES = 1 << 10
+# replace_ranges() copies gaps up to this long between replacements
+INLINE_GAP_BYTES = 256
+
+# Treap priorities; a private generator so seeding the random module elsewhere
+# cannot degrade the tree
+_priorities = random.Random()
+
+
+class Piece:
+    """Treap node: one piece plus the byte size of its subtree."""
+
+    __slots__ = ("source", "start", "length", "size", "priority", "left", "right")
+
+    def __init__(self, source, start, length):
+        self.source = source
+        self.start = start
+        self.length = length
+        self.size = length
+        self.priority = _priorities.random()
+        self.left = None
+        self.right = None
+
+    def update(self):
+        self.size = self.length + (self.left.size if self.left else 0) + (self.right.size if self.right else 0)
+
+
+def _size(node):
+    return node.size if node else 0
+
+
+def _split(node, offset):
+    """Split a treap into (first offset bytes, the rest), cutting a piece if needed."""
+    if node is None:
+        return None, None
+    left_size = _size(node.left)
+    if offset <= left_size:
+        left, node.left = _split(node.left, offset)
+        node.update()
+        return left, node
+    if offset >= left_size + node.length:
+        node.right, right = _split(node.right, offset - left_size - node.length)
+        node.update()
+        return node, right
+    # The cut falls inside this piece: keep the head here, the tail goes right
+    cut = offset - left_size
+    tail = Piece(node.source, node.start + cut, node.length - cut)
+    tail.right = node.right
+    tail.update()
+    node.length = cut
+    node.right = None
+    node.update()
+    return node, tail
+
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+def _pieces(node):
+    """(source, start, length) of every piece, in order."""
+    result = []
+    stack = []
+    while stack or node:
+        while node:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        result.append((node.source, node.start, node.length))
+        node = node.right
+    return result
+
+
+def _build(pieces):
+    """Treap of pieces in order, in O(len(pieces)) (Cartesian tree construction)."""
+    spine = []
+    for source, start, length in pieces:
+        if not length:
+            continue
+        node = Piece(source, start, length)
+        last = None
+        while spine and spine[-1].priority < node.priority:
+            last = spine.pop()
+            last.update()
+        node.left = last
+        if spine:
+            spine[-1].right = node
+        spine.append(node)
+    for node in reversed(spine):
+        node.update()
+    return spine[0] if spine else None
+
+
+class Edit:
+    """One undoable change: at offset, removed pieces were replaced by inserted ones."""
+
+    __slots__ = ("offset", "removed", "inserted")
+
+    def __init__(self, offset, removed, inserted):
+        self.offset = offset
+        self.removed = removed
+        self.inserted = inserted
+
+    @staticmethod
+    def length(pieces):
+        return sum(piece[2] for piece in pieces)
+
+
+class Snapshot:
+    """The document as of one version, readable from any thread.
+
+    PieceTable itself is not thread-safe, but its buffers never change
+    under a piece (the add buffer only grows), so a list of pieces stays
+    readable while editing goes on.
+    """
+
+    def __init__(self, buffers, pieces):
+        self.buffers = list(buffers)
+        self.pieces = pieces
+        self.starts = [0] + list(accumulate(length for _, _, length in pieces))
+        self.size = self.starts.pop()
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key):
+        start, stop, step = key.indices(self.size)
+        if step != 1:
+            raise ValueError("Snapshot slices cannot have a step")
+        chunks = []
+        i = bisect_right(self.starts, start) - 1
+        while start < stop:
+            source, piece_start, length = self.pieces[i]
+            offset = start - self.starts[i]
+            end = min(length, offset + stop - start)
+            chunks.append(self.buffers[source][piece_start + offset:piece_start + end])
+            start += end - offset
+            i += 1
+        return b"".join(chunks)
+
+
+class PieceTable(LineReader):
+    """Editable document over a read-only original buffer."""
+
+    def __init__(self, original=b"", encoding="utf-8"):
+        self.buffers = [original, bytearray()]
+        # Source of the current original
+        self.base = ORIGINAL
+        self.encoding = encoding
+        self.root = _build([(ORIGINAL, 0, len(original))])
+        self.listeners = []
+        self.undo_stack = []
+        self.redo_stack = []
+        # Bumped on every change; lets views and savers notice edits
+        self.version = 0
+        self.saved_version = 0
+
+    @property
+    def original(self):
+        return self.buffers[self.base]
+
+    @property
+    def add(self):
+        return self.buffers[ADD]
+
+    @property
+    def size(self):
+        return _size(self.root)
+
+    @property
+    def data(self):
+        # LineReader reads through find/rfind/slicing, which PieceTable provides
+        return self
+
+    @property
+    def modified(self):
+        return self.version != self.saved_version
+
+    def __len__(self):
+        return self.size
+
+    # Reading
+    def iter_chunks(self, start=0, end=None, chunk_bytes=CHUNK_BYTES):
+        """Yield the bytes of [start, end) in order, at most chunk_bytes at a time."""
+        end = self.size if end is None else min(end, self.size)
+        if start >= end:
+            return
+        # Descend to the piece holding start, remembering the right spines
+        node, offset, stack = self.root, start, []
+        while node:
+            left_size = _size(node.left)
+            if offset < left_size:
+                stack.append(node)
+                node = node.left
+            elif offset < left_size + node.length:
+                offset -= left_size
+                break
+            else:
+                offset -= left_size + node.length
+                node = node.right
+        position = start
+        while node is not None and position < end:
+            buffer = self.buffers[node.source]
+            piece_start = node.start + offset
+            piece_end = min(node.start + node.length, piece_start + end - position)
+            for chunk_start in range(piece_start, piece_end, chunk_bytes):
+                chunk = buffer[chunk_start:min(piece_end, chunk_start + chunk_bytes)]
+                yield bytes(chunk) if node.source == ADD else chunk
+            position += piece_end - piece_start
+            offset = 0
+            # In-order successor
+            if node.right:
+                node = node.right
+                while node.left:
+                    stack.append(node)
+                    node = node.left
+            else:
+                node = stack.pop() if stack else None
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            if key < 0:
+                key += self.size
+            if not 0 <= key < self.size:
+                raise IndexError("offset out of range")
+            return next(self.iter_chunks(key, key + 1))[0]
+        start, stop, step = key.indices(self.size)
+        if step != 1:
+            raise ValueError("PieceTable slices cannot have a step")
+        return b"".join(self.iter_chunks(start, stop))
+
+    def find(self, sub, start=0, end=None):
+        """Offset of sub in [start, end), or -1.
+
+        Reads in chunks that start small and double up to CHUNK_BYTES, so
+        looking for the next newline stays cheap and a long search does not
+        materialize the document.
+        """
+        end = self.size if end is None else min(end, self.size)
+        overlap = len(sub) - 1
+        carry = b""
+        position = start
+        chunk_bytes = FIRST_CHUNK_BYTES
+        while position < end:
+            chunk = b"".join(self.iter_chunks(position, min(end, position + chunk_bytes)))
+            window = carry + chunk
+            found = window.find(sub)
+            if found >= 0:
+                return position - len(carry) + found
+            carry = window[-overlap:] if overlap > 0 else b""
+            position += len(chunk)
+            chunk_bytes = min(2 * chunk_bytes, CHUNK_BYTES)
+        return -1
+
+    def rfind(self, sub, start=0, end=None):
+        """Offset of the last sub in [start, end), or -1.
+
+        Materializes the range, so keep it short (LineReader only looks
+        back one maximum line length).
+        """
+        found = self[start:end].rfind(sub)
+        return found + start if found >= 0 else -1
+
+    def subscribe(self, callback):
+        """Call callback(offset, removed, inserted) with byte counts after every change."""
+        self.listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        self.listeners.remove(callback)
+
+    # Editing
+    def _remove(self, offset, length):
+        left, rest = _split(self.root, offset)
+        middle, right = _split(rest, length)
+        self.root = _merge(left, right)
+        return _pieces(middle)
+
+    def _insert(self, offset, pieces):
+        left, right = _split(self.root, offset)
+        self.root = _merge(_merge(left, _build(pieces)), right)
+
+    def _apply(self, offset, remove_length, pieces):
+        removed = self._remove(offset, remove_length) if remove_length else []
+        if pieces:
+            self._insert(offset, pieces)
+        self.version += 1
+        inserted = Edit.length(pieces)
+        for callback in self.listeners:
+            callback(offset, remove_length, inserted)
+        return removed
+
+    def replace(self, offset, length, text=b""):
+        """Replace length bytes at offset by text (bytes or str); undoable."""
+        if isinstance(text, str):
+            text = text.encode(self.encoding)
+        if not 0 <= offset <= offset + length <= self.size:
+            raise IndexError("edit out of range")
+        inserted = [(ADD, len(self.add), len(text))] if text else []
+        self.add.extend(text)
+        removed = self._apply(offset, length, inserted)
+        if removed or inserted:
+            self._record(Edit(offset, removed, inserted))
+
+    def insert(self, offset, text):
+        self.replace(offset, 0, text)
+
+    def delete(self, offset, length):
+        self.replace(offset, length)
+
+    def _record(self, edit):
+        self.redo_stack.clear()
+        last = self.undo_stack[-1] if self.undo_stack else None
+        # Typing and backspacing in one place undo as a single step
+        if last is not None and not edit.removed and not last.removed and edit.inserted:
+            source, start, length = edit.inserted[0]
+            if edit.offset == last.offset + Edit.length(last.inserted) and not self.add[start:start + length].isspace():
+                last.inserted = last.inserted + edit.inserted
+                return
+        if last is not None and not edit.inserted and not last.inserted:
+            if edit.offset + Edit.length(edit.removed) == last.offset:
+                # Backspace
+                last.offset = edit.offset
+                last.removed = edit.removed + last.removed
+                return
+            if edit.offset == last.offset:
+                # Delete key
+                last.removed = last.removed + edit.removed
+                return
+        self.undo_stack.append(edit)
+
+    def undo(self):
+        """Revert the last edit; returns its offset, or None if there is none."""
+        if not self.undo_stack:
+            return None
+        edit = self.undo_stack.pop()
+        self._apply(edit.offset, Edit.length(edit.inserted), edit.removed)
+        self.redo_stack.append(edit)
+        return edit.offset
+
+    def redo(self):
+        if not self.redo_stack:
+            return None
+        edit = self.redo_stack.pop()
+        self._apply(edit.offset, Edit.length(edit.removed), edit.inserted)
+        self.undo_stack.append(edit)
+        return edit.offset
+
+    def mark_saved(self, version=None):
+        """Record that the document as of version (default: now) is on disk."""
+        self.saved_version = self.version if version is None else version
+
+    def replace_ranges(self, ranges, texts):
+        """Replace each (start, end) of ranges by the bytes at the same index of texts.
+
+        ranges must be sorted and must not overlap. They are applied as one
+        undoable edit in a single pass over the pieces. Where matches are
+        dense, the text between them (up to INLINE_GAP_BYTES) is copied
+        into the add buffer with the replacements, so a run of them becomes
+        one piece instead of two per match.
+        """
+        size, buffers = self.size, self.buffers
+        old = _pieces(self.root)
+        pieces = []
+        inline = bytearray()
+        # Cursor in old: piece index and offset within it
+        cursor = [0, 0]
+
+        def take(length, keep):
+            """Consume length bytes of old: skip them, keep their pieces or copy them inline."""
+            while length:
+                source, start, piece_length = old[cursor[0]]
+                offset = cursor[1]
+                step = min(length, piece_length - offset)
+                if keep is inline:
+                    inline.extend(buffers[source][start + offset:start + offset + step])
+                elif keep:
+                    pieces.append((source, start + offset, step))
+                length -= step
+                if offset + step == piece_length:
+                    cursor[0] += 1
+                    cursor[1] = 0
+                else:
+                    cursor[1] = offset + step
+
+        def flush_inline():
+            if inline:
+                pieces.append((ADD, len(self.add), len(inline)))
+                self.add.extend(inline)
+                inline.clear()
+
+        position = 0
+        for (start, end), text in zip(ranges, texts):
+            if not position <= start <= end <= size:
+                raise IndexError("replacement ranges out of order or out of range")
+            if start - position <= INLINE_GAP_BYTES:
+                take(start - position, inline)
+            else:
+                flush_inline()
+                take(start - position, True)
+            take(end - start, False)
+            inline.extend(text)
+            position = end
+        flush_inline()
+        take(size - position, True)
+        removed = self._apply(0, size, pieces)
+        self._record(Edit(0, removed, pieces))
+
+    def snapshot(self):
+        return Snapshot(self.buffers, _pieces(self.root))
+
+    def set_pieces(self, pieces):
+        """Replace the whole document by pieces; not undoable and not reported to listeners."""
+        self.root = _build(pieces)
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.version += 1
+
+    def rebase(self, original, saved_pieces):
+        """Make original, a file just written from saved_pieces, the original buffer.
+
+        Pieces of the document whose bytes were saved are pointed into
+        original, and adjacent ones merged; pieces edited since the save
+        keep their source. The content does not change, so the undo
+        history stays valid (it may still refer to earlier originals,
+        which is why they are kept).
+        """
+        # (start, end, offset in original) of every saved range, per source
+        saved = {}
+        offset = 0
+        for source, start, length in saved_pieces:
+            saved.setdefault(source, []).append((start, start + length, offset))
+            offset += length
+        for ranges in saved.values():
+            ranges.sort()
+        starts = {source: [start for start, _, _ in ranges] for source, ranges in saved.items()}
+
+        self.buffers.append(original)
+        self.base = len(self.buffers) - 1
+        pieces = []
+
+        def add_piece(source, start, length):
+            if pieces and pieces[-1][0] == source and pieces[-1][1] + pieces[-1][2] == start:
+                pieces[-1] = (source, pieces[-1][1], pieces[-1][2] + length)
+            else:
+                pieces.append((source, start, length))
+
+        for source, start, length in _pieces(self.root):
+            ranges, end = saved.get(source, []), start + length
+            while start < end:
+                i = bisect_right(starts.get(source, []), start) - 1
+                if i >= 0 and ranges[i][1] > start:
+                    range_start, range_end, range_offset = ranges[i]
+                    stop = min(end, range_end)
+                    add_piece(self.base, range_offset + start - range_start, stop - start)
+                else:
+                    stop = min(end, ranges[i + 1][0]) if i + 1 < len(ranges) else end
+                    add_piece(source, start, stop - start)
+                start = stop
+        self.root = _build(pieces)
+
+    def pieces(self):
+        """(source, start, length) of every piece, in order.
+
+        The list stays valid while editing goes on (the original never
+        changes and the add buffer only grows), which is what lets a save
+        run in the background.
+        """
+        return _pieces(self.root)
+
+    @property
+    def piece_count(self):
+        return len(self.pieces())
@@ -0,0 +1,187 @@
+"""Regex find and replace over the text editor's document.
+
+SearchJob scans a snapshot of the document (editor_buffer.Snapshot), so
+the user can keep editing while it runs. The snapshot is cut into
+CHUNK_BYTES chunks that are searched on a thread pool. Each chunk is read
+with CONTEXT_BYTES before it, so anchors and lookbehinds see the real
+text, and MAX_MATCH_BYTES after it, so a match that starts in the chunk
+can run past its end. A match is reported by the chunk it starts in.
+
+A coordinator thread collects the chunks in order and drops any match
+that starts inside the previous one. When that happens the chunk is
+searched again from where the previous match ended, the way a single
+re.finditer over the whole document would go on. Matches then go to the
+UI thread in batches through a bounded queue; poll() hands them over
+without ever blocking mainloop.
+
+Patterns are bytes patterns over the UTF-8 text: non-ASCII literals match,
+but \\w and IGNORECASE only know ASCII. Python's re holds the GIL while
+it scans, so the workers only search in parallel on a free-threaded
+build; elsewhere the pool still keeps the scan off the Tk thread.
+"""
+
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+CHUNK_BYTES = 1 << 20
+CONTEXT_BYTES = 1 << 10
+# Longest match found in full across a chunk boundary
+MAX_MATCH_BYTES = 1 << 16
+QUEUE_BATCHES = 16
+# UI time one poll() may spend handling matches
+POLL_BUDGET = 0.02
+
+# Results of poll()
+DONE = "done"
+CANCELLED = "cancelled"
+ERROR = "error"
+
+
+def compile_pattern(text, regex=True, match_case=True, encoding="utf-8"):
+    """Compile what was typed in the find box; raises re.error if invalid."""
+    pattern = text.encode(encoding)
+    if not regex:
+        pattern = re.escape(pattern)
+    return re.compile(pattern, re.MULTILINE | (0 if match_case else re.IGNORECASE))
+
+
+def replacement_for(pattern, template, regex=True, encoding="utf-8"):
+    """Function of a match giving its replacement bytes; raises re.error if invalid."""
+    template = template.encode(encoding)
+    if regex:
+        # Check the group references now, not in the middle of a search
+        pattern.sub(template, b"")
+        return lambda match: match.expand(template)
+    return lambda match: template
+
+
+class SearchJob:
+    """Find all matches of pattern in a document snapshot.
+
+    With replacement (see replacement_for), each match also carries its
+    replacement bytes, ready for PieceTable.replace_ranges().
+    """
+
+    def __init__(self, snapshot, pattern, replacement=None, version=None,
+                 chunk_bytes=CHUNK_BYTES, workers=None):
+        self.snapshot = snapshot
+        self.pattern = pattern
+        self.replacement = replacement
+        # Document version searched; matches are stale once it changes
+        self.version = version
+        self.chunk_bytes = chunk_bytes
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.bytes_searched = 0
+        self.matches = 0
+        self.queue = queue.Queue(maxsize=QUEUE_BATCHES)
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="find", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def wait(self):
+        """Wait for the search threads to stop, e.g. after cancel()."""
+        self.thread.join()
+
+    @property
+    def fraction(self):
+        size = self.snapshot.size
+        return self.bytes_searched / size if size else 1.0
+
+    def _search(self, start, end, position=None):
+        """Matches starting in [position or start, end) as (starts, ends, replacements)."""
+        position = start if position is None else position
+        context = max(0, position - CONTEXT_BYTES)
+        text = self.snapshot[context:end + MAX_MATCH_BYTES]
+        # A match at end belongs to the next chunk, unless this is the last
+        # one: then it is an empty match at the end of the document
+        last = end + (end == self.snapshot.size)
+        starts, ends, replacements = [], [], []
+        for match in self.pattern.finditer(text, position - context):
+            if match.start() + context >= last:
+                break
+            starts.append(match.start() + context)
+            ends.append(match.end() + context)
+            if self.replacement is not None:
+                replacements.append(self.replacement(match))
+        return starts, ends, replacements
+
+    def _put(self, message):
+        # A full queue means the UI is behind; wait, but stay cancellable
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run(self):
+        size, chunk_bytes = self.snapshot.size, self.chunk_bytes
+        # An empty document is still searched once, for empty matches
+        chunks = iter(range(0, max(size, 1), chunk_bytes))
+        pending = deque()
+        last_end = 0
+        try:
+            with ThreadPoolExecutor(self.workers, thread_name_prefix="find-chunk") as pool:
+                while True:
+                    # Keep a few chunks per worker in flight, in order
+                    while len(pending) < 2 * self.workers:
+                        start = next(chunks, None)
+                        if start is None:
+                            break
+                        end = min(size, start + chunk_bytes)
+                        pending.append((start, end, pool.submit(self._search, start, end)))
+                    if not pending or self.cancelled.is_set():
+                        break
+                    start, end, future = pending.popleft()
+                    starts, ends, replacements = future.result()
+                    if starts and starts[0] < last_end:
+                        # The previous chunk's last match runs into this one
+                        starts, ends, replacements = self._search(start, end, min(last_end, end))
+                    if starts:
+                        last_end = ends[-1]
+                        self.matches += len(starts)
+                    self.bytes_searched = end
+                    if starts and not self._put((starts, ends, replacements)):
+                        break
+                for _, _, future in pending:
+                    future.cancel()
+        except Exception as error:
+            # re.error, or a ValueError from a closed memory map; poll()
+            # must hear about it either way
+            self._put((ERROR, str(error) or type(error).__name__, None))
+            return
+        self._put((DONE, self.matches, None))
+
+    def poll(self, handle_matches, budget=POLL_BUDGET):
+        """Hand found matches to handle_matches(starts, ends, replacements) for about budget seconds.
+
+        Call from the UI thread. Returns None while the search is running,
+        else the final message: (DONE, matches), (CANCELLED, matches) or
+        (ERROR, message).
+        """
+        deadline = time.perf_counter() + budget
+        while time.perf_counter() < deadline:
+            try:
+                first, second, third = self.queue.get_nowait()
+            except queue.Empty:
+                if self.cancelled.is_set():
+                    return CANCELLED, self.matches
+                return None
+            if first in (DONE, ERROR):
+                return first, second
+            if self.cancelled.is_set():
+                return CANCELLED, self.matches
+            handle_matches(first, second, third)
+        return None
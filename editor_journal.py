@@ -0,0 +1,287 @@
+"""Autosave journal and crash recovery for the text editor.
+
+An EditJournal follows a PieceTable (editor_buffer) and appends every
+change to a journal file next to the document as compact binary records:
+
+    INSERT  offset, length, then the inserted bytes
+    DELETE  offset, length
+
+Records are collected in memory and written out by flush(), which the
+editor calls every FLUSH_INTERVAL seconds, so typing costs no disk I/O.
+Undo and redo are journaled like any other change, except that a change
+inserting more than COMPACT_BYTES (a replace-all) triggers a snapshot.
+
+The journal is relative to the last saved file, whose size and mtime are
+in its header. When the file grows past max(COMPACT_BYTES, 2 x the last
+snapshot) it is compacted: rewritten as a snapshot of the document, made
+of COPY records for the ranges still in the saved file and DATA records
+for everything else, so its size follows the unsaved changes rather than
+the editing history. After a save the journal is restarted the same way.
+Compaction writes and fsyncs the snapshot on a worker thread, like a save
+(editor_save), so a large paste or replace-all never stalls the Tk
+thread. Records made meanwhile still go to the old journal, and are
+copied after the snapshot when the next flush() renames it into place;
+after a large change the old journal no longer matches the document, so
+they are kept in memory only, and a crash loses them rather than
+replaying them onto the wrong text.
+
+On the next launch recover() replays the snapshot and the records onto
+the saved file, as long as that file has not changed since.
+"""
+
+import contextlib
+import os
+import struct
+import tempfile
+import threading
+
+from editor_buffer import ADD
+
+MAGIC = b"EDJ1"
+HEADER = struct.Struct("<4sQQ")
+RECORD = struct.Struct("<BQQ")
+
+INSERT = 1
+DELETE = 2
+# Snapshot records, only at the start of a journal
+COPY = 3
+DATA = 4
+
+FLUSH_INTERVAL = 0.3
+COMPACT_BYTES = 4 << 20
+UNTITLED_JOURNAL = os.path.join(os.path.expanduser("~"), ".text_editor_untitled.journal")
+
+
+def journal_path(path):
+    """The journal of the document saved at path, or of an untitled one."""
+    if path is None:
+        return UNTITLED_JOURNAL
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, f".{name}.journal")
+
+
+def file_identity(path):
+    """(size, mtime_ns) of path; (0, 0) for an untitled document."""
+    if path is None:
+        return 0, 0
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _records(data, position):
+    """(kind, offset, length, payload) of each complete record from position."""
+    while position + RECORD.size <= len(data):
+        kind, offset, length = RECORD.unpack_from(data, position)
+        position += RECORD.size
+        payload = None
+        if kind in (INSERT, DATA):
+            if position + length > len(data):
+                # Torn by the crash
+                return
+            payload = data[position:position + length]
+            position += length
+        elif kind not in (DELETE, COPY):
+            return
+        yield kind, offset, length, payload
+
+
+def recoverable(path):
+    """Whether path has a journal that applies to it as it is on disk."""
+    try:
+        with open(journal_path(path), "rb") as file:
+            header = file.read(HEADER.size)
+        magic, size, mtime_ns = HEADER.unpack(header)
+        return magic == MAGIC and (size, mtime_ns) == file_identity(path) and os.path.getsize(journal_path(path)) > HEADER.size
+    except (OSError, struct.error):
+        return False
+
+
+def recover(document, path):
+    """Replay path's journal onto document, a fresh PieceTable of the saved file.
+
+    Returns the number of changes replayed.
+    """
+    with open(journal_path(path), "rb") as file:
+        data = file.read()
+    pieces = []
+    snapshot = False
+    changes = 0
+    for kind, offset, length, payload in _records(data, HEADER.size):
+        if kind == COPY:
+            pieces.append((document.base, offset, length))
+            snapshot = True
+            continue
+        if kind == DATA:
+            pieces.append((ADD, len(document.add), length))
+            document.add.extend(payload)
+            snapshot = True
+            continue
+        if snapshot:
+            document.set_pieces(pieces)
+            snapshot = False
+        if offset + (length if kind == DELETE else 0) > document.size:
+            # Not written by this journal; keep what was replayed so far
+            break
+        if kind == INSERT:
+            document.insert(offset, payload)
+        else:
+            document.delete(offset, length)
+        changes += 1
+    if snapshot:
+        document.set_pieces(pieces)
+    return changes
+
+
+class EditJournal:
+    """Journal of a document's changes since it was last saved at path."""
+
+    def __init__(self, document, path, compact_bytes=COMPACT_BYTES):
+        self.document = document
+        self.path = path
+        self.journal_path = journal_path(path)
+        self.compact_bytes = compact_bytes
+        self.pending = bytearray()
+        self.file = None
+        self.size = 0
+        self.snapshot_size = 0
+        # Set by changes that are cheaper to journal as a snapshot
+        self.stale = False
+        # Worker writing a snapshot, and the records flushed since it started
+        self.compaction = None
+        self.carried = bytearray()
+        self.compacted = None
+        # False while the old journal is behind the compaction's snapshot
+        self.appending = True
+        self.compact()
+        document.subscribe(self._changed)
+
+    def _changed(self, offset, removed, inserted):
+        if self.stale:
+            return
+        if inserted > self.compact_bytes:
+            # A replace-all, or undoing one: the next flush takes a snapshot
+            # instead of copying the new text
+            self.stale = True
+            self.pending.clear()
+            return
+        if removed:
+            self.pending += RECORD.pack(DELETE, offset, removed)
+        if inserted:
+            self.pending += RECORD.pack(INSERT, offset, inserted)
+            self.pending += self.document[offset:offset + inserted]
+
+    def flush(self):
+        """Write the pending records; compacts the journal when it has grown.
+
+        Raises OSError if the last compaction failed.
+        """
+        if self.compaction is not None and not self.compaction.is_alive():
+            self._finish_compaction()
+        if self.pending:
+            if self.appending:
+                self.file.write(self.pending)
+                self.file.flush()
+                self.size += len(self.pending)
+            if self.compaction is not None:
+                self.carried += self.pending
+            self.pending.clear()
+        if self.compaction is None and (self.stale or self.size > max(self.compact_bytes, 2 * self.snapshot_size)):
+            self._start_compaction()
+
+    def compact(self):
+        """Rewrite the journal as a snapshot of the document and wait for it."""
+        if self.compaction is not None:
+            self._finish_compaction()
+        self._start_compaction()
+        self._finish_compaction()
+
+    def _start_compaction(self):
+        document = self.document
+        # Everything so far is in the snapshot
+        snapshot = document.snapshot() if document.modified else None
+        self.pending.clear()
+        # The old journal does not have the change that made it stale
+        self.appending = not self.stale
+        self.stale = False
+        self.carried = bytearray()
+        # Not a daemon: quitting the editor must not cut a rename short
+        self.compaction = threading.Thread(target=self._compact, args=(snapshot, document.base),
+                                           name="journal-compact")
+        self.compaction.start()
+
+    def _compact(self, snapshot, base):
+        """Write snapshot to a temporary file and fsync it, on the worker thread."""
+        temp_path = None
+        try:
+            directory = os.path.dirname(self.journal_path)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".journal.", suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                size, mtime_ns = file_identity(self.path)
+                file.write(HEADER.pack(MAGIC, size, mtime_ns))
+                if snapshot is not None:
+                    for source, start, length in snapshot.pieces:
+                        if source == base:
+                            file.write(RECORD.pack(COPY, start, length))
+                        else:
+                            file.write(RECORD.pack(DATA, 0, length))
+                            file.write(snapshot.buffers[source][start:start + length])
+                file.flush()
+                os.fsync(file.fileno())
+                self.compacted = temp_path, file.tell()
+        except Exception as error:
+            self.compacted = error
+            if temp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(temp_path)
+
+    def _finish_compaction(self):
+        """Rename the snapshot over the journal and copy the carried records to it.
+
+        A crash leaves one journal or the other intact.
+        """
+        self.compaction.join()
+        self.compaction = None
+        result, self.compacted = self.compacted, None
+        appending, self.appending = self.appending, True
+        if isinstance(result, Exception):
+            # The old journal is still whole, carried records included,
+            # unless it was behind: then the next flush tries again
+            if not appending:
+                self.stale = True
+            if isinstance(result, OSError):
+                raise result
+            raise OSError(f"Could not compact the journal: {result}") from result
+        temp_path, size = result
+        os.replace(temp_path, self.journal_path)
+        if self.file is not None:
+            self.file.close()
+        self.file = open(self.journal_path, "ab")
+        self.file.write(self.carried)
+        self.file.flush()
+        self.snapshot_size = size
+        self.size = size + len(self.carried)
+        self.carried = bytearray()
+
+    def close(self, discard=False):
+        """Stop journaling; the journal is kept only if there are unsaved changes.
+
+        With discard, it is deleted anyway (the changes were saved elsewhere).
+        """
+        self.document.unsubscribe(self._changed)
+        if discard or not self.document.modified:
+            if self.compaction is not None:
+                # Its snapshot is not needed any more
+                self.compaction.join()
+                self.compaction = None
+                if isinstance(self.compacted, tuple):
+                    os.remove(self.compacted[0])
+                self.compacted = None
+            self.file.close()
+            os.remove(self.journal_path)
+        else:
+            try:
+                self.flush()
+                if self.compaction is not None:
+                    self._finish_compaction()
+            finally:
+                self.file.close()
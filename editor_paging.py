@@ -0,0 +1,290 @@
+"""Paged access to very large text files for the text editor.
+
+LineReader reads lines at any byte offset of anything with a bytes-like
+data attribute (find, rfind, slicing) and a size. MappedFile is a
+LineReader over a memory map, so opening a multi-GB file costs one mmap
+call, not one read of the whole file; editor_buffer.PieceTable is one over
+an edited document.
+
+LineIndex records the offset of every STRIDE-th line; it is built in
+chunks on a background thread (with NumPy when available) and only needed
+for line numbers and "go to line", never for showing text. PageWindow keeps
+the few hundred lines around the viewport that the editor actually puts in
+its Text widget, and grows or shrinks them a page at a time.
+"""
+
+import mmap
+import os
+import threading
+from array import array
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Longer lines are shown split into pieces of this many bytes
+MAX_LINE_BYTES = 1 << 16
+PAGE_LINES = 400
+WINDOW_PAGES = 3
+STRIDE = 256
+INDEX_CHUNK = 1 << 22
+
+# surrogateescape decodes each undecodable byte to one of these; show U+FFFD
+SHOW_UNDECODABLE = {code: "\ufffd" for code in range(0xDC80, 0xDD00)}
+
+
+class LineReader:
+    """Line-oriented reads over self.data (bytes-like) of self.size bytes."""
+
+    encoding = "utf-8"
+
+    def decode(self, start, end):
+        """Text of the bytes [start, end) as shown, without a trailing CR.
+
+        Each byte that does not decode is shown as one U+FFFD, so columns
+        map back to bytes exactly (see column_offset and column_of).
+        """
+        text = self.data[start:end].decode(self.encoding, errors="surrogateescape")
+        if text.endswith("\r"):
+            text = text[:-1]
+        return text.translate(SHOW_UNDECODABLE)
+
+    def column_offset(self, start, column):
+        """Byte offset of character column of the line starting at start, as decode() shows it."""
+        # No character takes more than 4 bytes
+        text = self.data[start:start + 4 * column].decode(self.encoding, errors="surrogateescape")
+        return start + len(text[:column].encode(self.encoding, errors="surrogateescape"))
+
+    def column_of(self, start, offset):
+        """Character column of offset in the line starting at start."""
+        return len(self.data[start:offset].decode(self.encoding, errors="surrogateescape"))
+
+    def line_start(self, offset):
+        """Start of the line containing offset."""
+        if offset <= 0:
+            return 0
+        low = max(0, offset - MAX_LINE_BYTES)
+        newline = self.data.rfind(b"\n", low, offset)
+        return newline + 1 if newline >= 0 else low
+
+    def read_lines(self, offset, count, stop=None):
+        """Up to count (start, text) lines from offset, plus the offset after them.
+
+        Lines starting at or after stop are not read.
+        """
+        data, size = self.data, self.size
+        stop = size if stop is None else min(stop, size)
+        lines = []
+        while offset < stop and len(lines) < count:
+            newline = data.find(b"\n", offset, offset + MAX_LINE_BYTES)
+            if newline < 0:
+                end = next_offset = min(size, offset + MAX_LINE_BYTES)
+            else:
+                end, next_offset = newline, newline + 1
+            lines.append((offset, self.decode(offset, end)))
+            offset = next_offset
+        return lines, offset
+
+    def read_lines_before(self, offset, count):
+        """Up to count (start, text) lines ending just before offset."""
+        starts = []
+        while offset > 0 and len(starts) < count:
+            offset = self.line_start(offset - 1)
+            starts.append(offset)
+        starts.reverse()
+        if not starts:
+            return []
+        lines, _ = self.read_lines(starts[0], len(starts))
+        return lines
+
+
+class MappedFile(LineReader):
+    """Read-only memory map of a file."""
+
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self.file = open(path, "rb")
+        self.size = os.fstat(self.file.fileno()).st_size
+        # mmap cannot map empty files
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+
+    def close(self):
+        if self.size:
+            self.data.close()
+        self.file.close()
+
+
+class LineIndex:
+    """Offsets of every STRIDE-th line, built incrementally."""
+
+    def __init__(self, mapped, stride=STRIDE):
+        self.mapped = mapped
+        self.stride = stride
+        self.checkpoints = array("q", [0])
+        self.newlines = 0
+        self.indexed_to = 0
+        self.cancelled = threading.Event()
+        self.thread = None
+
+    @property
+    def complete(self):
+        return self.indexed_to >= self.mapped.size
+
+    @property
+    def line_count(self):
+        """Number of lines, once complete."""
+        data, size = self.mapped.data, self.mapped.size
+        return self.newlines + (1 if size and data[size - 1:size] != b"\n" else 0)
+
+    def build_step(self, chunk_bytes=INDEX_CHUNK):
+        """Index the next chunk_bytes of the file."""
+        start = self.indexed_to
+        end = min(self.mapped.size, start + chunk_bytes)
+        data = self.mapped.data
+        # Newline k of this chunk starts line newlines + k + 1; keep the
+        # ones that land on a multiple of the stride
+        skip = (-self.newlines - 1) % self.stride
+        if np is not None:
+            chunk = np.frombuffer(data, dtype=np.uint8, count=end - start, offset=start)
+            positions = np.flatnonzero(chunk == 10)
+            self.checkpoints.extend((positions[skip::self.stride] + (start + 1)).tolist())
+            found = len(positions)
+        else:
+            found = 0
+            position = data.find(b"\n", start, end)
+            while position >= 0:
+                if found % self.stride == skip:
+                    self.checkpoints.append(position + 1)
+                found += 1
+                position = data.find(b"\n", position + 1, end)
+        self.newlines += found
+        self.indexed_to = end
+
+    def build(self):
+        while not self.complete and not self.cancelled.is_set():
+            self.build_step()
+
+    def build_in_background(self):
+        self.thread = threading.Thread(target=self.build, name="line-index", daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def cancel(self):
+        self.cancelled.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def line_of(self, offset):
+        """0-based line number at offset, or None if not indexed yet."""
+        if offset > self.indexed_to:
+            return None
+        checkpoint = bisect_right(self.checkpoints, offset) - 1
+        start = self.checkpoints[checkpoint]
+        return checkpoint * self.stride + self.mapped.data[start:offset].count(b"\n")
+
+    def offset_of(self, line):
+        """Start offset of a 0-based line, or None if not indexed yet."""
+        checkpoint = line // self.stride
+        if checkpoint >= len(self.checkpoints):
+            return None
+        offset = self.checkpoints[checkpoint]
+        data = self.mapped.data
+        for _ in range(line % self.stride):
+            newline = data.find(b"\n", offset)
+            if newline < 0:
+                return None
+            offset = newline + 1
+        return offset
+
+
+class PageWindow:
+    """The lines currently materialized in the editor's Text widget."""
+
+    def __init__(self, source, page_lines=PAGE_LINES, max_pages=WINDOW_PAGES):
+        self.source = source
+        self.page_lines = page_lines
+        self.max_lines = page_lines * max_pages
+        self.starts = []
+        self.end = 0
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def start(self):
+        return self.starts[0] if self.starts else self.end
+
+    @property
+    def at_top(self):
+        return self.start == 0
+
+    @property
+    def at_bottom(self):
+        return self.end >= self.source.size
+
+    def load(self, offset):
+        """Replace the window with the pages around offset; returns the texts."""
+        start = self.source.line_start(min(max(0, offset), self.source.size))
+        # _last_line looks at starts, which must not be the old window's
+        self.starts = []
+        before = self.source.read_lines_before(start, self.page_lines)
+        after, self.end = self.source.read_lines(start, 2 * self.page_lines)
+        lines = before + after + self._last_line(after)
+        self.starts = [line_start for line_start, _ in lines]
+        return [text for _, text in lines], len(before)
+
+    def _last_line(self, lines):
+        """The empty line after a final newline, once the window reaches it."""
+        source = self.source
+        size = source.size
+        if self.end < size or (self.starts and self.starts[-1] == size) or (lines and lines[-1][0] == size):
+            return []
+        if size == 0 or source.data[size - 1:size] == b"\n":
+            return [(size, "")]
+        return []
+
+    def next_page(self):
+        """Read the page after the window: (texts, lines to drop from the top)."""
+        lines, self.end = self.source.read_lines(self.end, self.page_lines)
+        lines += self._last_line(lines)
+        self.starts.extend(line_start for line_start, _ in lines)
+        drop = max(0, len(self.starts) - self.max_lines)
+        del self.starts[:drop]
+        return [text for _, text in lines], drop
+
+    def previous_page(self):
+        """Read the page before the window: (texts, lines to drop from the bottom)."""
+        lines = self.source.read_lines_before(self.start, self.page_lines)
+        self.starts[:0] = [line_start for line_start, _ in lines]
+        drop = max(0, len(self.starts) - self.max_lines)
+        if drop:
+            self.end = self.starts[-drop]
+            del self.starts[-drop:]
+        return [text for _, text in lines], drop
+
+    def edited(self, offset, removed, inserted):
+        """Update the window after removed bytes at offset were replaced by inserted bytes.
+
+        Rows that start after the edit just move; only the rows the edit
+        touched are read again from the source.
+        """
+        starts = self.starts
+        row = max(0, bisect_right(starts, offset) - 1)
+        later = bisect_right(starts, offset + removed, row + 1)
+        delta = inserted - removed
+        self.end += delta
+        tail = [start + delta for start in starts[later:]]
+        stop = tail[0] if tail else self.end
+        lines, _ = self.source.read_lines(starts[row], stop - starts[row] + 1, stop=stop)
+        starts[row:] = [line_start for line_start, _ in lines] + tail
+        if not tail:
+            starts += [line_start for line_start, _ in self._last_line(lines)]
+
+    def offset_of_row(self, row):
+        """File offset of a 0-based row of the window."""
+        if not self.starts:
+            return self.end
+        return self.starts[min(max(0, row), len(self.starts) - 1)]
@@ -0,0 +1,156 @@
+"""Atomic background saving for the text editor.
+
+SaveJob takes a snapshot of the document's pieces (see editor_buffer) and
+writes them on a worker thread to a temporary file next to the target,
+which is then fsynced and renamed over the target. A crash or a full disk
+mid-save leaves the old file untouched, and the Tk thread only polls the
+job's progress, so mainloop never waits for the disk.
+
+Only the dirty ranges, the pieces that come from the add buffer, are
+written from memory. Unchanged ranges of the original file are copied
+with os.copy_file_range where the platform has it, so the kernel moves
+them without passing the bytes through Python, and saving a small edit to
+a huge file costs little more than a copy.
+"""
+
+import contextlib
+import os
+import shutil
+import tempfile
+import threading
+
+from editor_buffer import CHUNK_BYTES
+
+# Results of poll()
+DONE = "done"
+CANCELLED = "cancelled"
+ERROR = "error"
+
+
+class SaveCancelled(Exception):
+    pass
+
+
+def _fsync_directory(directory):
+    """Make a rename in directory durable; not possible on Windows."""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class SaveJob:
+    """Write a PieceTable to path on a worker thread."""
+
+    def __init__(self, document, path, original_file=None, chunk_bytes=CHUNK_BYTES):
+        self.document = document
+        self.path = path
+        # Version being saved; edits made meanwhile stay unsaved
+        self.version = document.version
+        self.pieces = document.pieces()
+        self.total_bytes = document.size
+        self.bytes_written = 0
+        self.chunk_bytes = chunk_bytes
+        # Open file the current original was mapped from, for kernel copies
+        self.base = document.base
+        self.original_fd = original_file.fileno() if original_file is not None else None
+        self.result = None
+        self.cancelled = threading.Event()
+        # Not a daemon: quitting the editor must not cut a save short
+        self.thread = threading.Thread(target=self._run, name="save")
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def wait(self):
+        self.thread.join()
+        return self.result
+
+    @property
+    def fraction(self):
+        return self.bytes_written / self.total_bytes if self.total_bytes else 1.0
+
+    def poll(self):
+        """None while the save is running, else (DONE, bytes), (CANCELLED, bytes) or (ERROR, message)."""
+        return None if self.thread.is_alive() else self.result
+
+    def _run(self):
+        temp_path = None
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(self.path)}.", suffix=".saving")
+            with os.fdopen(fd, "wb", buffering=0) as file:
+                self._write(file)
+                os.fsync(file.fileno())
+            if os.path.exists(self.path):
+                shutil.copymode(self.path, temp_path)
+            os.replace(temp_path, self.path)
+            _fsync_directory(directory)
+            self.result = (DONE, self.bytes_written)
+        except SaveCancelled:
+            self.result = (CANCELLED, self.bytes_written)
+        except Exception as error:
+            # Whatever went wrong, poll() must report it; ValueError, for
+            # one, means the original's memory map was closed under us
+            self.result = (ERROR, str(error) or type(error).__name__)
+        finally:
+            if temp_path is not None and os.path.exists(temp_path):
+                with contextlib.suppress(OSError):
+                    os.remove(temp_path)
+
+    def _write(self, file):
+        document, chunk_bytes = self.document, self.chunk_bytes
+        pending = bytearray()
+        for source, start, length in self.pieces:
+            if source == self.base and self.original_fd is not None and length >= chunk_bytes:
+                # Flush the dirty bytes before the kernel appends after them
+                self._flush(file, pending)
+                self._copy(file, start, length)
+                continue
+            buffer = document.buffers[source]
+            for chunk_start in range(start, start + length, chunk_bytes):
+                pending += buffer[chunk_start:min(start + length, chunk_start + chunk_bytes)]
+                if len(pending) >= chunk_bytes:
+                    self._flush(file, pending)
+        self._flush(file, pending)
+
+    def _flush(self, file, pending):
+        self._write_all(file, pending)
+        pending.clear()
+
+    def _write_all(self, file, data):
+        if self.cancelled.is_set():
+            raise SaveCancelled()
+        # An unbuffered file may write less than asked
+        written = 0
+        with memoryview(data) as view:
+            while written < len(data):
+                written += file.write(view[written:])
+        self.bytes_written += len(data)
+
+    def _copy(self, file, start, length):
+        end = start + length
+        while start < end:
+            if self.cancelled.is_set():
+                raise SaveCancelled()
+            count = min(self.chunk_bytes, end - start)
+            if self.original_fd is not None:
+                try:
+                    count = os.copy_file_range(self.original_fd, file.fileno(), count, start)
+                except (AttributeError, OSError):
+                    # No copy_file_range here, or not across these file systems
+                    self.original_fd = None
+                    continue
+                if count == 0:
+                    raise OSError(f"{self.path}: original file is shorter than expected")
+                self.bytes_written += count
+            else:
+                self._write_all(file, self.document.buffers[self.base][start:start + count])
+            start += count
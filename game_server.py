@@ -0,0 +1,194 @@
+"""Asyncio TCP server hosting many number guessing games at once.
+
+Every connection is one player with its own Session. The protocol is one
+ASCII command per line; every command gets exactly one reply line.
+
+    NEW [1|2|3]   start a game (default Medium)  -> START <max_number> <max_attempts>
+    <number>      make a guess                   -> LOW <left> | HIGH <left> | WIN <attempts>
+                                                    | LOSE <secret> | RANGE <max_number>
+    HINT          suggested next guess           -> HINT <number>
+    STATS         games played on this connection -> STATS <games> <wins>
+    QUIT          close the connection           -> BYE
+
+Errors reply ``ERR <reason>``. A connection that sends nothing for
+idle_timeout seconds gets ``TIMEOUT`` and is closed.
+
+Example:
+    python game_server.py --port 5050
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import solver
+from simple_game import (DIFFICULTIES, DEFAULT_CHOICE, MAX_ATTEMPTS, CORRECT, TOO_LOW, TOO_HIGH,
+                         OUT_OF_RANGE, NOT_A_NUMBER, GuessingGame, submit_guess)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5050
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+
+class Session:
+    """State for one connected player."""
+
+    __slots__ = ("game", "games", "wins", "last_active", "timed_out")
+
+    def __init__(self):
+        self.game = None
+        self.games = 0
+        self.wins = 0
+        self.last_active = time.monotonic()
+        self.timed_out = False
+
+    def new_game(self, choice, rng):
+        _, max_number = DIFFICULTIES.get(choice, DIFFICULTIES[DEFAULT_CHOICE])
+        if self.game is None:
+            self.game = GuessingGame(max_number, MAX_ATTEMPTS, rng=rng)
+        else:
+            # Reuse the game object between rounds
+            self.game.max_number = max_number
+            self.game.reset(rng=rng)
+        return f"START {max_number} {self.game.max_attempts}"
+
+    def handle(self, line, rng):
+        """Return the reply line for one command line."""
+        command, _, argument = line.strip().partition(" ")
+        command = command.upper()
+
+        if command == "NEW":
+            return self.new_game(argument.strip() or DEFAULT_CHOICE, rng)
+        if command == "HINT":
+            if self.game is None or self.game.over:
+                return "ERR no game"
+            return f"HINT {solver.next_guess(self.game.low, self.game.high)}"
+        if command == "STATS":
+            return f"STATS {self.games} {self.wins}"
+
+        game = self.game
+        if game is None or game.over:
+            return "ERR no game"
+        outcome = submit_guess(game, command)
+        if outcome == NOT_A_NUMBER:
+            return "ERR unknown command"
+        if outcome == OUT_OF_RANGE:
+            return f"RANGE {game.max_number}"
+        if outcome == CORRECT:
+            self.games += 1
+            self.wins += 1
+            return f"WIN {game.attempts}"
+        if game.over:
+            self.games += 1
+            return f"LOSE {game.secret_number}"
+        if outcome == TOO_LOW:
+            return f"LOW {game.attempts_left}"
+        if outcome == TOO_HIGH:
+            return f"HIGH {game.attempts_left}"
+        return "ERR no game"
+
+
+class GameServer:
+    """Accepts connections and runs one Session per connection."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, idle_timeout=DEFAULT_IDLE_TIMEOUT, seed=None):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.rng = random.Random(seed)
+        self.total_sessions = 0
+        # Session -> StreamWriter for every open connection
+        self.connections = {}
+        self.server = None
+        self.reaper = None
+
+    @property
+    def active_sessions(self):
+        return len(self.connections)
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        # Port 0 means "pick a free port"; report the real one
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.reaper = asyncio.ensure_future(self.reap_idle_sessions())
+        return self.server
+
+    async def close(self):
+        if self.reaper is not None:
+            self.reaper.cancel()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def reap_idle_sessions(self):
+        """Close connections idle for longer than idle_timeout.
+
+        One periodic sweep is much cheaper than a timer per readline when
+        thousands of sessions are connected.
+        """
+        interval = max(self.idle_timeout / 4, 0.05)
+        while True:
+            await asyncio.sleep(interval)
+            cutoff = time.monotonic() - self.idle_timeout
+            for session, writer in list(self.connections.items()):
+                if session.last_active < cutoff:
+                    session.timed_out = True
+                    writer.write(b"TIMEOUT\n")
+                    writer.close()
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def handle_connection(self, reader, writer):
+        session = Session()
+        self.connections[session] = writer
+        self.total_sessions += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line or session.timed_out:
+                    break
+                session.last_active = time.monotonic()
+                text = line.decode("ascii", "replace")
+                if text.strip().upper() == "QUIT":
+                    writer.write(b"BYE\n")
+                    break
+                writer.write(session.handle(text, self.rng).encode("ascii") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            del self.connections[session]
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the number guessing game over TCP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = GameServer(args.host, args.port, args.idle_timeout, args.seed)
+
+    async def run():
+        await server.start()
+        print(f"Serving the number guessing game on {server.host}:{server.port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+
+if __name__ == "__main__":
+    main()
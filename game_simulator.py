@@ -0,0 +1,107 @@
+"""Batch simulator for the number guessing game.
+
+Plays many games of simple_game.GuessingGame without any input/output,
+driven by pluggable guessing strategies.
+
+A strategy is any callable ``strategy(low, high, rng)`` that returns the
+next guess, given that the secret number is known to lie in [low, high].
+
+Example:
+    python game_simulator.py --strategy bisection --difficulty 3 --games 1000000
+"""
+
+import argparse
+import functools
+import random
+import time
+
+from secret_stream import SecretStream
+from simple_game import DIFFICULTIES, MAX_ATTEMPTS, CORRECT, OUT_OF_RANGE, GameStats, GuessingGame
+
+
+def bisection(low, high, rng):
+    """Always guess the middle of the remaining range."""
+    return (low + high) // 2
+
+
+def random_guess(low, high, rng):
+    """Guess uniformly at random inside the remaining range."""
+    return rng.randint(low, high)
+
+
+def biased_split(low, high, rng, ratio=0.5):
+    """Guess at a fixed fraction of the remaining range (0.5 is bisection)."""
+    return low + int((high - low) * ratio)
+
+
+def linear_scan(low, high, rng):
+    """Guess the smallest remaining number."""
+    return low
+
+
+STRATEGIES = {
+    # Minimax-optimal (see solver.py)
+    "bisection": bisection,
+    "random": random_guess,
+    "biased_third": functools.partial(biased_split, ratio=1 / 3),
+    "biased_quarter": functools.partial(biased_split, ratio=0.25),
+    "linear": linear_scan,
+}
+
+
+def play_game(game, strategy, rng):
+    """Play one game to the end with strategy; return True if it was won."""
+    while not game.over:
+        guess = strategy(game.low, game.high, rng)
+        outcome = game.guess(guess)
+        if outcome == CORRECT:
+            return True
+        if outcome == OUT_OF_RANGE:
+            raise ValueError(f"strategy guessed {guess!r}, outside 1-{game.max_number}")
+    return False
+
+
+def simulate(strategy, games, max_number=100, max_attempts=MAX_ATTEMPTS, seed=None, secrets=None):
+    """Play games with strategy and return a GameStats.
+
+    Secret numbers come from secrets (a SecretStream over 1..max_number),
+    by default a stream seeded with seed.
+    """
+    rng = random.Random(seed)
+    if secrets is None:
+        secrets = SecretStream(max_number, seed)
+    result = GameStats(max_attempts)
+    histogram = result.attempts_histogram
+    game = GuessingGame(max_number, max_attempts, secret_number=1)
+    wins = 0
+    for _ in range(games):
+        game.reset(next(secrets))
+        if play_game(game, strategy, rng):
+            wins += 1
+            histogram[game.attempts] += 1
+    result.games = games
+    result.wins = wins
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate number guessing games.")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="bisection")
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTIES), default="2")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    difficulty, max_number = DIFFICULTIES[args.difficulty]
+    start = time.perf_counter()
+    result = simulate(STRATEGIES[args.strategy], args.games, max_number, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"Strategy: {args.strategy}  Difficulty: {difficulty} (1-{max_number})")
+    print(f"Games: {result.games}  Wins: {result.wins}  Win rate: {result.win_rate:.2%}")
+    print(f"Average attempts (wins): {result.average_attempts:.3f}")
+    print(f"Elapsed: {elapsed:.2f}s ({result.games / elapsed:,.0f} games/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Compact binary traces of guessing games.
+
+GameRecorder appends one fixed-width 16-byte record per event (game start,
+every guess or invalid input, hints, and how the game ended) to a trace
+file. TraceReader memory-maps a trace as a NumPy structured array and
+computes statistics chunk by chunk, so files with hundreds of millions of
+records are scanned without turning records into Python objects.
+
+Record layout (little-endian):
+
+    game_id     uint32   unique per game within a file
+    max_number  uint32   range of the game (identifies the difficulty)
+    value       int32    guess, or the secret for START/LOSE/ABANDON
+    event       uint8    one of the event codes below
+    attempt     uint8    attempts used after this event
+    elapsed     uint16   tenths of a second since the game started (saturating)
+
+Example:
+    python simple_game.py --trace games.trace
+    python game_trace.py games.trace
+"""
+
+import argparse
+import json
+import os
+import struct
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from simple_game import CORRECT, TOO_LOW, TOO_HIGH, OUT_OF_RANGE, NOT_A_NUMBER
+
+RECORD = struct.Struct("<IIiBBH")
+RECORD_SIZE = RECORD.size
+
+# Event codes
+START = 0
+LOW = 1
+HIGH = 2
+WIN = 3
+LOSE = 4
+OUT_OF_RANGE_INPUT = 5
+INVALID_INPUT = 6
+HINT = 7
+ABANDON = 8
+
+OUTCOME_EVENTS = {
+    TOO_LOW: LOW,
+    TOO_HIGH: HIGH,
+    CORRECT: WIN,
+    OUT_OF_RANGE: OUT_OF_RANGE_INPUT,
+    NOT_A_NUMBER: INVALID_INPUT,
+}
+
+INT32_MIN, INT32_MAX = -(1 << 31), (1 << 31) - 1
+
+FLUSH_BYTES = 64 * 1024
+DEFAULT_CHUNK_RECORDS = 1 << 22
+
+
+class GameRecorder:
+    """Appends game events to a trace file, buffered in memory."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "ab")
+        # A crash mid-write can leave a torn record at the end; cut it off
+        # so the records appended after it stay aligned
+        size = os.path.getsize(path)
+        size -= size % RECORD_SIZE
+        self.file.truncate(size)
+        # Every game writes at least one record, so the record count is a
+        # safe first id for games appended to an existing trace
+        self.next_game_id = size // RECORD_SIZE
+        self.buffer = bytearray()
+        self.game_id = None
+        self.started = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, game, event, value):
+        elapsed = min(int((time.monotonic() - self.started) * 10), 0xFFFF)
+        value = max(INT32_MIN, min(value, INT32_MAX))
+        self.buffer += RECORD.pack(self.game_id, game.max_number, value, event, game.attempts, elapsed)
+        if len(self.buffer) >= FLUSH_BYTES:
+            self.flush()
+
+    def start(self, game):
+        """Record the start of a new GuessingGame."""
+        self.game_id = self.next_game_id
+        self.next_game_id += 1
+        self.started = time.monotonic()
+        self._write(game, START, game.secret_number)
+
+    def guess(self, game, outcome, number=0):
+        """Record the outcome of one submit_guess() call."""
+        self._write(game, OUTCOME_EVENTS[outcome], number)
+        if game.over and not game.won:
+            self._write(game, LOSE, game.secret_number)
+
+    def hint(self, game, suggestion):
+        self._write(game, HINT, suggestion)
+
+    def abandon(self, game):
+        """Record that the player left before the game ended."""
+        self._write(game, ABANDON, game.secret_number)
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+def record_dtype():
+    return np.dtype([
+        ("game_id", "<u4"),
+        ("max_number", "<u4"),
+        ("value", "<i4"),
+        ("event", "u1"),
+        ("attempt", "u1"),
+        ("elapsed", "<u2"),
+    ])
+
+
+class TraceReader:
+    """Memory-mapped, chunked analytics over a trace file."""
+
+    def __init__(self, path, chunk_records=DEFAULT_CHUNK_RECORDS):
+        if np is None:
+            raise ImportError("TraceReader requires NumPy (pip install numpy)")
+        self.path = path
+        self.chunk_records = chunk_records
+        # Ignore a partially written record at the end of the file
+        self.count = os.path.getsize(path) // RECORD_SIZE
+        if self.count:
+            self.records = np.memmap(path, dtype=record_dtype(), mode="r", shape=(self.count,))
+        else:
+            self.records = np.empty(0, dtype=record_dtype())
+
+    def __len__(self):
+        return self.count
+
+    def chunks(self):
+        """Yield consecutive views of at most chunk_records records."""
+        for start in range(0, self.count, self.chunk_records):
+            yield self.records[start:start + self.chunk_records]
+
+    def summary(self):
+        """Per-difficulty statistics keyed by max_number.
+
+        For every range: games started, won, lost and abandoned, average
+        attempts of finished games, the invalid-input rate among all
+        inputs, and a histogram of attempts used when players gave up.
+        """
+        totals = {}
+
+        def counters(max_number):
+            if max_number not in totals:
+                totals[max_number] = {
+                    "started": 0, "won": 0, "lost": 0, "abandoned": 0,
+                    "finished_attempts": 0, "inputs": 0, "invalid_inputs": 0,
+                    "abandon_attempts": np.zeros(256, dtype=np.int64),
+                }
+            return totals[max_number]
+
+        for chunk in self.chunks():
+            event = np.asarray(chunk["event"])
+            max_number = np.asarray(chunk["max_number"])
+            attempt = np.asarray(chunk["attempt"])
+            for value in np.unique(max_number):
+                in_range = max_number == value
+                events = event[in_range]
+                attempts = attempt[in_range]
+                counts = np.bincount(events, minlength=ABANDON + 1)
+                finished = (events == WIN) | (events == LOSE)
+                abandoned = events == ABANDON
+
+                total = counters(int(value))
+                total["started"] += int(counts[START])
+                total["won"] += int(counts[WIN])
+                total["lost"] += int(counts[LOSE])
+                total["abandoned"] += int(counts[ABANDON])
+                total["finished_attempts"] += int(attempts[finished].sum(dtype=np.int64))
+                invalid = int(counts[OUT_OF_RANGE_INPUT] + counts[INVALID_INPUT])
+                # A losing guess is logged once as LOW/HIGH, LOSE is not an input
+                total["inputs"] += invalid + int(counts[LOW] + counts[HIGH] + counts[WIN])
+                total["invalid_inputs"] += invalid
+                total["abandon_attempts"] += np.bincount(attempts[abandoned], minlength=256)
+
+        report = {}
+        for max_number, total in sorted(totals.items()):
+            finished = total["won"] + total["lost"]
+            histogram = total["abandon_attempts"]
+            last = int(np.flatnonzero(histogram)[-1]) + 1 if histogram.any() else 0
+            report[max_number] = {
+                "games_started": total["started"],
+                "won": total["won"],
+                "lost": total["lost"],
+                "abandoned": total["abandoned"],
+                "average_attempts": total["finished_attempts"] / finished if finished else 0.0,
+                "invalid_input_rate": total["invalid_inputs"] / total["inputs"] if total["inputs"] else 0.0,
+                "abandoned_at_attempt": histogram[:last].tolist(),
+            }
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a guessing game trace file.")
+    parser.add_argument("path")
+    parser.add_argument("--chunk-records", type=int, default=DEFAULT_CHUNK_RECORDS)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    reader = TraceReader(args.path, args.chunk_records)
+    report = reader.summary()
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"records": len(reader), "elapsed_sec": elapsed, "by_max_number": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Persistent leaderboard for the number guessing game.
+
+Results are appended, one line each, to a tab-separated file that is never
+rewritten:
+
+    difficulty  player  attempts  won  timestamp
+
+Queries are answered from an in-memory index built lazily on the first
+query by scanning the file once:
+
+* a bounded heap per difficulty holding the best ``top_k`` wins,
+* per-player arrays of line offsets, so a player's history is read with a
+  few seeks instead of a scan.
+
+After that, only lines appended since the last query (by this process or
+any other) are read, so the whole file is never rescanned per query.
+
+Example:
+    python leaderboard.py leaderboard.tsv --difficulty Hard --top 10
+    python leaderboard.py leaderboard.tsv --player alice
+"""
+
+import argparse
+import heapq
+import os
+import time
+from array import array
+
+DEFAULT_TOP_K = 100
+
+
+def clean_name(player):
+    """Player names cannot contain the field or record separators."""
+    return " ".join(player.split()) or "anonymous"
+
+
+class Result:
+    """One recorded game."""
+
+    __slots__ = ("difficulty", "player", "attempts", "won", "timestamp")
+
+    def __init__(self, difficulty, player, attempts, won, timestamp):
+        self.difficulty = difficulty
+        self.player = player
+        self.attempts = attempts
+        self.won = won
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_line(cls, line):
+        difficulty, player, attempts, won, timestamp = line.rstrip("\n").split("\t")
+        return cls(difficulty, player, int(attempts), won == "1", float(timestamp))
+
+    def to_line(self):
+        return f"{self.difficulty}\t{self.player}\t{self.attempts}\t{int(self.won)}\t{self.timestamp:.3f}\n"
+
+    def as_dict(self):
+        return {
+            "difficulty": self.difficulty,
+            "player": self.player,
+            "attempts": self.attempts,
+            "won": self.won,
+            "timestamp": self.timestamp,
+        }
+
+
+class Leaderboard:
+    """Append-only results file with a lazily built top-k and per-player index."""
+
+    def __init__(self, path, top_k=DEFAULT_TOP_K):
+        self.path = path
+        self.top_k = top_k
+        self._reset_index()
+
+    def _reset_index(self):
+        # difficulty -> heap of (-attempts, -sequence, Result); heap[0] is the worst kept entry
+        self._best = {}
+        # player -> array of byte offsets of that player's lines
+        self._offsets = {}
+        self._indexed_to = 0
+        self._sequence = 0
+
+    def record(self, difficulty, player, attempts, won, timestamp=None):
+        """Append one game result and return it."""
+        result = Result(difficulty, clean_name(player), attempts, won,
+                        time.time() if timestamp is None else timestamp)
+        line = result.to_line().encode("utf-8")
+        with open(self.path, "a+b") as file:
+            if file.tell():
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    # The last record was torn by a crash; end it so this one stays whole
+                    line = b"\n" + line
+            file.write(line)
+        return result
+
+    def record_game(self, difficulty, player, game):
+        """Append a finished simple_game.GuessingGame."""
+        return self.record(difficulty, player, game.attempts, game.won)
+
+    def _index(self, offset, line):
+        try:
+            result = Result.from_line(line)
+        except ValueError:
+            # Torn by a crash; record() ends such a line before appending
+            return
+        self._offsets.setdefault(result.player, array("q")).append(offset)
+        if not result.won:
+            return
+        self._sequence += 1
+        heap = self._best.setdefault(result.difficulty, [])
+        # Fewer attempts wins; on ties the earlier record wins
+        key = (-result.attempts, -self._sequence)
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, key + (result,))
+        elif key > heap[0][:2]:
+            heapq.heapreplace(heap, key + (result,))
+
+    def _catch_up(self):
+        """Index lines appended since the last query."""
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return
+        if size < self._indexed_to:
+            # The file was replaced; start over
+            self._reset_index()
+        if size == self._indexed_to:
+            return
+        with open(self.path, "rb") as file:
+            file.seek(self._indexed_to)
+            offset = self._indexed_to
+            for raw in file:
+                if not raw.endswith(b"\n"):
+                    # A writer is mid-append; pick the line up next time
+                    break
+                self._index(offset, raw.decode("utf-8", "replace"))
+                offset += len(raw)
+        self._indexed_to = offset
+
+    def best(self, difficulty, n=10):
+        """The n best wins for difficulty, fewest attempts first."""
+        if n > self.top_k:
+            # The index only keeps top_k; widen it and rebuild once
+            self.top_k = n
+            self._reset_index()
+        self._catch_up()
+        heap = self._best.get(difficulty, [])
+        return [result for _, _, result in sorted(heap, reverse=True)[:n]]
+
+    def history(self, player, limit=None):
+        """A player's results, most recent first."""
+        self._catch_up()
+        offsets = self._offsets.get(clean_name(player), ())
+        if limit is not None:
+            offsets = offsets[-limit:] if limit else ()
+        if not offsets:
+            return []
+        results = []
+        with open(self.path, "rb") as file:
+            for offset in reversed(offsets):
+                file.seek(offset)
+                results.append(Result.from_line(file.readline().decode("utf-8")))
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query a guessing game leaderboard.")
+    parser.add_argument("path")
+    parser.add_argument("--difficulty", default="Medium")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--player", help="show this player's history instead")
+    args = parser.parse_args()
+
+    board = Leaderboard(args.path)
+    if args.player:
+        for result in board.history(args.player, args.top):
+            outcome = "won" if result.won else "lost"
+            print(f"{time.ctime(result.timestamp)}  {result.difficulty:<6}  {outcome} in {result.attempts}")
+        return
+
+    print(f"🏆 Best {args.top} ({args.difficulty})")
+    for rank, result in enumerate(board.best(args.difficulty, args.top), 1):
+        print(f"{rank:>3}. {result.player:<20} {result.attempts} attempt(s)")
+
+
+if __name__ == "__main__":
+    main()
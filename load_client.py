@@ -0,0 +1,132 @@
+"""Load generator for game_server.py.
+
+Opens many concurrent connections, plays bisection games on each as fast as
+the server answers, and reports throughput (guesses/sec) and response
+latency percentiles.
+
+Example:
+    python game_server.py &
+    python load_client.py --clients 2000 --duration 10
+
+With --spawn-server the client starts an in-process server on a free port,
+which is handy for a quick measurement on one machine.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from game_server import DEFAULT_HOST, DEFAULT_PORT, GameServer
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def play(host, port, difficulty, deadline, latencies):
+    """Play games on one connection until deadline; return (games, guesses)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    clock = time.perf_counter
+    games = guesses = 0
+
+    async def request(line):
+        start = clock()
+        writer.write(line)
+        reply = await reader.readline()
+        latencies.append(clock() - start)
+        return reply.split()
+
+    try:
+        new_game = f"NEW {difficulty}\n".encode("ascii")
+        while clock() < deadline:
+            reply = await request(new_game)
+            low, high = 1, int(reply[1])
+            while True:
+                guess = (low + high) // 2
+                reply = await request(b"%d\n" % guess)
+                guesses += 1
+                kind = reply[0]
+                if kind == b"LOW":
+                    low = guess + 1
+                elif kind == b"HIGH":
+                    high = guess - 1
+                else:
+                    break
+            games += 1
+        writer.write(b"QUIT\n")
+        await reader.readline()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return games, guesses
+
+
+async def run_load(host, port, clients, duration, difficulty="3", spawn_server=False):
+    """Run the load test and return a results dict."""
+    server = None
+    if spawn_server:
+        server = GameServer(host, 0)
+        await server.start()
+        port = server.port
+
+    # One list per client keeps appends cheap; merged at the end
+    latencies = [[] for _ in range(clients)]
+    start = time.perf_counter()
+    deadline = start + duration
+    counts = await asyncio.gather(*(
+        play(host, port, difficulty, deadline, latencies[i]) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        await server.close()
+
+    merged = sorted(value for client in latencies for value in client)
+    guesses = sum(guesses for _, guesses in counts)
+    return {
+        "clients": clients,
+        "elapsed_sec": elapsed,
+        "games": sum(games for games, _ in counts),
+        "guesses": guesses,
+        "requests": len(merged),
+        "guesses_per_sec": guesses / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "p50": percentile(merged, 0.50) * 1000,
+            "p90": percentile(merged, 0.90) * 1000,
+            "p99": percentile(merged, 0.99) * 1000,
+            "max": (merged[-1] if merged else 0.0) * 1000,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the guessing game server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--difficulty", choices=["1", "2", "3"], default="3")
+    parser.add_argument("--spawn-server", action="store_true",
+                        help="run the server in this process instead of connecting to one")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load(args.host, args.port, args.clients, args.duration,
+                                   args.difficulty, args.spawn_server))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    latency = results["latency_ms"]
+    print(f"Clients: {results['clients']}  Games: {results['games']:,}  Guesses: {results['guesses']:,}")
+    print(f"Throughput: {results['guesses_per_sec']:,.0f} guesses/sec")
+    print(f"Latency ms: p50 {latency['p50']:.2f}  p90 {latency['p90']:.2f}  "
+          f"p99 {latency['p99']:.2f}  max {latency['max']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
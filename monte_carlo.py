@@ -0,0 +1,150 @@
+"""Vectorized NumPy Monte Carlo mode for guessing-game statistics.
+
+Instead of playing one game at a time like game_simulator.simulate, this
+module draws secret numbers in bulk and advances whole populations of games
+one attempt at a time with array operations. Tens of millions of games
+finish in seconds.
+
+Strategies are described by how they split the remaining range [low, high]:
+a fixed ratio (0.5 is bisection, see game_simulator.biased_split) or
+``None`` for a uniformly random guess inside the range.
+
+Example:
+    python monte_carlo.py --games 10000000 --strategy bisection --strategy random --strategy biased:0.33
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from simple_game import DIFFICULTIES, MAX_ATTEMPTS, GameStats
+
+# Named strategies, mirroring game_simulator.STRATEGIES
+SPLIT_RATIOS = {
+    "bisection": 0.5,
+    "random": None,
+    "biased_third": 1 / 3,
+    "biased_quarter": 0.25,
+    "linear": 0.0,
+}
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def parse_strategy(name):
+    """Return the split ratio for a strategy name or ``biased:<ratio>``."""
+    if name in SPLIT_RATIOS:
+        return SPLIT_RATIOS[name]
+    if name.startswith("biased:"):
+        ratio = float(name.split(":", 1)[1])
+        if not 0.0 <= ratio <= 1.0:
+            raise ValueError(f"split ratio must be between 0 and 1, got {ratio}")
+        return ratio
+    raise ValueError(f"unknown strategy: {name!r}")
+
+
+def simulate_chunk(rng, size, max_number, max_attempts, ratio, histogram):
+    """Play size games at once, adding wins per attempt to histogram; return wins."""
+    dtype = np.int32 if max_number < 2 ** 31 - 1 else np.int64
+    secret = rng.integers(1, max_number + 1, size=size, dtype=dtype)
+    low = np.ones(size, dtype=dtype)
+    high = np.full(size, max_number, dtype=dtype)
+    wins = 0
+
+    for attempt in range(1, max_attempts + 1):
+        if ratio is None:
+            guess = rng.integers(low, high + 1, dtype=dtype)
+        else:
+            guess = low + ((high - low) * ratio).astype(dtype)
+
+        hit = guess == secret
+        hits = int(np.count_nonzero(hit))
+        histogram[attempt] += hits
+        wins += hits
+
+        # Drop finished games so later attempts only touch live ones
+        if hits:
+            alive = ~hit
+            secret, low, high, guess = secret[alive], low[alive], high[alive], guess[alive]
+        if not secret.size:
+            break
+
+        too_low = guess < secret
+        np.putmask(low, too_low, guess + 1)
+        np.putmask(high, ~too_low, guess - 1)
+
+    return wins
+
+
+def simulate(ratio, games, max_number=100, max_attempts=MAX_ATTEMPTS, seed=None,
+             chunk_size=DEFAULT_CHUNK_SIZE):
+    """Play games with a split-ratio strategy and return a GameStats."""
+    rng = np.random.default_rng(seed)
+    result = GameStats(max_attempts)
+    histogram = result.attempts_histogram
+    remaining = games
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        result.wins += simulate_chunk(rng, size, max_number, max_attempts, ratio, histogram)
+        result.games += size
+        remaining -= size
+    return result
+
+
+def simulate_population(strategies, games, max_number=100, max_attempts=MAX_ATTEMPTS, seed=None,
+                        chunk_size=DEFAULT_CHUNK_SIZE):
+    """Run every strategy name in strategies and return {name: GameStats}.
+
+    Each strategy gets its own child stream of seed so results do not depend on
+    which other strategies are in the population.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(strategies))
+    return {
+        name: simulate(parse_strategy(name), games, max_number, max_attempts, child, chunk_size)
+        for name, child in zip(strategies, seeds)
+    }
+
+
+def expected_attempts(result):
+    """Expected attempts used per game, counting lost games as max_attempts."""
+    if not result.games:
+        return 0.0
+    max_attempts = len(result.attempts_histogram) - 1
+    used = sum(n * count for n, count in enumerate(result.attempts_histogram))
+    return (used + result.losses * max_attempts) / result.games
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized Monte Carlo guessing-game statistics.")
+    parser.add_argument("--strategy", action="append", dest="strategies",
+                        help="bisection, random, biased_third, biased_quarter, linear or biased:<ratio>")
+    parser.add_argument("--difficulty", choices=sorted(DIFFICULTIES), default="2")
+    parser.add_argument("--games", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    strategies = args.strategies or ["bisection", "random", "biased_third"]
+    difficulty, max_number = DIFFICULTIES[args.difficulty]
+    print(f"Difficulty: {difficulty} (1-{max_number}), {args.games:,} games per strategy")
+
+    start = time.perf_counter()
+    results = simulate_population(strategies, args.games, max_number, seed=args.seed,
+                                  chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    for name, result in results.items():
+        print(f"\n{name}")
+        print(f"  Win rate: {result.win_rate:.4%}")
+        print(f"  Average attempts (wins): {result.average_attempts:.4f}")
+        print(f"  Expected attempts (all games): {expected_attempts(result):.4f}")
+        print("  Attempts histogram: " + " ".join(
+            f"{n}:{count}" for n, count in enumerate(result.attempts_histogram) if n))
+
+    total = args.games * len(strategies)
+    print(f"\nElapsed: {elapsed:.2f}s ({total / elapsed:,.0f} games/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Reproducible, block-buffered streams of secret numbers.
+
+number_guessing_game draws each secret with random.randint() off the global
+RNG, so runs cannot be replayed and simulations pay a method call per game.
+A SecretStream is seeded, fills a buffer of secrets a block at a time,
+and can:
+
+* spawn independent substreams for parallel workers (keyed like NumPy's
+  SeedSequence.spawn, so the same key always yields the same stream),
+* checkpoint its exact position and resume from it later.
+
+The default backend is random.Random; pass use_numpy=True to fill blocks
+with a NumPy PCG64 Generator instead.
+
+Example:
+    stream = SecretStream(500, seed=42)
+    workers = stream.spawn(8)
+    state = workers[0].checkpoint()
+    ...
+    resumed = SecretStream.resume(state)
+"""
+
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_BLOCK_SIZE = 4096
+
+
+class SecretStream:
+    """Seeded source of secret numbers in 1..max_number."""
+
+    def __init__(self, max_number, seed=None, block_size=DEFAULT_BLOCK_SIZE, use_numpy=False, spawn_key=()):
+        if use_numpy and np is None:
+            raise ImportError("use_numpy=True requires NumPy (pip install numpy)")
+        if seed is None:
+            # Pick a seed up front so the stream can still be checkpointed
+            seed = random.SystemRandom().getrandbits(64)
+        self.max_number = max_number
+        self.seed = seed
+        self.block_size = block_size
+        self.use_numpy = use_numpy
+        self.spawn_key = tuple(spawn_key)
+        self.children_spawned = 0
+        self.rng = self._make_rng()
+        self.block = []
+        self.position = 0
+        # RNG state before the current block was drawn, for checkpoints
+        self.block_state = self._rng_state()
+
+    def _make_rng(self):
+        if self.use_numpy:
+            sequence = np.random.SeedSequence(self.seed, spawn_key=self.spawn_key)
+            return np.random.Generator(np.random.PCG64(sequence))
+        # String seeds are hashed with SHA-512, so nearby keys give unrelated streams
+        return random.Random("/".join(map(str, (self.seed,) + self.spawn_key)))
+
+    def _rng_state(self):
+        if self.use_numpy:
+            return self.rng.bit_generator.state
+        return self.rng.getstate()
+
+    def _set_rng_state(self, state):
+        if self.use_numpy:
+            self.rng.bit_generator.state = state
+        else:
+            version, internal, gauss = state
+            self.rng.setstate((version, tuple(internal), gauss))
+
+    def _fill(self):
+        self.block_state = self._rng_state()
+        if self.use_numpy:
+            self.block = self.rng.integers(1, self.max_number + 1, size=self.block_size).tolist()
+        else:
+            self.block = self.rng.choices(range(1, self.max_number + 1), k=self.block_size)
+        self.position = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.position >= len(self.block):
+            self._fill()
+        value = self.block[self.position]
+        self.position += 1
+        return value
+
+    next = __next__
+
+    def take(self, count):
+        """Return the next count secrets as a list."""
+        values = []
+        while len(values) < count:
+            if self.position >= len(self.block):
+                self._fill()
+            end = min(len(self.block), self.position + count - len(values))
+            values.extend(self.block[self.position:end])
+            self.position = end
+        return values
+
+    def substream(self, *key):
+        """Independent stream identified by key (a tuple of ints or strings)."""
+        return SecretStream(self.max_number, self.seed, self.block_size, self.use_numpy,
+                            self.spawn_key + tuple(key))
+
+    def spawn(self, count):
+        """count new independent substreams; repeated calls never reuse keys."""
+        first = self.children_spawned
+        self.children_spawned += count
+        return [self.substream(index) for index in range(first, first + count)]
+
+    def checkpoint(self):
+        """Stream position as a plain dict (JSON serializable)."""
+        state = self.block_state
+        if not self.use_numpy:
+            version, internal, gauss = state
+            state = [version, list(internal), gauss]
+        return {
+            "max_number": self.max_number,
+            "seed": self.seed,
+            "block_size": self.block_size,
+            "use_numpy": self.use_numpy,
+            "spawn_key": list(self.spawn_key),
+            "children_spawned": self.children_spawned,
+            "rng_state": state,
+            "position": self.position,
+            "filled": bool(self.block),
+        }
+
+    @classmethod
+    def resume(cls, state):
+        """Recreate a stream exactly where checkpoint() left it."""
+        stream = cls(state["max_number"], state["seed"], state["block_size"], state["use_numpy"],
+                     state["spawn_key"])
+        stream.children_spawned = state["children_spawned"]
+        stream._set_rng_state(state["rng_state"])
+        if state["filled"]:
+            # Redraw the block that was current and skip what was consumed
+            stream._fill()
+            stream.position = state["position"]
+        return stream
@@ -1,73 +1,309 @@
+import argparse
 import random
 
-def number_guessing_game():
-    """A simple number guessing game."""
+import solver
+from leaderboard import Leaderboard
+
+# Difficulty menu choice -> (name, max_number)
+DIFFICULTIES = {
+    "1": ("Easy", 50),
+    "2": ("Medium", 100),
+    "3": ("Hard", 500),
+}
+DEFAULT_CHOICE = "2"
+MAX_ATTEMPTS = 10
+
+# Outcomes returned by GuessingGame.guess()
+TOO_LOW = "low"
+TOO_HIGH = "high"
+CORRECT = "correct"
+OUT_OF_RANGE = "out_of_range"
+NOT_A_NUMBER = "not_a_number"
+GAME_OVER = "game_over"
+
+
+class GuessingGame:
+    """The rules of one number guessing game, without any input or output."""
+
+    __slots__ = ("max_number", "max_attempts", "secret_number", "attempts", "won", "low", "high")
+
+    def __init__(self, max_number=100, max_attempts=MAX_ATTEMPTS, secret_number=None, rng=random):
+        self.max_number = max_number
+        self.max_attempts = max_attempts
+        self.reset(secret_number, rng)
+
+    def reset(self, secret_number=None, rng=random):
+        """Start a new game with the same range, reusing this object."""
+        if secret_number is None:
+            secret_number = rng.randint(1, self.max_number)
+        self.secret_number = secret_number
+        self.attempts = 0
+        self.won = False
+        # Range the secret is known to be in, given the hints so far
+        self.low = 1
+        self.high = self.max_number
+
+    @property
+    def attempts_left(self):
+        return self.max_attempts - self.attempts
+
+    @property
+    def over(self):
+        return self.won or self.attempts >= self.max_attempts
+
+    def guess(self, number):
+        """Score a guess and return one of the outcome constants.
+
+        Out-of-range guesses do not use up an attempt.
+        """
+        if self.over:
+            return GAME_OVER
+        if number < 1 or number > self.max_number:
+            return OUT_OF_RANGE
+        self.attempts += 1
+        if number == self.secret_number:
+            self.won = True
+            return CORRECT
+        if number < self.secret_number:
+            self.low = max(self.low, number + 1)
+            return TOO_LOW
+        self.high = min(self.high, number - 1)
+        return TOO_HIGH
+
+
+def submit_guess(game, text):
+    """Parse raw player input and apply it to game; invalid text costs no attempt."""
+    try:
+        number = int(text)
+    except ValueError:
+        return NOT_A_NUMBER
+    return game.guess(number)
+
+
+def parse_number(text, default=0):
+    """int(text), or default when text is not a number."""
+    try:
+        return int(text)
+    except ValueError:
+        return default
+
+
+def choose_difficulty(choice):
+    """Return (name, max_number) for a menu choice, falling back to Medium."""
+    return DIFFICULTIES.get(choice.strip(), DIFFICULTIES[DEFAULT_CHOICE])
+
+
+class GameStats:
+    """Running totals for many games, in constant memory."""
+
+    __slots__ = ("games", "wins", "attempts_histogram")
+
+    def __init__(self, max_attempts=MAX_ATTEMPTS):
+        self.games = 0
+        self.wins = 0
+        # attempts_histogram[n] = number of games won on attempt n
+        self.attempts_histogram = [0] * (max_attempts + 1)
+
+    @property
+    def losses(self):
+        return self.games - self.wins
+
+    @property
+    def win_rate(self):
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def average_attempts(self):
+        """Average number of attempts among won games."""
+        if not self.wins:
+            return 0.0
+        return sum(n * count for n, count in enumerate(self.attempts_histogram)) / self.wins
+
+    def record(self, game):
+        """Add a finished GuessingGame to the totals."""
+        self.games += 1
+        if game.won:
+            self.wins += 1
+            self.attempts_histogram[game.attempts] += 1
+
+    def merge(self, other):
+        """Add the counts of another GameStats into this one."""
+        self.games += other.games
+        self.wins += other.wins
+        for n, count in enumerate(other.attempts_histogram):
+            self.attempts_histogram[n] += count
+        return self
+
+    def as_dict(self):
+        return {
+            "games": self.games,
+            "wins": self.wins,
+            "losses": self.losses,
+            "win_rate": self.win_rate,
+            "average_attempts": self.average_attempts,
+            "attempts_histogram": list(self.attempts_histogram),
+        }
+
+
+class GameSession:
+    """Plays rounds of the interactive game in a loop until the player stops.
+
+    Only one GuessingGame is alive at a time and results are folded into
+    per-difficulty GameStats, so a session can run indefinitely without
+    growing the stack or memory.
+    """
+
+    def __init__(self, max_attempts=MAX_ATTEMPTS, rng=random, input_func=input, output=print,
+                 leaderboard=None, player="anonymous", recorder=None):
+        self.max_attempts = max_attempts
+        self.rng = rng
+        self.input = input_func
+        self.output = output
+        self.leaderboard = leaderboard
+        self.player = player
+        self.recorder = recorder
+        self.stats = {name: GameStats(max_attempts) for name, _ in DIFFICULTIES.values()}
+
+    def play_round(self):
+        """Play one full game and return the finished GuessingGame."""
+        say = self.output
+
+        # Set difficulty
+        say("\nChoose difficulty level:")
+        for key, (name, max_number) in DIFFICULTIES.items():
+            say(f"{key}. {name} (1-{max_number})")
+
+        choice = self.input("\nEnter your choice (1-3): ").strip()
+        if choice not in DIFFICULTIES:
+            say("Invalid choice! Setting to Medium.")
+        difficulty, max_number = choose_difficulty(choice)
+
+        game = GuessingGame(max_number, self.max_attempts, rng=self.rng)
+
+        say(f"\nDifficulty: {difficulty}")
+        say(f"I'm thinking of a number between 1 and {max_number}.")
+        say(f"You have {game.max_attempts} attempts to guess it! (Type 'hint' for a suggestion.)\n")
+
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.start(game)
+
+        try:
+            while not game.over:
+                text = self.input("Enter your guess: ")
+                if text.strip().lower() == "hint":
+                    suggestion = solver.next_guess(game.low, game.high)
+                    say(f"💡 Hint: the number is between {game.low} and {game.high}, try {suggestion}.")
+                    if recorder is not None:
+                        recorder.hint(game, suggestion)
+                    continue
+
+                outcome = submit_guess(game, text)
+                if recorder is not None:
+                    recorder.guess(game, outcome, parse_number(text))
+
+                if outcome == NOT_A_NUMBER:
+                    say("Invalid input! Please enter a valid number.")
+                elif outcome == OUT_OF_RANGE:
+                    say(f"Please enter a number between 1 and {max_number}!")
+                elif outcome == CORRECT:
+                    say(f"\n🎉 Congratulations! You guessed the number {game.secret_number} in {game.attempts} attempt(s)!")
+                elif outcome == TOO_LOW:
+                    say(f"❌ Too low! Try a higher number. ({game.attempts_left} attempts left)")
+                else:
+                    say(f"❌ Too high! Try a lower number. ({game.attempts_left} attempts left)")
+        finally:
+            if recorder is not None and not game.over:
+                recorder.abandon(game)
+
+        if not game.won:
+            say(f"\n😢 Game Over! The number was {game.secret_number}.")
+
+        self.stats[difficulty].record(game)
+        if self.leaderboard is not None:
+            self.leaderboard.record_game(difficulty, self.player, game)
+        return game
+
+    def run(self):
+        """Play rounds until the player declines another; return the summary."""
+        while True:
+            self.play_round()
+
+            # Ask to play again
+            play_again = self.input("\nDo you want to play again? (yes/no): ").strip().lower()
+            if play_again not in ["yes", "y"]:
+                break
+            self.output("\n")
+        return self.summary()
+
+    def summary(self):
+        """Return {difficulty: stats dict} plus a "Total" entry for the session."""
+        total = GameStats(self.max_attempts)
+        result = {}
+        for difficulty, stats in self.stats.items():
+            total.merge(stats)
+            result[difficulty] = stats.as_dict()
+        result["Total"] = total.as_dict()
+        return result
+
+
+def print_summary(summary, output=print):
+    """Print a session summary as returned by GameSession.summary()."""
+    output("\nSession summary:")
+    for difficulty, stats in summary.items():
+        if not stats["games"]:
+            continue
+        output(f"  {difficulty}: {stats['wins']}/{stats['games']} won "
+               f"({stats['win_rate']:.0%}), average attempts {stats['average_attempts']:.1f}")
+
+
+def print_leaderboard(leaderboard, summary, top=5, output=print):
+    """Print the best results for every difficulty played this session."""
+    for difficulty, stats in summary.items():
+        if difficulty == "Total" or not stats["games"]:
+            continue
+        output(f"\n🏆 Top {top} ({difficulty}):")
+        for rank, result in enumerate(leaderboard.best(difficulty, top), 1):
+            output(f"  {rank}. {result.player} - {result.attempts} attempt(s)")
+
+
+def number_guessing_game(leaderboard_path=None, trace_path=None):
+    """A simple number guessing game.
+
+    If leaderboard_path is given, results are saved there and the best
+    scores are shown at the end. If trace_path is given, every guess is
+    appended to that binary trace file (see game_trace.py).
+    """
     print("=" * 50)
     print("Welcome to the Number Guessing Game!")
     print("=" * 50)
-    
-    # Set difficulty
-    print("\nChoose difficulty level:")
-    print("1. Easy (1-50)")
-    print("2. Medium (1-100)")
-    print("3. Hard (1-500)")
-    
-    choice = input("\nEnter your choice (1-3): ").strip()
-    
-    if choice == "1":
-        max_number = 50
-        difficulty = "Easy"
-    elif choice == "2":
-        max_number = 100
-        difficulty = "Medium"
-    elif choice == "3":
-        max_number = 500
-        difficulty = "Hard"
-    else:
-        print("Invalid choice! Setting to Medium.")
-        max_number = 100
-        difficulty = "Medium"
-    
-    # Generate random number
-    secret_number = random.randint(1, max_number)
-    attempts = 0
-    max_attempts = 10
-    
-    print(f"\nDifficulty: {difficulty}")
-    print(f"I'm thinking of a number between 1 and {max_number}.")
-    print(f"You have {max_attempts} attempts to guess it!\n")
-    
-    while attempts < max_attempts:
-        try:
-            guess = int(input("Enter your guess: "))
-            attempts += 1
-            
-            if guess < 1 or guess > max_number:
-                print(f"Please enter a number between 1 and {max_number}!")
-                attempts -= 1
-                continue
-            
-            if guess == secret_number:
-                print(f"\n🎉 Congratulations! You guessed the number {secret_number} in {attempts} attempt(s)!")
-                break
-            elif guess < secret_number:
-                print(f"❌ Too low! Try a higher number. ({max_attempts - attempts} attempts left)")
-            else:
-                print(f"❌ Too high! Try a lower number. ({max_attempts - attempts} attempts left)")
-        
-        except ValueError:
-            print("Invalid input! Please enter a valid number.")
-            attempts -= 1
-    else:
-        print(f"\n😢 Game Over! The number was {secret_number}.")
-    
-    # Ask to play again
-    play_again = input("\nDo you want to play again? (yes/no): ").strip().lower()
-    if play_again in ["yes", "y"]:
-        print("\n")
-        number_guessing_game()
-    else:
-        print("\nThanks for playing! Goodbye! 👋")
+
+    leaderboard = None
+    player = "anonymous"
+    if leaderboard_path:
+        leaderboard = Leaderboard(leaderboard_path)
+        player = input("\nEnter your name for the leaderboard: ").strip() or player
+
+    recorder = None
+    if trace_path:
+        # Imported here because game_trace depends on this module
+        from game_trace import GameRecorder
+        recorder = GameRecorder(trace_path)
+
+    try:
+        summary = GameSession(leaderboard=leaderboard, player=player, recorder=recorder).run()
+    finally:
+        if recorder is not None:
+            recorder.close()
+    print_summary(summary)
+    if leaderboard is not None:
+        print_leaderboard(leaderboard, summary)
+    print("\nThanks for playing! Goodbye! 👋")
+
 
 if __name__ == "__main__":
-    number_guessing_game()
+    parser = argparse.ArgumentParser(description="Play the number guessing game.")
+    parser.add_argument("--leaderboard", metavar="PATH", help="save results to this leaderboard file")
+    parser.add_argument("--trace", metavar="PATH", help="record every guess to this binary trace file")
+    args = parser.parse_args()
+    number_guessing_game(args.leaderboard, args.trace)
@@ -0,0 +1,41 @@
+"""Minimax-optimal solver for the number guessing game.
+
+With k attempts and "too low"/"too high" hints, a guesser can tell apart at
+most 2**k - 1 numbers: one per node of a binary tree of depth k. Splitting
+every interval at its midpoint builds exactly such a tree, so it is optimal
+twice over: it minimizes the worst-case number of attempts, and when the
+range is too big for the budget it still covers the most numbers. Because the
+two halves of every split differ by at most one number, it also minimizes the
+average attempts for a uniformly random secret.
+
+That makes every question answerable in O(1) without search, for ranges
+up to 10**18 and beyond, and the tree never needs to be built:
+
+* is_winnable(max_number, max_attempts) compares against 2**k - 1,
+* the optimal next guess for a known interval [low, high] is its midpoint.
+"""
+
+
+def capacity(max_attempts):
+    """Largest range size that is guaranteed winnable in max_attempts."""
+    return (1 << max_attempts) - 1
+
+
+def is_winnable(max_number, max_attempts):
+    """True if 1..max_number can always be solved within max_attempts."""
+    return max_number <= capacity(max_attempts)
+
+
+def worst_case_attempts(max_number):
+    """Attempts the optimal strategy needs in the worst case for 1..max_number."""
+    return max_number.bit_length()
+
+
+def win_probability(max_number, max_attempts):
+    """Chance that optimal play wins against a uniformly random secret."""
+    return min(max_number, capacity(max_attempts)) / max_number
+
+
+def next_guess(low, high):
+    """Optimal guess when the secret is known to lie in [low, high]."""
+    return (low + high) // 2
@@ -0,0 +1,23 @@
+import json
+
+from bench_game import (bench_games_per_sec, bench_guess_latency, bench_session_memory, bench_validation,
+                        percentiles)
+
+
+def test_percentiles():
+    assert percentiles([3, 1, 2, 4]) == {"mean": 2.5, "p50": 3, "p99": 4}
+
+
+def test_benchmarks_report_json_ready_numbers():
+    results = {
+        "games_per_sec": bench_games_per_sec(200),
+        "guess_latency_ns": bench_guess_latency(1000),
+        "validation_ns": bench_validation(1000),
+        "session_memory": bench_session_memory(100),
+    }
+    assert set(results["games_per_sec"]) == {"Easy", "Medium", "Hard"}
+    assert all(rate > 0 for rate in results["games_per_sec"].values())
+    assert results["guess_latency_ns"]["p50"] <= results["guess_latency_ns"]["p99"]
+    assert results["validation_ns"]["out_of_range_overhead"] > 0
+    assert results["session_memory"]["bytes_per_session"] > 0
+    json.dumps(results)
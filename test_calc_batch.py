@@ -0,0 +1,56 @@
+import csv
+
+import numpy as np
+import pytest
+
+from calc_batch import apply, parse_column, process_csv, process_npy
+
+
+def read_rows(path):
+    with open(path, newline="") as source:
+        return list(csv.reader(source))
+
+
+def test_apply_flags_division_by_zero():
+    result, errors = apply("divide", [1, 2, 3], [2, 0, 4])
+    assert errors.tolist() == [False, True, False]
+    assert result[0] == 0.5 and np.isnan(result[1])
+
+
+def test_parse_column_marks_bad_values():
+    values, invalid = parse_column(["1.5", "x", ""])
+    assert values[0] == 1.5
+    assert invalid.tolist() == [False, True, True]
+
+
+def test_process_csv_in_chunks(tmp_path):
+    source, target = tmp_path / "in.csv", tmp_path / "out.csv"
+    source.write_text("name,a,b\n" + "".join(f"r{i},{i},{i % 3}\n" for i in range(10)))
+    assert process_csv(str(source), str(target), "divide", "a", "b", chunk_rows=4) == (10, 4)
+    rows = read_rows(target)
+    assert rows[0] == ["name", "a", "b", "result"]
+    assert rows[2] == ["r1", "1", "1", "1.0"]
+    assert rows[1][3] == "" and len(rows) == 11
+
+
+def test_short_and_blank_rows_are_errors(tmp_path):
+    source, target = tmp_path / "in.csv", tmp_path / "out.csv"
+    source.write_text("a,b\n1,2\n\n3\n4,5\n")
+    assert process_csv(str(source), str(target), "add", "a", "b") == (4, 2)
+    assert read_rows(target)[1:] == [["1", "2", "3.0"], ["", "", ""], ["3", "", ""], ["4", "5", "9.0"]]
+
+
+def test_missing_column_is_reported(tmp_path):
+    source = tmp_path / "in.csv"
+    source.write_text("a,c\n1,2\n")
+    with pytest.raises(ValueError, match="missing column 'b'"):
+        process_csv(str(source), str(tmp_path / "out.csv"), "add", "a", "b")
+
+
+def test_process_npy(tmp_path):
+    np.save(tmp_path / "a.npy", np.arange(10, dtype=np.float64))
+    np.save(tmp_path / "b.npy", np.arange(10, dtype=np.float64) % 2)
+    paths = [str(tmp_path / name) for name in ("a.npy", "b.npy", "out.npy")]
+    assert process_npy(*paths, "divide", chunk_rows=3, mask_path=str(tmp_path / "mask.npy")) == (10, 5)
+    assert np.load(tmp_path / "mask.npy").sum() == 5
+    assert np.load(tmp_path / "out.npy")[1] == 1.0
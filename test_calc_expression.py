@@ -0,0 +1,59 @@
+import math
+import re
+
+import pytest
+
+from calc_expression import ExpressionError, compile_expression, evaluate
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1 + 2 * 3", 7),
+    ("(1 + 2) * 3", 9),
+    ("2 ^ 3 ^ 2", 512),
+    ("2 ** 3", 8),
+    ("-2 ^ 2", -4),
+    ("--3", 3),
+    ("+4 - -1", 5),
+    ("7 % 4 * 2", 6),
+    ("10 / 4", 2.5),
+    (".5e1 + 1.", 6),
+    ("max(1, 2 + 3, 4)", 5),
+    ("sqrt(16) + log(100) + ln(e)", 7),
+    ("floor(pi)", 3),
+])
+def test_evaluate(text, expected):
+    assert evaluate(text) == pytest.approx(expected)
+
+
+def test_variables_and_cache():
+    area = compile_expression("pi * r ^ 2")
+    assert compile_expression("pi * r ^ 2") is area
+    assert area.variables == ("r",)
+    assert area.evaluate({"r": 2}) == pytest.approx(4 * math.pi)
+    # Variables named like functions or keywords are fine
+    assert evaluate("sqrt + lambda", {"sqrt": 1, "lambda": 2}) == 3
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "empty expression"),
+    ("1 +", "unexpected 'end of expression'"),
+    ("(1 + 2", "expected ')'"),
+    ("1 2", "unexpected '2'"),
+    ("2 $ 3", "unexpected character '$'"),
+    ("nope(1)", "unknown function 'nope'"),
+    ("__import__(1)", "unknown function '__import__'"),
+])
+def test_syntax_errors(text, message):
+    with pytest.raises(ExpressionError, match=re.escape(message)):
+        evaluate(text)
+
+
+def test_evaluation_errors():
+    with pytest.raises(ExpressionError, match="Division by zero"):
+        evaluate("1 / (2 - 2)")
+    with pytest.raises(ExpressionError, match="undefined variable 'x'"):
+        evaluate("x + 1", {})
+    with pytest.raises(ExpressionError):
+        evaluate("sqrt(-1)")
+    with pytest.raises(ExpressionError):
+        evaluate("10 ^ 1000")
@@ -0,0 +1,69 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from calc_history import CalculationHistory, HistoryEntry, ResultCache
+from calc_numeric import DecimalBackend, FractionBackend
+
+
+def test_ring_buffer_keeps_latest_entries():
+    history = CalculationHistory(capacity=3)
+    for number in range(5):
+        history.push(HistoryEntry("add", number, 1, number + 1))
+    assert [entry.a for entry in history] == [2, 3, 4]
+    assert history.recall(2).a == 2 and history.recall(3) is None
+
+
+def test_undo_redo_and_new_entry_drops_redo_tail():
+    history = CalculationHistory()
+    for number in range(3):
+        history.push(HistoryEntry("add", number, 0, number))
+    assert history.undo().a == 1
+    assert history.redo().a == 2 and history.redo() is None
+    history.undo()
+    history.push(HistoryEntry("add", 9, 0, 9))
+    assert [entry.a for entry in history] == [0, 1, 9]
+    assert history.redo() is None
+
+
+def test_export(tmp_path):
+    history = CalculationHistory()
+    history.push(HistoryEntry("divide", 1, 4, 0.25))
+    path = tmp_path / "history.csv"
+    assert history.export(str(path)) == 1
+    assert path.read_text().splitlines() == ["backend,operation,a,b,result", "float,divide,1,4,0.25"]
+
+
+def test_cache_hits_and_evicts():
+    cache = ResultCache(capacity=2)
+    backend = FractionBackend()
+    assert cache.calculate(backend, "add", Fraction(1), Fraction(2)) == 3
+    cache.calculate(backend, "add", Fraction(1), Fraction(2))
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.calculate(backend, "add", Fraction(2), Fraction(2))
+    cache.calculate(backend, "add", Fraction(3), Fraction(2))
+    cache.calculate(backend, "add", Fraction(1), Fraction(2))
+    assert cache.misses == 4
+
+
+def test_cache_tells_equal_operands_apart():
+    cache = ResultCache()
+    backend = DecimalBackend()
+    assert str(cache.calculate(backend, "add", Decimal("1.00"), Decimal("1"))) == "2.00"
+    assert str(cache.calculate(backend, "add", Decimal("1"), Decimal("1"))) == "2"
+    fractions = FractionBackend()
+    assert type(cache.calculate(fractions, "add", Fraction(2), Fraction(1))) is Fraction
+    assert type(cache.calculate(fractions, "add", 2, 1)) is int
+    assert cache.hits == 0
+
+
+def test_cache_does_not_keep_errors():
+    cache = ResultCache()
+    backend = DecimalBackend()
+    for _ in range(2):
+        with pytest.raises(ZeroDivisionError):
+            cache.calculate(backend, "divide", Decimal(1), Decimal(0))
+    with pytest.raises(ValueError):
+        cache.calculate(backend, "add", Decimal("sNaN"), Decimal(1))
+    assert len(cache.results) == 0
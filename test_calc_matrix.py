@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from calc_matrix import calculate, parse_array, parse_operand, preview
+
+
+def test_parse_array():
+    assert parse_array("1 2; 3 4").tolist() == [[1, 2], [3, 4]]
+    assert parse_array("1, 2, 3\n").tolist() == [1, 2, 3]
+    with pytest.raises(ValueError, match="different lengths"):
+        parse_array("1 2; 3")
+    with pytest.raises(ValueError, match="empty"):
+        parse_array(" ; ")
+
+
+def test_npy_operand_is_memory_mapped(tmp_path):
+    path = tmp_path / "a.npy"
+    np.save(path, np.eye(3))
+    operand = parse_operand(f" @{path}")
+    assert isinstance(operand, np.memmap)
+    assert calculate("dot", operand, parse_array("1 2 3"))[0].tolist() == [1, 2, 3]
+    np.save(path, np.array(["x"]))
+    with pytest.raises(ValueError, match="unsupported dtype"):
+        parse_operand(f"@{path}")
+
+
+def test_operations():
+    a, b = parse_array("1 2; 3 4"), parse_array("0 1")
+    result, errors = calculate("divide", a, b)
+    assert errors == 2 and result[0, 1] == 2 and np.isnan(result[1, 0])
+    assert calculate("dot", a, a)[0].tolist() == [[7, 10], [15, 22]]
+    assert np.allclose(calculate("solve", a, parse_array("5 11"))[0], [1, 2])
+    assert np.allclose(calculate("inverse", a)[0] @ a, np.eye(2))
+
+
+def test_errors_are_value_errors():
+    with pytest.raises(ValueError, match="do not match"):
+        calculate("add", parse_array("1 2 3"), parse_array("1 2"))
+    with pytest.raises(ValueError):
+        calculate("inverse", parse_array("1 2; 2 4"))
+    with pytest.raises(ValueError, match="dot needs"):
+        calculate("dot", np.float64(2), parse_array("1 2"))
+
+
+def test_preview_shows_corners_only():
+    text = preview(np.arange(1_000_000, dtype=np.float64).reshape(1000, 1000))
+    assert text.startswith("1000 x 1000 float64\n")
+    assert "..." in text and len(text) < 1000
+    assert preview(np.float64(0.1 + 0.2)) == "0.3"
@@ -0,0 +1,60 @@
+import random
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from calc_numeric import OPERATORS, BACKENDS, make_backend
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_every_backend_has_the_same_interface(name):
+    backend = make_backend(name)
+    a, b = backend.parse("6"), backend.parse("3")
+    assert [float(backend.calculate(operation, a, b)) for operation in OPERATORS] == [9, 3, 18, 2]
+    assert [float(value) for value in backend.calculate_batch("multiply", [a, b], [b, b])] == [18, 9]
+    with pytest.raises(ZeroDivisionError):
+        backend.calculate("divide", a, backend.parse("0"))
+    with pytest.raises(ValueError):
+        backend.parse("six")
+
+
+def test_decimal_context():
+    backend = make_backend("decimal", precision=5)
+    assert backend.calculate("add", backend.parse("0.1"), backend.parse("0.2")) == Decimal("0.3")
+    assert backend.calculate("divide", Decimal(2), Decimal(3)) == Decimal("0.66667")
+    with pytest.raises(ZeroDivisionError):
+        backend.calculate("divide", Decimal(0), Decimal(0))
+
+
+def test_fraction_inputs():
+    backend = make_backend("fraction")
+    assert backend.calculate("add", backend.parse("1/3"), backend.parse(" 1/6 ")) == Fraction(1, 2)
+
+
+def test_auto_is_exact_or_escalates():
+    backend = make_backend("auto")
+    assert backend.calculate("add", backend.parse("0.1"), backend.parse("0.2")) == Decimal("0.3")
+    assert type(backend.calculate("add", backend.parse("0.5"), backend.parse("0.25"))) is float
+
+    rng = random.Random(1)
+    for _ in range(2000):
+        texts = [f"{rng.randint(-10 ** 6, 10 ** 6) / 2 ** rng.randint(0, 8)}",
+                 f"{rng.randint(1, 10 ** 4)}.{rng.randint(0, 99):02d}"]
+        rng.shuffle(texts)
+        a, b = (backend.parse(text) for text in texts)
+        for operation, function in OPERATORS.items():
+            result = backend.calculate(operation, a, b)
+            exact = function(Fraction(texts[0]), Fraction(texts[1]))
+            if type(result) is float:
+                assert Fraction(result) == exact
+            else:
+                assert abs(Fraction(result) - exact) <= abs(exact) * Fraction(1, 10 ** 26)
+
+
+def test_auto_escalates_values_too_large_for_float():
+    backend = make_backend("auto")
+    huge = backend.parse("1e400")
+    assert huge == Decimal("1e400")
+    assert backend.calculate("divide", huge, backend.parse("1e399")) == 10
+    assert backend.parse("-inf") == float("-inf")
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from editor_buffer import ADD, PieceTable
+
+
+def random_edits(document, reference, rng, count):
+    for _ in range(count):
+        offset = rng.randint(0, len(reference))
+        length = rng.randint(0, min(20, len(reference) - offset))
+        text = bytes(rng.choice(b"ab \n") for _ in range(rng.randint(0, 8)))
+        document.replace(offset, length, text)
+        reference[offset:offset + length] = text
+
+
+def test_edits_match_a_bytearray():
+    rng = random.Random(1)
+    original = b"".join(b"line %d\n" % number for number in range(200))
+    document, reference = PieceTable(original), bytearray(original)
+    random_edits(document, reference, rng, 2000)
+    assert document[:] == reference and len(document) == len(reference)
+    for _ in range(200):
+        start = rng.randint(0, len(reference))
+        stop = rng.randint(start, len(reference))
+        assert document[start:stop] == reference[start:stop]
+        assert document.find(b"a\nb", start, stop) == reference.find(b"a\nb", start, stop)
+        assert document.rfind(b"\n", start, stop) == reference.rfind(b"\n", start, stop)
+    assert document[-1] == reference[-1]
+    assert b"".join(document.iter_chunks(5, 500, chunk_bytes=7)) == reference[5:500]
+    with pytest.raises(IndexError):
+        document.delete(len(reference), 1)
+
+
+def test_undo_all_and_redo_all():
+    rng = random.Random(2)
+    document = PieceTable(b"hello world")
+    reference = bytearray(document[:])
+    random_edits(document, reference, rng, 300)
+    while document.undo() is not None:
+        pass
+    assert document[:] == b"hello world"
+    while document.redo() is not None:
+        pass
+    assert document[:] == reference
+
+
+def test_typing_undoes_as_one_step():
+    document = PieceTable(b"")
+    for char in "word":
+        document.insert(len(document), char)
+    document.insert(len(document), " ")
+    document.insert(len(document), "next")
+    # Whitespace starts a new step, which the next word joins
+    document.undo()
+    assert document[:] == b"word"
+    document.undo()
+    assert document[:] == b""
+
+
+def test_listeners_version_and_modified():
+    document = PieceTable(b"abc")
+    changes = []
+    document.subscribe(lambda *change: changes.append(change))
+    document.replace(1, 1, "XY")
+    document.undo()
+    assert changes == [(1, 1, 2), (1, 2, 1)]
+    assert document.modified
+    document.mark_saved()
+    assert not document.modified
+
+
+def test_replace_ranges_is_one_edit():
+    rng = random.Random(3)
+    original = bytes(rng.choice(b"abc\n") for _ in range(20000))
+    document = PieceTable(original)
+    document.insert(100, b"edited")
+    before = document[:]
+    ranges, texts, position = [], [], 0
+    while True:
+        start = position + rng.choice([0, 1, 5, 300, 1000])
+        end = start + rng.randint(0, 3)
+        if end > len(before):
+            break
+        ranges.append((start, end))
+        texts.append(b"<%d>" % len(ranges))
+        position = end
+    document.replace_ranges(ranges, texts)
+    expected, position = bytearray(), 0
+    for (start, end), text in zip(ranges, texts):
+        expected += before[position:start] + text
+        position = end
+    expected += before[position:]
+    assert document[:] == expected
+    document.undo()
+    assert document[:] == before
+    with pytest.raises(IndexError):
+        document.replace_ranges([(5, 6), (2, 3)], [b"", b""])
+
+
+def test_snapshot_is_stable_while_editing():
+    document = PieceTable(b"0123456789")
+    document.insert(5, b"abc")
+    snapshot = document.snapshot()
+    document.delete(0, 8)
+    document.insert(0, b"zzz")
+    assert snapshot[:] == b"01234abc56789"
+    assert snapshot[3:9] == b"34abc5" and len(snapshot) == 13
+
+
+def test_rebase_keeps_content_and_undo():
+    document = PieceTable(b"hello world")
+    document.insert(5, b",")
+    document.insert(0, b">> ")
+    saved_pieces = document.pieces()
+    saved = document[:]
+    document.insert(len(document), b"!")
+    document.rebase(saved, saved_pieces)
+    assert document[:] == saved + b"!"
+    assert document.pieces()[0] == (document.base, 0, len(saved))
+    assert document.pieces()[-1][0] == ADD and document.piece_count == 2
+    while document.undo() is not None:
+        pass
+    assert document[:] == b"hello world"
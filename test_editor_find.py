@@ -0,0 +1,84 @@
+import random
+import re
+import time
+
+import pytest
+
+from editor_buffer import PieceTable
+from editor_find import CANCELLED, DONE, ERROR, SearchJob, compile_pattern, replacement_for
+
+
+def run(job):
+    """Start job and collect (starts, ends, replacements, result) like the UI does."""
+    starts, ends, replacements = [], [], []
+
+    def handle(batch_starts, batch_ends, batch_replacements):
+        starts.extend(batch_starts)
+        ends.extend(batch_ends)
+        replacements.extend(batch_replacements)
+
+    job.start()
+    deadline = time.monotonic() + 30
+    while True:
+        result = job.poll(handle, budget=1)
+        if result is not None:
+            return starts, ends, replacements, result
+        assert time.monotonic() < deadline, "search never finished"
+        time.sleep(0.001)
+
+
+PATTERNS = ["a", "a+", "a*", "x*", "$", "^", r"\Z", "^$", "ab|ba", "(?<=a)b", "b(?=a)", r"a\nb", "é", "."]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_matches_agree_with_finditer(pattern):
+    rng = random.Random(pattern)
+    for _ in range(40):
+        text = bytes(rng.choice(b"aab\n") for _ in range(rng.randrange(0, 60)))
+        if rng.random() < 0.3:
+            text += "é".encode()
+        compiled = compile_pattern(pattern)
+        expected = [(match.start(), match.end()) for match in compiled.finditer(text)]
+        job = SearchJob(PieceTable(text).snapshot(), compiled, chunk_bytes=rng.randrange(1, 9), workers=2)
+        starts, ends, _, result = run(job)
+        assert list(zip(starts, ends)) == expected, (pattern, text)
+        assert result == (DONE, len(expected))
+
+
+def test_replacements_agree_with_sub():
+    text = b"foo bar\nbaz foo\nlast"
+    pattern = compile_pattern(r"(\w+)$")
+    replace = replacement_for(pattern, r"<\1>;")
+    document = PieceTable(text)
+    starts, ends, replacements, _ = run(SearchJob(document.snapshot(), pattern, replace, chunk_bytes=4))
+    document.replace_ranges(list(zip(starts, ends)), replacements)
+    assert document[:] == pattern.sub(rb"<\1>;", text) == b"foo <bar>;\nbaz <foo>;\n<last>;"
+
+
+def test_literal_search_and_case():
+    pattern = compile_pattern("A.b", regex=False, match_case=False)
+    starts, _, _, _ = run(SearchJob(PieceTable(b"a.b axb A.B").snapshot(), pattern))
+    assert starts == [0, 8]
+
+
+def test_invalid_replacement_is_rejected_before_searching():
+    with pytest.raises(re.error):
+        replacement_for(compile_pattern("(a)"), r"\2")
+
+
+def test_unexpected_error_ends_the_search():
+    document = PieceTable(b"abc" * 1000)
+    snapshot = document.snapshot()
+    # As if the memory map had been closed under the search
+    snapshot.buffers[0] = None
+    _, _, _, (kind, message) = run(SearchJob(snapshot, compile_pattern("b"), chunk_bytes=100))
+    assert kind == ERROR and message
+
+
+def test_cancel_stops_the_search():
+    job = SearchJob(PieceTable(b"ab" * 100000).snapshot(), compile_pattern("a"), chunk_bytes=64)
+    job.cancel()
+    _, _, _, (kind, _) = run(job)
+    job.wait()
+    assert kind == CANCELLED
+    assert not job.thread.is_alive()
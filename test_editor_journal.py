@@ -0,0 +1,143 @@
+import os
+import threading
+
+import pytest
+
+from editor_buffer import ADD, PieceTable
+from editor_journal import EditJournal, journal_path, recover, recoverable
+
+
+def open_document(path):
+    return PieceTable(path.read_bytes())
+
+
+def recovered(path):
+    document = open_document(path)
+    recover(document, str(path))
+    return document[:]
+
+
+def test_edits_are_recovered(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"hello world\n")
+    document = open_document(path)
+    journal = EditJournal(document, str(path))
+    assert not recoverable(str(path))
+    document.insert(5, b",")
+    document.delete(0, 1)
+    document.undo()
+    journal.flush()
+    assert recoverable(str(path))
+    assert recovered(path) == document[:] == b"hello, world\n"
+    journal.close()
+    assert recovered(path) == b"hello, world\n"
+
+
+def test_compaction_keeps_edits_made_while_it_runs(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"x" * 1000)
+    document = open_document(path)
+    journal = EditJournal(document, str(path), compact_bytes=256)
+    for round in range(50):
+        for number in range(10):
+            document.insert(number * 7, b"%d-%d" % (round, number))
+        document.delete(100, 3)
+        journal.flush()
+        assert recovered(path) == document[:]
+    journal.close()
+    assert recovered(path) == document[:]
+    # The journal holds a snapshot, not the whole history
+    assert os.path.getsize(journal_path(str(path))) < 8 * (document.size - 1000) + 4096
+
+
+def test_replace_all_is_journaled_as_snapshot(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"a\n" * 500)
+    document = open_document(path)
+    journal = EditJournal(document, str(path), compact_bytes=64)
+    document.replace(0, document.size, b"b\n" * 500)
+    document.insert(0, b"after\n")
+    journal.flush()
+    document.insert(0, b"later\n")
+    journal.close()
+    assert recovered(path) == document[:]
+
+
+def test_unmodified_document_leaves_no_journal(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"text")
+    document = open_document(path)
+    journal = EditJournal(document, str(path), compact_bytes=8)
+    journal.flush()
+    journal.close()
+    assert not os.path.exists(journal_path(str(path)))
+
+
+def test_journal_does_not_apply_to_changed_file(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"text")
+    document = open_document(path)
+    journal = EditJournal(document, str(path))
+    document.insert(0, b"more ")
+    journal.close()
+    path.write_bytes(b"changed elsewhere")
+    assert not recoverable(str(path))
+
+
+def test_failed_compaction_is_reported_and_old_journal_kept(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"text\n")
+    document = open_document(path)
+    journal = EditJournal(document, str(path), compact_bytes=8)
+    document.insert(0, b"kept ")
+    journal.compact()
+    compacted = recovered(path)
+    # A large insert is journaled by the next compaction
+    document.insert(0, b"x" * 100)
+    # The snapshot cannot be read
+    document.buffers[ADD] = None
+    journal.flush()
+    journal.compaction.join()
+    with pytest.raises(OSError):
+        journal.flush()
+    assert recovered(path) == compacted
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+
+class HeldJournal(EditJournal):
+    """Compacts only once released, so a crash can be taken meanwhile."""
+
+    def __init__(self, *args, **options):
+        self.release = threading.Event()
+        self.release.set()
+        super().__init__(*args, **options)
+
+    def _compact(self, snapshot, base):
+        self.release.wait()
+        super()._compact(snapshot, base)
+
+
+@pytest.mark.parametrize("offset", [3, None])
+def test_crash_during_compaction_after_paste(tmp_path, offset):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"hello world\n")
+    document = open_document(path)
+    journal = HeldJournal(document, str(path), compact_bytes=64)
+    document.insert(0, b"kept ")
+    journal.flush()
+    before = document[:]
+    journal.release.clear()
+    try:
+        document.insert(0, b"X" * 100)
+        journal.flush()
+        document.insert(document.size if offset is None else offset, b"TAIL")
+        journal.flush()
+        # Crash now: the old journal has nothing it cannot place
+        assert recovered(path) == before
+    finally:
+        journal.release.set()
+    journal.compaction.join()
+    journal.flush()
+    assert recovered(path) == document[:]
+    journal.close()
+    assert recovered(path) == document[:]
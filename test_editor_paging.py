@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+import editor_paging
+from editor_buffer import PieceTable
+from editor_paging import LineIndex, MappedFile, PageWindow
+
+
+def test_undecodable_bytes_show_as_one_character_each():
+    document = PieceTable(b"caf\xe9 \xe2\x82 ok\r\nnext")
+    text = document.decode(0, document.find(b"\n"))
+    assert text == "caf\ufffd \ufffd\ufffd ok"
+
+
+def test_columns_map_back_to_bytes_exactly():
+    data = b"a\xe9b\xc3\xa9c\xe2\x82d\xf0\x9f\x98\x80e\r\n"
+    document = PieceTable(data)
+    text = document.decode(0, len(data) - 1)
+    for column in range(len(text) + 1):
+        offset = document.column_offset(0, column)
+        assert document.column_of(0, offset) == column
+    # "a", bad byte, "b", "é", "c", two bad bytes, "d", emoji, "e"
+    assert [document.column_offset(0, column) for column in range(len(text) + 1)] == [
+        0, 1, 2, 3, 5, 6, 7, 8, 9, 13, 14]
+
+
+def test_edit_after_undecodable_byte_lands_at_the_right_offset():
+    document = PieceTable(b"\xff\xfeabc\n")
+    # Typing "X" after the "a" shown in column 3
+    document.insert(document.column_offset(0, 3), "X")
+    assert document[:] == b"\xff\xfeaXbc\n"
+
+
+def test_read_lines_and_line_start(tmp_path):
+    path = tmp_path / "lines.txt"
+    path.write_bytes(b"one\ntwo\r\n\nfour")
+    mapped = MappedFile(str(path))
+    lines, end = mapped.read_lines(0, 10)
+    assert lines == [(0, "one"), (4, "two"), (9, ""), (10, "four")]
+    assert end == mapped.size
+    assert mapped.line_start(12) == 10
+    assert mapped.read_lines_before(10, 2) == [(4, "two"), (9, "")]
+    mapped.close()
+
+
+def test_line_index(tmp_path):
+    path = tmp_path / "lines.txt"
+    path.write_bytes(b"".join(b"line %d\n" % i for i in range(1000)))
+    mapped = MappedFile(str(path))
+    index = LineIndex(mapped, stride=16)
+    index.build_step(chunk_bytes=1000)
+    index.build()
+    assert index.complete and index.line_count == 1000
+    offset = index.offset_of(500)
+    assert mapped.data[offset:offset + 8] == b"line 500"
+    assert index.line_of(offset + 3) == 500
+    mapped.close()
+
+
+def test_window_pages_through_document():
+    document = PieceTable(b"".join(b"%d\n" % i for i in range(100)))
+    window = PageWindow(document, page_lines=10, max_pages=3)
+    texts, top = window.load(document.find(b"50\n"))
+    assert texts[top] == "50" and len(texts) == 30
+    texts, drop = window.next_page()
+    assert texts[0] == "70" and drop == 10
+    texts, drop = window.previous_page()
+    assert texts[-1] == "49" and drop == 10
+
+
+def test_reload_keeps_empty_last_line():
+    document = PieceTable(b"first line\nsecond\nthird\n")
+    window = PageWindow(document)
+    texts, _ = window.load(0)
+    assert texts == ["first line", "second", "third", ""]
+    # Undo, redo and replace-all reload the window where it is
+    texts, _ = window.load(window.start)
+    assert texts == ["first line", "second", "third", ""]
+    assert window.starts == [0, 11, 18, 24]
+
+
+def test_edits_keep_window_in_step_with_document():
+    document = PieceTable(b"".join(b"line %d\n" % i for i in range(50)))
+    window = PageWindow(document, page_lines=10)
+    window.load(document.find(b"line 25"))
+    for offset, removed, text in [(window.starts[3] + 2, 0, b"x\ny"), (window.starts[5], 12, b""),
+                                  (window.starts[1], 0, b"\n\n"), (window.starts[2] + 1, 3, b"z")]:
+        document.replace(offset, removed, text)
+        window.edited(offset, removed, len(text))
+        lines, _ = document.read_lines(window.starts[0], len(window), stop=window.end)
+        assert [start for start, _ in lines] == window.starts
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_line_index_matches_every_line(tmp_path, monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(editor_paging, "np", None)
+    rng = random.Random(1)
+    data = b"".join(b"x" * rng.randint(0, 30) + b"\n" for _ in range(2000)) + b"tail"
+    path = tmp_path / "lines.txt"
+    path.write_bytes(data)
+    starts = [0] + [position + 1 for position, byte in enumerate(data) if byte == 10]
+    mapped = MappedFile(str(path))
+    index = LineIndex(mapped, stride=7)
+    index.build_step(chunk_bytes=1000)
+    assert index.offset_of(len(starts) - 1) is None and index.line_of(5000) is None
+    while not index.complete:
+        index.build_step(chunk_bytes=rng.randint(1, 3000))
+    assert index.line_count == len(starts)
+    for line, start in enumerate(starts):
+        assert index.offset_of(line) == start
+        assert index.line_of(start) == line
+    mapped.close()
+
+
+def test_empty_file_and_background_index(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    mapped = MappedFile(str(path))
+    assert mapped.read_lines(0, 10) == ([], 0)
+    # The window still shows the one empty line
+    assert PageWindow(mapped).load(0)[0] == [""]
+    index = LineIndex(mapped)
+    index.build_in_background().join()
+    assert index.complete and index.line_count == 0
+    mapped.close()
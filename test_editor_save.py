@@ -0,0 +1,64 @@
+import os
+
+from editor_buffer import PieceTable
+from editor_paging import MappedFile
+from editor_save import CANCELLED, DONE, ERROR, SaveJob
+
+
+def saving_files(directory):
+    return [name for name in os.listdir(directory) if name.endswith(".saving")]
+
+
+def test_save_writes_document_atomically(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"hello world\n" * 1000)
+    mapped = MappedFile(str(path))
+    document = PieceTable(mapped.data)
+    document.insert(5, ",")
+    document.delete(0, 1)
+    expected = document[:]
+
+    job = SaveJob(document, str(path), mapped.file, chunk_bytes=256).start()
+    # Edits made during the save are not in the file
+    document.insert(0, b"later ")
+    assert job.wait() == (DONE, len(expected))
+    assert path.read_bytes() == expected
+    assert job.fraction == 1.0
+    assert saving_files(tmp_path) == []
+    # The memory map still reads the replaced file
+    assert document[6:10] == expected[:4]
+    mapped.close()
+
+
+def test_save_without_kernel_copy(tmp_path):
+    path = tmp_path / "doc.txt"
+    document = PieceTable(b"abc" * 5000)
+    document.insert(3, b"XYZ")
+    assert SaveJob(document, str(path), chunk_bytes=100).start().wait() == (DONE, 15003)
+    assert path.read_bytes() == document[:]
+
+
+def test_unwritable_directory_reports_error(tmp_path):
+    job = SaveJob(PieceTable(b"abc"), str(tmp_path / "missing" / "doc.txt")).start()
+    kind, message = job.wait()
+    assert kind == ERROR and message
+    assert job.poll() == (kind, message)
+
+
+def test_unexpected_exception_reports_error_and_removes_temp_file(tmp_path):
+    document = PieceTable(b"abc")
+    # A document whose buffers cannot be sliced
+    document.buffers[0] = None
+    kind, _ = SaveJob(document, str(tmp_path / "doc.txt")).start().wait()
+    assert kind == ERROR
+    assert saving_files(tmp_path) == []
+
+
+def test_cancel_keeps_target_and_removes_temp_file(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"old")
+    job = SaveJob(PieceTable(b"x" * 100000), str(path), chunk_bytes=10)
+    job.cancel()
+    assert job.start().wait()[0] == CANCELLED
+    assert path.read_bytes() == b"old"
+    assert saving_files(tmp_path) == []
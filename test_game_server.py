@@ -0,0 +1,73 @@
+import asyncio
+import random
+
+from game_server import GameServer, Session
+from load_client import percentile, run_load
+
+
+def test_session_protocol():
+    session = Session()
+    rng = random.Random(1)
+    assert session.handle("5", rng) == "ERR no game"
+    assert session.handle("NEW 1", rng) == "START 50 10"
+    secret = session.game.secret_number
+    assert session.handle("hint", rng) == "HINT 25"
+    assert session.handle("0", rng) == "RANGE 50"
+    assert session.handle("bogus", rng) == "ERR unknown command"
+    wrong = 1 if secret != 1 else 2
+    assert session.handle(str(wrong), rng) == ("LOW 9" if wrong < secret else "HIGH 9")
+    assert session.handle(str(secret), rng) == "WIN 2"
+    assert session.handle("HINT", rng) == "ERR no game"
+    assert session.handle("stats", rng) == "STATS 1 1"
+
+
+def test_session_loses_after_max_attempts():
+    session = Session()
+    rng = random.Random(2)
+    session.handle("NEW", rng)
+    secret = session.game.secret_number
+    wrong = 1 if secret != 1 else 2
+    replies = [session.handle(str(wrong), rng) for _ in range(10)]
+    assert replies[-1] == f"LOSE {secret}"
+    assert session.handle("STATS", rng) == "STATS 1 0"
+
+
+async def talk(port, lines):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    replies = []
+    for line in lines:
+        writer.write(line.encode("ascii") + b"\n")
+        replies.append((await reader.readline()).decode("ascii").strip())
+    writer.close()
+    await writer.wait_closed()
+    return replies
+
+
+def test_server_and_idle_timeout():
+    async def scenario():
+        server = GameServer("127.0.0.1", 0, idle_timeout=0.2, seed=3)
+        await server.start()
+        try:
+            assert await talk(server.port, ["NEW 2", "HINT", "STATS", "QUIT"]) == [
+                "START 100 10", "HINT 50", "STATS 0 0", "BYE"]
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            line = await asyncio.wait_for(reader.readline(), 5)
+            writer.close()
+            assert line == b"TIMEOUT\n"
+            assert server.total_sessions == 2
+        finally:
+            await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_load_client_against_spawned_server():
+    result = asyncio.run(run_load("127.0.0.1", 0, clients=4, duration=0.2, spawn_server=True))
+    assert result["games"] >= 4 and result["guesses"] >= result["games"]
+    assert result["latency_ms"]["p50"] <= result["latency_ms"]["max"]
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 50 and percentile(values, 0.99) == 99
+    assert percentile([], 0.5) == 0.0
@@ -0,0 +1,52 @@
+import random
+import re
+
+from simple_game import GameSession, print_summary
+
+
+class Player:
+    """Scripted player: asks for a hint before every guess and follows it."""
+
+    def __init__(self, rounds, choice="1"):
+        self.rounds = rounds
+        self.choice = choice
+        self.output = []
+
+    def say(self, text):
+        self.output.append(text)
+
+    def answer(self, prompt):
+        if prompt.strip().startswith("Enter your choice"):
+            return self.choice
+        if prompt.startswith("Enter your guess"):
+            hint = re.search(r"try (\d+)\.$", self.output[-1])
+            return hint.group(1) if hint else "hint"
+        self.rounds -= 1
+        return "yes" if self.rounds else "no"
+
+
+def test_long_session_keeps_playing():
+    player = Player(rounds=2000)
+    session = GameSession(rng=random.Random(1), input_func=player.answer, output=player.say)
+    summary = session.run()
+    assert summary["Easy"]["games"] == summary["Easy"]["wins"] == 2000
+    assert summary["Total"]["games"] == 2000
+    assert summary["Easy"]["average_attempts"] <= 6
+
+
+def test_invalid_choice_and_input_then_loss():
+    answers = iter(["9", "abc", "0"] + ["1"] * 10)
+    output = []
+    session = GameSession(max_attempts=10, rng=random.Random(5), input_func=lambda prompt: next(answers),
+                          output=output.append)
+    game = session.play_round()
+    assert "Invalid choice! Setting to Medium." in output
+    assert "Invalid input! Please enter a valid number." in output
+    assert "Please enter a number between 1 and 100!" in output
+    assert game.attempts == 10 and not game.won
+    assert output[-1] == f"\n😢 Game Over! The number was {game.secret_number}."
+    assert session.summary()["Medium"]["losses"] == 1
+
+    lines = []
+    print_summary(session.summary(), output=lines.append)
+    assert lines[1:] == ["  Medium: 0/1 won (0%), average attempts 0.0", "  Total: 0/1 won (0%), average attempts 0.0"]
@@ -0,0 +1,56 @@
+import pytest
+
+from game_trace import RECORD, RECORD_SIZE, GameRecorder, START, WIN
+from simple_game import GuessingGame, submit_guess
+
+
+def play(recorder, guesses, secret=40, max_number=100, max_attempts=10):
+    game = GuessingGame(max_number, max_attempts, secret_number=secret)
+    recorder.start(game)
+    for text in guesses:
+        recorder.guess(game, submit_guess(game, text), int(text) if text.isdigit() else 0)
+    if not game.over:
+        recorder.abandon(game)
+
+
+def records(path):
+    return list(RECORD.iter_unpack(path.read_bytes()))
+
+
+def test_records_and_game_ids(tmp_path):
+    path = tmp_path / "games.trace"
+    with GameRecorder(str(path)) as recorder:
+        play(recorder, ["50", "40"])
+        play(recorder, ["x"])
+    rows = records(path)
+    assert [(row[0], row[3]) for row in rows[:3]] == [(0, START), (0, 2), (0, WIN)]
+    assert rows[3][0] == 1
+
+
+def test_torn_tail_is_cut_before_appending(tmp_path):
+    path = tmp_path / "games.trace"
+    with GameRecorder(str(path)) as recorder:
+        play(recorder, ["40"])
+    with open(path, "ab") as file:
+        # Half a record, as left by a crash mid-write
+        file.write(b"\x01" * (RECORD_SIZE // 2))
+    with GameRecorder(str(path)) as recorder:
+        play(recorder, ["40"])
+    assert path.stat().st_size == 4 * RECORD_SIZE
+    assert [(row[0], row[3]) for row in records(path)] == [(0, START), (0, WIN), (2, START), (2, WIN)]
+
+
+def test_summary(tmp_path):
+    pytest.importorskip("numpy")
+    from game_trace import TraceReader
+
+    path = tmp_path / "games.trace"
+    with GameRecorder(str(path)) as recorder:
+        play(recorder, ["50", "40"])
+        play(recorder, ["x", "200", "1"])
+        play(recorder, ["1", "2"], max_attempts=2)
+    report = TraceReader(str(path), chunk_records=3).summary()[100]
+    assert (report["games_started"], report["won"], report["lost"], report["abandoned"]) == (3, 1, 1, 1)
+    assert report["average_attempts"] == 2.0
+    assert report["invalid_input_rate"] == 2 / 7
+    assert report["abandoned_at_attempt"] == [0, 1]
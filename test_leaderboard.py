@@ -0,0 +1,72 @@
+import random
+
+from leaderboard import Leaderboard, clean_name
+
+
+def test_best_matches_sorting_everything(tmp_path):
+    board = Leaderboard(str(tmp_path / "board.tsv"), top_k=20)
+    rng = random.Random(1)
+    recorded = []
+    for number in range(500):
+        result = board.record("Hard", f"p{number % 7}", rng.randint(1, 10), rng.random() < 0.7, timestamp=number)
+        recorded.append(result)
+        if number % 100 == 0:
+            board.best("Hard")
+    wins = [result for result in recorded if result.won]
+    # Fewest attempts first, earlier records first on ties
+    expected = sorted(wins, key=lambda result: result.attempts)[:20]
+    assert [(r.attempts, r.timestamp) for r in board.best("Hard", 20)] == [(r.attempts, r.timestamp) for r in expected]
+    assert board.best("Easy") == []
+
+
+def test_best_beyond_top_k_rebuilds(tmp_path):
+    board = Leaderboard(str(tmp_path / "board.tsv"), top_k=2)
+    for attempts in (5, 3, 4, 1):
+        board.record("Easy", "a", attempts, True)
+    assert [result.attempts for result in board.best("Easy", 2)] == [1, 3]
+    assert [result.attempts for result in board.best("Easy", 4)] == [1, 3, 4, 5]
+
+
+def test_history_sees_other_writers(tmp_path):
+    path = str(tmp_path / "board.tsv")
+    board = Leaderboard(path)
+    board.record("Easy", "alice", 3, True, timestamp=1)
+    assert [result.attempts for result in board.history("alice")] == [3]
+    # Another process appends to the same file
+    Leaderboard(path).record("Easy", " alice\t", 7, False, timestamp=2)
+    history = board.history("alice")
+    assert [(result.attempts, result.won) for result in history] == [(7, False), (3, True)]
+    assert len(board.history("alice", limit=1)) == 1
+    assert board.history("bob") == []
+
+
+def test_partial_line_is_read_later(tmp_path):
+    path = tmp_path / "board.tsv"
+    board = Leaderboard(str(path))
+    board.record("Easy", "a", 2, True)
+    with open(path, "a") as file:
+        file.write("Easy\tb\t1\t1")
+    assert [result.player for result in board.best("Easy")] == ["a"]
+    with open(path, "a") as file:
+        file.write("\t5.000\n")
+    assert [result.player for result in board.best("Easy")] == ["b", "a"]
+
+
+def test_clean_name():
+    assert clean_name("  a\tb\nc ") == "a b c"
+    assert clean_name("\t") == "anonymous"
+
+
+def test_line_torn_by_a_crash_is_skipped(tmp_path):
+    path = tmp_path / "board.tsv"
+    board = Leaderboard(str(path))
+    board.record("Easy", "a", 2, True)
+    with open(path, "ab") as file:
+        file.write("Easy\tbé\t1\t1\t".encode("utf-8")[:-2])
+    board.record("Easy", "c", 3, True)
+    assert [result.player for result in board.best("Easy")] == ["a", "c"]
+    assert [result.attempts for result in Leaderboard(str(path)).history("c")] == [3]
+    # Torn where every field is present but the last is empty
+    with open(path, "a") as file:
+        file.write("Easy\td\t1\t1\t\n")
+    assert [result.player for result in board.best("Easy")] == ["a", "c"]
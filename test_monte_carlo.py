@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from game_simulator import STRATEGIES, play_game
+from monte_carlo import SPLIT_RATIOS, expected_attempts, parse_strategy, simulate, simulate_population
+from simple_game import GuessingGame
+
+
+def exact_average(strategy, max_number, max_attempts=10):
+    """Average attempts over every secret, by playing each game once."""
+    total = 0
+    for secret in range(1, max_number + 1):
+        game = GuessingGame(max_number, max_attempts, secret_number=secret)
+        assert play_game(game, strategy, random.Random(0))
+        total += game.attempts
+    return total / max_number
+
+
+def test_parse_strategy():
+    assert parse_strategy("bisection") == 0.5
+    assert parse_strategy("random") is None
+    assert parse_strategy("biased:0.25") == 0.25
+    with pytest.raises(ValueError):
+        parse_strategy("biased:2")
+    with pytest.raises(ValueError):
+        parse_strategy("nope")
+
+
+def test_bisection_matches_the_game_engine():
+    result = simulate(0.5, 200000, max_number=100, seed=1, chunk_size=30000)
+    assert result.games == 200000 and result.win_rate == 1.0
+    assert max(n for n, count in enumerate(result.attempts_histogram) if count) == 7
+    assert result.average_attempts == pytest.approx(exact_average(STRATEGIES["bisection"], 100), abs=0.02)
+
+
+def test_short_budget_loses_games():
+    result = simulate(0.5, 100000, max_number=100, max_attempts=3, seed=2)
+    # Three attempts tell apart 7 of the 100 numbers
+    assert result.win_rate == pytest.approx(0.07, abs=0.01)
+    assert expected_attempts(result) > 2.9
+
+
+def test_population_streams_are_independent():
+    pair = simulate_population(["bisection", "random"], 10000, seed=3)
+    alone = simulate_population(["bisection"], 10000, seed=3)
+    assert pair["bisection"].as_dict() == alone["bisection"].as_dict()
+    again = simulate_population(["bisection", "random"], 10000, seed=3)
+    assert again["random"].as_dict() == pair["random"].as_dict()
+
+
+def test_strategy_names_match_the_simulator():
+    assert set(SPLIT_RATIOS) == set(STRATEGIES)
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from secret_stream import SecretStream
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_same_seed_same_secrets(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    first = SecretStream(50, seed=1, block_size=16, use_numpy=use_numpy).take(100)
+    stream = SecretStream(50, seed=1, block_size=16, use_numpy=use_numpy)
+    assert [next(stream) for _ in range(100)] == first
+    assert all(1 <= value <= 50 for value in first)
+    assert len(set(first)) > 25
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_checkpoint_resumes_exactly(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    stream = SecretStream(500, seed=2, block_size=10, use_numpy=use_numpy)
+    stream.take(23)
+    state = json.loads(json.dumps(stream.checkpoint()))
+    expected = stream.take(40)
+    assert SecretStream.resume(state).take(40) == expected
+
+
+def test_checkpoint_before_first_draw():
+    stream = SecretStream(100, seed=3)
+    state = stream.checkpoint()
+    assert SecretStream.resume(state).take(5) == stream.take(5)
+
+
+def test_substreams_are_keyed_and_independent():
+    stream = SecretStream(1000, seed=4)
+    first, second = stream.spawn(2)
+    third, = stream.spawn(1)
+    assert third.spawn_key == (2,)
+    assert first.take(50) == stream.substream(0).take(50)
+    assert second.take(50) != SecretStream(1000, seed=4).substream(0).take(50)
+    # Spawning does not move the parent
+    assert stream.take(10) == SecretStream(1000, seed=4).take(10)
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from game_simulator import STRATEGIES, play_game, simulate
+from simple_game import (CORRECT, GAME_OVER, NOT_A_NUMBER, OUT_OF_RANGE, TOO_HIGH, TOO_LOW, GameStats,
+                         GuessingGame, choose_difficulty, submit_guess)
+
+
+def test_guesses_narrow_the_range():
+    game = GuessingGame(100, 5, secret_number=42)
+    assert game.guess(50) == TOO_HIGH and game.high == 49
+    assert game.guess(10) == TOO_LOW and game.low == 11
+    assert game.guess(0) == OUT_OF_RANGE and game.attempts == 2
+    assert game.guess(42) == CORRECT and game.won
+    assert game.guess(42) == GAME_OVER
+
+
+def test_game_is_lost_after_max_attempts():
+    game = GuessingGame(100, 2, secret_number=42)
+    game.guess(1)
+    game.guess(2)
+    assert game.over and not game.won and game.attempts_left == 0
+
+
+def test_invalid_input_costs_no_attempt():
+    game = GuessingGame(10, 3, secret_number=5)
+    assert submit_guess(game, "five") == NOT_A_NUMBER
+    assert submit_guess(game, "5") == CORRECT and game.attempts == 1
+
+
+def test_choose_difficulty_falls_back_to_medium():
+    assert choose_difficulty("3") == ("Hard", 500)
+    assert choose_difficulty("x") == ("Medium", 100)
+
+
+def test_stats_record_and_merge():
+    stats = GameStats(max_attempts=3)
+    for secret, guesses in [(1, [1]), (2, [1, 2]), (3, [1, 2, 4])]:
+        game = GuessingGame(10, 3, secret_number=secret)
+        for number in guesses:
+            game.guess(number)
+        stats.record(game)
+    assert (stats.games, stats.wins, stats.losses) == (3, 2, 1)
+    assert stats.average_attempts == 1.5
+    merged = GameStats(3).merge(stats).merge(stats)
+    assert merged.as_dict()["attempts_histogram"] == [0, 2, 2, 0]
+
+
+def test_every_strategy_plays_legal_games():
+    for strategy in STRATEGIES.values():
+        result = simulate(strategy, 200, max_number=100, seed=1)
+        assert result.games == 200
+        assert sum(result.attempts_histogram) == result.wins
+
+
+def test_bisection_always_wins_within_budget():
+    result = simulate(STRATEGIES["bisection"], 1000, max_number=500, seed=2)
+    assert result.win_rate == 1.0
+    assert max(n for n, count in enumerate(result.attempts_histogram) if count) <= 9
+
+
+def test_same_seed_same_result():
+    first = simulate(STRATEGIES["random"], 500, seed=3).as_dict()
+    assert simulate(STRATEGIES["random"], 500, seed=3).as_dict() == first
+
+
+def test_out_of_range_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        play_game(GuessingGame(10, 3, secret_number=5), lambda low, high, rng: 0, random.Random())
@@ -0,0 +1,43 @@
+import solver
+from simple_game import CORRECT, GuessingGame
+
+
+def play_hints(max_number, max_attempts, secret):
+    game = GuessingGame(max_number, max_attempts, secret_number=secret)
+    while not game.over:
+        if game.guess(solver.next_guess(game.low, game.high)) == CORRECT:
+            return game.attempts
+    return None
+
+
+def test_capacity_and_winnability():
+    assert solver.capacity(10) == 1023
+    assert solver.is_winnable(1023, 10) and not solver.is_winnable(1024, 10)
+    assert solver.worst_case_attempts(500) == 9
+    assert solver.win_probability(100, 7) == 1.0
+    assert solver.win_probability(30, 3) == 7 / 30
+
+
+def test_hints_win_within_worst_case_for_every_secret():
+    for max_number in (1, 2, 7, 50, 100, 500):
+        attempts = [play_hints(max_number, 10, secret) for secret in range(1, max_number + 1)]
+        assert max(attempts) == solver.worst_case_attempts(max_number)
+
+
+def test_short_budget_wins_exactly_capacity_secrets():
+    results = [play_hints(100, 4, secret) for secret in range(1, 101)]
+    assert sum(result is not None for result in results) == solver.capacity(4)
+
+
+def test_huge_range():
+    low, high = 1, 10 ** 18
+    secret = 123456789012345678
+    for _ in range(solver.worst_case_attempts(high)):
+        guess = solver.next_guess(low, high)
+        if guess == secret:
+            break
+        if guess < secret:
+            low = guess + 1
+        else:
+            high = guess - 1
+    assert guess == secret
@@ -0,0 +1,61 @@
+import os
+import time
+
+from todo_import import CANCELLED, DONE, ERROR, ImportJob, read_task_chunks
+
+
+def run(job):
+    """Poll job like the UI does; return (final message, imported texts)."""
+    texts = []
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        result = job.poll(texts.extend)
+        if result is not None:
+            return result, texts
+        time.sleep(0.001)
+    raise AssertionError("import did not finish")
+
+
+def test_text_file(tmp_path):
+    path = tmp_path / "tasks.txt"
+    path.write_bytes("\ufeffone\n\n  two  \r\nthr\xe9e\nlast".encode("utf-8") + b"\n\xff\n")
+    assert [texts for texts, _ in read_task_chunks(str(path), chunk_rows=2)] == [
+        ["one", "two"], ["thr\xe9e", "last"], ["\ufffd"]]
+
+
+def test_csv_header_is_skipped_only_if_it_is_one(tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text('Title,due\n"Buy milk, eggs",today\n\n  Call mom ,\n')
+    assert [texts for texts, _ in read_task_chunks(str(path))] == [["Buy milk, eggs", "Call mom"]]
+    path.write_text("first,x\nsecond,y\n")
+    assert [texts for texts, _ in read_task_chunks(str(path))] == [["first", "second"]]
+
+
+def test_job_imports_everything_with_bounded_queue(tmp_path):
+    path = tmp_path / "tasks.txt"
+    path.write_text("".join(f"task {number}\n" for number in range(10000)))
+    job = ImportJob(str(path), chunk_rows=100, queue_chunks=2).start()
+    result, texts = run(job)
+    assert result == (DONE, 10000)
+    assert texts == [f"task {number}" for number in range(10000)]
+    assert job.fraction == 1.0
+
+
+def test_cancel_stops_the_worker(tmp_path):
+    path = tmp_path / "tasks.txt"
+    path.write_text("task\n" * 100000)
+    job = ImportJob(str(path), chunk_rows=10, queue_chunks=1).start()
+    job.cancel()
+    result, _ = run(job)
+    assert result[0] == CANCELLED
+    job.thread.join(5)
+    assert not job.thread.is_alive()
+
+
+def test_any_error_is_reported(tmp_path):
+    path = tmp_path / "tasks.txt"
+    path.write_text("task\n")
+    # The reader fails with a TypeError on a bytes path
+    job = ImportJob(os.fsencode(path)).start()
+    result, texts = run(job)
+    assert result[0] == ERROR and texts == []
@@ -0,0 +1,96 @@
+import random
+
+from todo_model import ListboxView, TaskList
+
+
+class ListStub:
+    """The part of the Listbox interface ListboxView uses, over a list."""
+
+    def __init__(self):
+        self.items = []
+        self.selected = set()
+
+    def _index(self, index):
+        return len(self.items) if index == "end" else index
+
+    def insert(self, index, *items):
+        index = self._index(index)
+        self.items[index:index] = items
+
+    def delete(self, first, last=None):
+        first = self._index(first)
+        last = first if last is None else self._index(last)
+        del self.items[first:last + 1]
+
+    def get(self, index):
+        return self.items[index]
+
+    def selection_includes(self, index):
+        return index in self.selected
+
+    def selection_set(self, index):
+        self.selected.add(index)
+
+
+def make_view(tasks=()):
+    scheduled = []
+    model = TaskList(tasks)
+    view = ListboxView(ListStub(), model, scheduled.append)
+    return model, view, scheduled
+
+
+def test_burst_is_applied_once_with_runs_merged():
+    model, view, scheduled = make_view(str(number) for number in range(100))
+    calls = view.tk_calls
+    for number in range(5):
+        model.append(f"new {number}")
+    model.extend(["a", "b"])
+    for _ in range(3):
+        model.delete(10)
+    assert len(scheduled) == 1
+    scheduled.pop()()
+    assert view.listbox.items == list(model)
+    # One insert for the appends and the extend, one delete for the deletes
+    assert view.tk_calls - calls == 2 and view.redraws == 1
+
+
+def test_large_burst_redraws():
+    model, view, scheduled = make_view(["x"] * 10)
+    for number in range(20):
+        model.update(number % 10, str(number))
+    scheduled.pop()()
+    assert view.redraws == 2
+    assert view.listbox.items == list(model)
+
+
+def test_random_changes_stay_in_sync():
+    rng = random.Random(1)
+    model, view, scheduled = make_view(str(number) for number in range(50))
+    for step in range(500):
+        size = len(model)
+        choice = rng.random()
+        if choice < 0.3 or size < 2:
+            model.insert(rng.randint(0, size), f"i{step}")
+        elif choice < 0.55:
+            model.delete(rng.randrange(size))
+        elif choice < 0.75:
+            model.move(rng.randrange(size), rng.randrange(size))
+        elif choice < 0.9:
+            model.update(rng.randrange(size), f"u{step}")
+        elif choice < 0.98:
+            model.extend(f"e{step}.{number}" for number in range(rng.randint(0, 3)))
+        else:
+            model.replace(f"r{number}" for number in range(rng.randint(0, 60)))
+        if rng.random() < 0.2:
+            while scheduled:
+                scheduled.pop()()
+            assert view.listbox.items == list(model)
+
+
+def test_move_keeps_selection():
+    model, view, scheduled = make_view(["a", "b", "c"])
+    view.listbox.selection_set(0)
+    model.move(0, 2)
+    scheduled.pop()()
+    assert view.listbox.items == ["b", "c", "a"]
+    assert view.listbox.selection_includes(2)
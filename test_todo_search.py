@@ -0,0 +1,65 @@
+import random
+
+from todo_search import FilteredTasks, SearchIndex
+from todo_store import TaskStore, read_tasks
+
+TEXTS = ["Buy groceries and milk", "Call mom", "Groom the dog", "milkshake recipe", "Buy a gift for mom"]
+
+
+def brute_force(texts, query):
+    terms = query.lower().split()
+    return sorted(task_id for task_id, text in texts.items()
+                  if all(any(word.startswith(term) for word in text.lower().split()) for term in terms))
+
+
+def test_prefix_search():
+    index = SearchIndex()
+    for task_id, text in enumerate(TEXTS):
+        index.add(task_id, text)
+    assert index.search("gro mi") == [0]
+    assert index.search("gro") == [0, 2]
+    assert index.search("") == [0, 1, 2, 3, 4]
+    assert index.search("zzz") == []
+
+
+def test_incremental_queries_match_brute_force():
+    rng = random.Random(7)
+    words = ["apple", "apricot", "banana", "band", "bandana", "cherry", "chess", "cheap"]
+    texts = {task_id: " ".join(rng.choices(words, k=3)) for task_id in range(300)}
+    index = SearchIndex()
+    for task_id, text in texts.items():
+        index.add(task_id, text)
+    for query in ["b", "ba", "ban", "band", "band c", "band ch", "band che", "a", "ap", "apr"]:
+        assert index.search(query) == brute_force(texts, query)
+    index.remove(5)
+    del texts[5]
+    assert index.search("apr") == brute_force(texts, "apr")
+
+
+def test_background_load_skips_removed_ids(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    store = TaskStore(path)
+    ids = store.extend(TEXTS)
+    store.commit()
+    index = SearchIndex()
+    index.remove(ids[1])
+    index.load_in_background(read_tasks(path, chunk_rows=2)).join()
+    assert not index.loading
+    assert len(index) == len(TEXTS)
+    store.close()
+
+
+def test_results_follow_task_order(tmp_path):
+    store = TaskStore(str(tmp_path / "tasks.db"))
+    ids = store.extend(TEXTS)
+    index = SearchIndex()
+    for task_id, text in zip(ids, TEXTS):
+        index.add(task_id, text)
+    store.move(4, 0)
+    store.move(2, 1)
+    found = list(index.search("mom", store.in_order))
+    assert found == [ids[4], ids[1]]
+    filtered = FilteredTasks(index, found)
+    assert [filtered[position] for position in range(len(filtered))] == ["Buy a gift for mom", "Call mom"]
+    assert filtered.id_at(0) == ids[4]
+    store.close()
@@ -0,0 +1,95 @@
+import random
+
+from todo_store import TaskStore
+
+
+def open_store(tmp_path, **options):
+    return TaskStore(str(tmp_path / "tasks.db"), **options)
+
+
+def test_append_extend_delete_and_reopen(tmp_path):
+    store = open_store(tmp_path, page_size=4)
+    first = store.append("a")
+    ids = store.extend(["b", "c", "d", "e"])
+    assert list(store) == ["a", "b", "c", "d", "e"]
+    assert store.delete(1) == "b"
+    assert store.remove(ids[2]) and not store.remove(ids[2])
+    store.update(0, "A")
+    assert list(store) == ["A", "c", "e"]
+    assert store.index_of(first) == 0 and store.index_of(ids[3]) == 2
+    store.close()
+
+    store = open_store(tmp_path)
+    assert list(store) == ["A", "c", "e"]
+    store.replace(["x", "y"])
+    assert list(store) == ["x", "y"]
+    store.close()
+
+
+def test_repeated_moves_into_one_gap_keep_order(tmp_path):
+    store = open_store(tmp_path, page_size=8)
+    store.extend(str(number) for number in range(40))
+    expected = list(store)
+    # Always between the first two tasks: the gap halves every time
+    for _ in range(200):
+        store.move(len(expected) - 1, 1)
+        expected.insert(1, expected.pop())
+    assert list(store) == expected
+    for index in range(len(store)):
+        assert store.index_of(store.id_at(index)) == index
+    store.close()
+
+    store = open_store(tmp_path, page_size=8)
+    assert list(store) == expected
+    store.close()
+
+
+def test_move_notifies_observers(tmp_path):
+    store = open_store(tmp_path)
+    store.extend(["a", "b", "c"])
+    changes = []
+    store.subscribe(lambda change, index, value: changes.append((change, index, value)))
+    store.move(0, 2)
+    assert list(store) == ["b", "c", "a"]
+    assert [(index, value) for _, index, value in changes] == [(0, 2)]
+    store.close()
+
+
+def test_in_order_follows_positions(tmp_path):
+    store = open_store(tmp_path)
+    ids = store.extend(str(number) for number in range(100))
+    store.move(99, 0)
+    store.move(10, 50)
+    expected = [store.id_at(index) for index in range(len(store))]
+    # A few ids are looked up, many are found by a scan
+    few = [ids[10], ids[99], ids[0]]
+    assert store.in_order(few) == [task_id for task_id in expected if task_id in few]
+    assert list(store.in_order(reversed(ids))) == expected
+    store.delete(0)
+    assert ids[99] not in store.in_order(ids)
+    store.close()
+
+
+def test_in_order_follows_edits_without_reloading(tmp_path):
+    rng = random.Random(4)
+    store = open_store(tmp_path, page_size=16)
+    ids = list(store.extend(str(number) for number in range(300)))
+    shown = store.in_order(ids)
+    for step in range(400):
+        choice = rng.random()
+        if choice < 0.3:
+            ids.append(store.append(f"a{step}"))
+        elif choice < 0.5:
+            store.delete(rng.randrange(len(store)))
+        else:
+            # Often into the same gap, so positions get renumbered
+            store.move(len(store) - 1, rng.choice([1, rng.randrange(len(store))]))
+    expected = [store.id_at(index) for index in range(len(store))]
+    assert list(store.in_order(ids)) == expected
+    few = ids[::40]
+    assert store.in_order(few) == [task_id for task_id in expected if task_id in few]
+    # A large result keeps the order it was made with
+    assert list(shown) == ids[:300]
+    store.replace(["x", "y"])
+    assert list(store.in_order(ids + [store.id_at(0)])) == [store.id_at(0)]
+    store.close()
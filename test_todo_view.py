@@ -0,0 +1,59 @@
+import random
+
+from todo_model import TaskList
+from todo_view import Viewport
+
+
+def test_scrolling_is_clamped():
+    viewport = Viewport(list(range(100)), rows=10)
+    viewport.scroll(-5)
+    assert viewport.first == 0
+    viewport.moveto(0.95)
+    assert viewport.visible() == range(90, 100)
+    assert viewport.fractions() == (0.9, 1.0)
+    viewport.see(3)
+    assert viewport.first == 3
+    viewport.see(50)
+    assert viewport.visible() == range(41, 51)
+    assert Viewport([1, 2], rows=10).fractions() == (0.0, 1.0)
+
+
+def test_select_rejects_rows_outside_source():
+    viewport = Viewport(["a", "b"], rows=5)
+    assert viewport.select(1) == 1
+    assert viewport.select(2) is None and viewport.selected is None
+
+
+def test_selection_and_top_row_follow_their_tasks():
+    rng = random.Random(1)
+    tasks = TaskList(f"t{number}" for number in range(200))
+    viewport = Viewport(tasks, rows=20)
+    tasks.subscribe(viewport.changed)
+    viewport.scroll_to(100)
+    viewport.select(110)
+    for step in range(1000):
+        selected = tasks[viewport.selected] if viewport.selected is not None else None
+        top = tasks[viewport.first]
+        size = len(tasks)
+        choice = rng.random()
+        if choice < 0.35:
+            tasks.insert(rng.randint(0, size), f"n{step}")
+        elif choice < 0.6:
+            removed = tasks.delete(rng.randrange(size))
+            if removed == selected:
+                selected = None
+            if removed == top:
+                top = None
+        else:
+            tasks.move(rng.randrange(size), rng.randrange(size))
+            # Other rows shift under a fixed top index
+            top = None
+        if selected is None:
+            assert viewport.selected is None
+            viewport.select(rng.randrange(len(tasks)))
+        else:
+            assert tasks[viewport.selected] == selected
+        # Unless it had to be clamped, the top row shows the same task
+        if top is not None and viewport.first < len(tasks) - viewport.rows:
+            assert tasks[viewport.first] == top
+        assert 0 <= viewport.first <= max(0, len(tasks) - viewport.rows)
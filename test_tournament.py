@@ -0,0 +1,32 @@
+from tournament import TournamentResult, make_units, run_tournament, run_unit
+
+
+def snapshot(result):
+    return {key: stats.as_dict() for key, stats in result.stats.items()}
+
+
+def test_units_cover_every_game():
+    units = make_units(["bisection", "random"], ["1", "3"], 1050, 500, seed=7)
+    assert len(units) == 2 * 2 * 3
+    assert sum(games for _, _, games, _, _ in units) == 2 * 2 * 1050
+    assert [games for _, _, games, _, index in units[:3]] == [500, 500, 50]
+
+
+def test_results_do_not_depend_on_workers_or_order():
+    units = make_units(["random", "biased_third"], ["2"], 600, 200, seed=3)
+    forward, backward = TournamentResult(), TournamentResult()
+    for unit in units:
+        forward.add(*run_unit(unit))
+    for unit in reversed(units):
+        backward.add(*run_unit(unit))
+    assert snapshot(forward) == snapshot(backward)
+
+    pooled = run_tournament(["random", "biased_third"], ["2"], 600, workers=2, chunk_size=200, seed=3)
+    assert snapshot(pooled) == snapshot(forward)
+    assert pooled.games == 1200
+    assert sum(games for _, games, _ in pooled.worker_report()) == 1200
+
+
+def test_standings_put_bisection_first():
+    result = run_tournament(["linear", "bisection", "random"], ["3"], 300, workers=1, chunk_size=100, seed=1)
+    assert [strategy for strategy, _ in result.standings("3")][0] == "bisection"
@@ -0,0 +1,591 @@
+"""Text editor from Example 4 of GUI_implementation_1, on a piece-table buffer.
+
+The document of record is an editor_buffer.PieceTable over the memory-mapped
+file; the Text widget is only a view of the lines around the viewport (see
+editor_paging.PageWindow). Typing, cutting and pasting in the widget are
+intercepted at the Tcl level and applied to the buffer as O(log n) edits,
+and save, search and undo/redo all run on the buffer, so nothing ever
+copies the whole document into a Python string. Saving runs on a worker
+thread and replaces the file atomically (see editor_save), and unsaved
+changes are journaled to disk as you type, to be recovered after a crash
+(see editor_journal). Edit > Find and Replace opens a panel that runs
+regex searches on a thread pool and highlights matches as they arrive
+(see editor_find); Replace All applies every replacement as one edit.
+
+Files smaller than LARGE_FILE_BYTES are shown whole, as in the tutorial.
+Larger ones are paged: about WINDOW_PAGES pages of lines are in the widget
+and pages are swapped in and out as you scroll. The scrollbar follows the
+byte position in the document, so dragging it jumps anywhere at once, and a
+line index is built in the background for the "Line N of M" status.
+Opening a multi-GB log takes milliseconds, and it can be edited right away.
+"""
+
+import re
+import tkinter as tk
+from array import array
+from bisect import bisect_left, bisect_right
+from tkinter import filedialog, messagebox, simpledialog, ttk
+
+from editor_buffer import PieceTable
+from editor_find import DONE as FOUND, ERROR as FIND_ERROR, SearchJob, compile_pattern, replacement_for
+from editor_journal import FLUSH_INTERVAL, EditJournal, recover, recoverable
+from editor_paging import PAGE_LINES, LineIndex, MappedFile, PageWindow
+from editor_save import DONE, ERROR, SaveJob
+
+# Larger documents are paged; below this the whole text fits in the widget
+# and an edit's cost to move the later rows stays under a millisecond
+LARGE_FILE_BYTES = 1 << 20
+# Load another page when the view is this close to either end of the window
+EDGE_FRACTION = 0.15
+# Page size that makes a window hold the whole document
+WHOLE_DOCUMENT = 1 << 62
+
+
+def create_text_editor():
+
+    root = tk.Tk()
+    root.title("Simple Text Editor")
+    root.geometry("600x500")
+
+    # The document and its view; "busy" is set while the view rewrites the widget
+    state = {"document": PieceTable(), "mapped": None, "window": None, "index": None,
+             "busy": False, "path": None, "pattern": "", "save": None, "journal": None,
+             # Earlier originals of the document, which its undo history reads
+             "retired": []}
+    # Matches of the find panel's search, as sorted byte offsets
+    matches = {"job": None, "replace": False, "starts": array("q"), "ends": array("q"), "replacements": []}
+
+    def raw(*args):
+        """Call the Text widget directly, bypassing the edit interception."""
+        return root.tk.call((original_command,) + args)
+
+    def update_title():
+        name = state["path"] or "New File"
+        marker = "*" if state["document"].modified else ""
+        root.title(f"Simple Text Editor - {marker}{name}")
+
+    def close_document():
+        # A search and a save read the document's memory map: stop the
+        # search and let the save finish before it is closed
+        search = matches["job"]
+        clear_matches()
+        if search is not None:
+            search.wait()
+        if state["save"] is not None:
+            finish_save(state["save"], state["save"].wait())
+        stop_journal()
+        if state["index"] is not None:
+            state["index"].cancel()
+        for mapped in state["retired"] + [state["mapped"]]:
+            if mapped is not None:
+                mapped.close()
+        state.update(mapped=None, index=None, retired=[])
+
+    def load_document(document, mapped=None, path=None):
+        close_document()
+        large = document.size >= LARGE_FILE_BYTES
+        window = PageWindow(document, PAGE_LINES if large else WHOLE_DOCUMENT)
+        state.update(document=document, mapped=mapped, window=window, path=path)
+        start_index()
+        start_journal()
+        show_window(*window.load(0))
+        raw("mark", "set", "insert", "1.0")
+        update_title()
+
+    def start_index():
+        mapped = state["mapped"]
+        if mapped is not None and mapped.size >= LARGE_FILE_BYTES:
+            state["index"] = LineIndex(mapped)
+            state["index"].build_in_background()
+            poll_index()
+
+    # Autosave journal
+    def start_journal():
+        try:
+            state["journal"] = EditJournal(state["document"], state["path"])
+        except OSError:
+            # No autosave where the journal cannot be written
+            state["journal"] = None
+
+    def stop_journal(discard=False):
+        if state["journal"] is not None:
+            try:
+                state["journal"].close(discard)
+            except OSError:
+                pass
+            state["journal"] = None
+
+    def flush_journal():
+        if state["journal"] is not None:
+            try:
+                state["journal"].flush()
+            except OSError:
+                stop_journal()
+        root.after(int(FLUSH_INTERVAL * 1000), flush_journal)
+
+    def offer_recovery(document, path):
+        """Replay path's journal onto document if there is one and the user wants it."""
+        if recoverable(path) and messagebox.askyesno(
+                "Recover", f"{path or 'An untitled file'} has unsaved changes from an earlier session. Recover them?"):
+            try:
+                recover(document, path)
+            except OSError as e:
+                messagebox.showerror("Error", f"Could not recover changes: {str(e)}")
+
+    def new_file():
+        load_document(PieceTable())
+
+    def open_file():
+        file_path = filedialog.askopenfilename(
+            title="Open File",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if file_path:
+            try:
+                mapped = MappedFile(file_path)
+                document = PieceTable(mapped.data)
+                offer_recovery(document, file_path)
+                load_document(document, mapped, file_path)
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not open file: {str(e)}")
+
+    def save_file():
+        if state["save"] is not None:
+            return
+        file_path = filedialog.asksaveasfilename(
+            title="Save File",
+            defaultextension=".txt",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if file_path:
+            mapped = state["mapped"]
+            try:
+                state["save"] = SaveJob(state["document"], file_path, mapped.file if mapped else None).start()
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not save file: {str(e)}")
+                return
+            file_menu.entryconfig("Save", state=tk.DISABLED)
+            progress_var.set(0)
+            progress_bar.pack(side=tk.RIGHT)
+            poll_save()
+
+    def poll_save():
+        job = state["save"]
+        if job is None:
+            return
+        progress_var.set(job.fraction * 100)
+        result = job.poll()
+        if result is None:
+            root.after(100, poll_save)
+        else:
+            finish_save(job, result)
+
+    def finish_save(job, result):
+        state["save"] = None
+        progress_bar.pack_forget()
+        file_menu.entryconfig("Save", state=tk.NORMAL)
+        kind, value = result
+        if kind == DONE:
+            if job.document is state["document"]:
+                rebase(job)
+            messagebox.showinfo("Success", "File saved successfully!")
+        elif kind == ERROR:
+            messagebox.showerror("Error", f"Could not save file: {value}")
+
+    def rebase(job):
+        """Make the file job just saved the document's original."""
+        document = job.document
+        try:
+            mapped = MappedFile(job.path)
+        except OSError:
+            mapped = None
+        if mapped is not None:
+            document.rebase(mapped.data, job.pieces)
+            state["retired"].append(state["mapped"])
+            if state["index"] is not None:
+                state["index"].cancel()
+            state.update(mapped=mapped, index=None)
+            start_index()
+        # Edits made during the save are still unsaved
+        document.mark_saved(job.version)
+        # The old journal is covered by the save; the new one starts from it
+        stop_journal(discard=True)
+        state["path"] = job.path
+        if mapped is not None:
+            start_journal()
+        update_title()
+
+    # Mapping between widget positions and document offsets
+    def row_col(index):
+        line, column = str(raw("index", index)).split(".")
+        return int(line) - 1, int(column)
+
+    def offset_of(index):
+        # Columns map to bytes through the document, not the widget's text,
+        # which shows undecodable bytes as U+FFFD
+        row, column = row_col(index)
+        return state["document"].column_offset(state["window"].offset_of_row(row), column)
+
+    def index_of(offset):
+        """Widget index of a document offset inside the window."""
+        window = state["window"]
+        row = max(0, bisect_right(window.starts, offset) - 1)
+        start = window.offset_of_row(row)
+        column = state["document"].column_of(start, offset)
+        return f"{row + 1}.{column}"
+
+    def clamp(index):
+        # Like the widget itself, never go past the final newline
+        return str(raw("index", "end - 1 chars" if raw("compare", index, ">", "end - 1 chars") else index))
+
+    # Edits typed into the widget
+    def text_command(*args):
+        if state["busy"] or not args or args[0] not in ("insert", "delete", "replace"):
+            return raw(*args)
+        if args[0] == "insert":
+            insert_text(args[1], "".join(args[2::2]), args[2:])
+        elif args[0] == "delete":
+            delete_range(args[1], args[2] if len(args) > 2 else f"{args[1]} + 1 chars")
+        else:
+            start = str(raw("index", args[1]))
+            delete_range(start, args[2])
+            insert_text(start, "".join(args[3::2]), args[3:])
+        clear_matches()
+        update_title()
+        return ""
+
+    def insert_text(index, text, insert_args):
+        index = clamp(index)
+        offset = offset_of(index)
+        data = text.encode(state["document"].encoding)
+        raw("insert", index, *insert_args)
+        state["document"].insert(offset, data)
+        state["window"].edited(offset, 0, len(data))
+
+    def delete_range(start, end):
+        start, end = clamp(start), clamp(end)
+        if raw("compare", start, ">=", end):
+            return
+        start_offset, end_offset = offset_of(start), offset_of(end)
+        raw("delete", start, end)
+        state["document"].delete(start_offset, end_offset - start_offset)
+        state["window"].edited(start_offset, end_offset - start_offset, 0)
+
+    # Undo, redo and search on the buffer
+    def show_offset(offset, length=0):
+        """Load the window around offset, put the cursor there and select length bytes."""
+        window = state["window"]
+        if not window.start <= offset <= window.end:
+            show_window(*window.load(offset))
+        start = index_of(offset)
+        raw("tag", "remove", "sel", "1.0", "end")
+        if length:
+            end = index_of(offset + length)
+            raw("tag", "add", "sel", start, end)
+        raw("mark", "set", "insert", start)
+        raw("see", start)
+        update_position()
+
+    def undo(event=None):
+        offset = state["document"].undo()
+        if offset is not None:
+            clear_matches()
+            show_window(*state["window"].load(state["window"].start))
+            show_offset(offset)
+            update_title()
+        return "break"
+
+    def redo(event=None):
+        offset = state["document"].redo()
+        if offset is not None:
+            clear_matches()
+            show_window(*state["window"].load(state["window"].start))
+            show_offset(offset)
+            update_title()
+        return "break"
+
+    def find(event=None):
+        pattern = simpledialog.askstring("Find", "Find:", initialvalue=state["pattern"], parent=root)
+        if pattern:
+            state["pattern"] = pattern
+            find_next()
+        return "break"
+
+    def find_next(event=None):
+        if len(matches["starts"]):
+            # Step through the matches of the find panel
+            starts = matches["starts"]
+            i = bisect_right(starts, offset_of("insert")) % len(starts)
+            show_offset(starts[i], matches["ends"][i] - starts[i])
+            return "break"
+        if not state["pattern"]:
+            return find()
+        document = state["document"]
+        needle = state["pattern"].encode(document.encoding)
+        start = offset_of("insert") + (1 if raw("tag", "ranges", "sel") else 0)
+        found = document.find(needle, start)
+        if found < 0:
+            # Wrap around to the top
+            found = document.find(needle, 0, start + len(needle))
+        if found < 0:
+            messagebox.showinfo("Find", f"'{state['pattern']}' was not found.")
+        else:
+            show_offset(found, len(needle))
+        return "break"
+
+    # Paging the window through the document
+    def show_window(texts, top_row):
+        """Put the window's lines in the widget with row top_row at the top."""
+        state["busy"] = True
+        raw("delete", "1.0", "end")
+        raw("insert", "1.0", "\n".join(texts))
+        raw("yview", f"{top_row + 1}.0")
+        state["busy"] = False
+        highlight_window()
+        update_position()
+
+    def top_row():
+        return int(str(raw("index", "@0,0")).split(".")[0]) - 1
+
+    def scroll(*args):
+        """Scrollbar command; moveto jumps by byte position in the document."""
+        window = state["window"]
+        if args[0] == tk.MOVETO and not (window.at_top and window.at_bottom):
+            show_window(*window.load(int(float(args[1]) * state["document"].size)))
+        else:
+            text_area.yview(*args)
+
+    def text_scrolled(first, last):
+        """The Text widget's yscrollcommand: page in near the edges."""
+        window = state["window"]
+        if state["busy"] or window is None:
+            return
+        state["busy"] = True
+        row = top_row()
+        if float(first) < EDGE_FRACTION and not window.at_top:
+            texts, drop = window.previous_page()
+            if texts:
+                raw("insert", "1.0", "\n".join(texts) + "\n")
+            if drop:
+                raw("delete", f"end - {drop} lines linestart - 1 chars", "end")
+            raw("yview", f"{row + len(texts) + 1}.0")
+        elif float(last) > 1 - EDGE_FRACTION and not window.at_bottom:
+            texts, drop = window.next_page()
+            if texts:
+                raw("insert", "end", "\n" + "\n".join(texts))
+            if drop:
+                raw("delete", "1.0", f"{drop + 1}.0")
+            raw("yview", f"{row - drop + 1}.0")
+        state["busy"] = False
+        highlight_window()
+        update_position()
+
+    def update_position():
+        document, window, index = state["document"], state["window"], state["index"]
+        if window is None:
+            return
+        size = document.size
+        top = window.offset_of_row(top_row())
+        bottom_row = int(str(raw("index", f"@0,{text_area.winfo_height()}")).split(".")[0])
+        bottom = window.end if bottom_row >= len(window) else window.offset_of_row(bottom_row)
+        scrollbar.set(top / size, bottom / size) if size else scrollbar.set(0.0, 1.0)
+        if window.at_top and window.at_bottom:
+            status_var.set(f"Line {top_row() + 1:,} of {len(window):,}")
+        elif index is None or document.modified or index.line_of(top) is None:
+            status_var.set(f"{top / max(1, size):.1%}")
+        elif index.complete:
+            status_var.set(f"Line {index.line_of(top) + 1:,} of {index.line_count:,}")
+        else:
+            status_var.set(f"Line {index.line_of(top) + 1:,} (indexing lines...)")
+
+    def poll_index():
+        if state["index"] is not None:
+            update_position()
+            if not state["index"].complete:
+                root.after(500, poll_index)
+
+    # Find and replace panel
+    def toggle_find_panel(event=None):
+        if find_panel.winfo_ismapped():
+            clear_matches()
+            find_panel.pack_forget()
+        else:
+            find_panel.pack(fill=tk.X, padx=10, pady=(10, 0), before=text_frame)
+            find_entry.focus_set()
+        return "break"
+
+    def clear_matches():
+        if matches["job"] is not None:
+            matches["job"].cancel()
+        if matches["job"] is not None or len(matches["starts"]):
+            matches.update(job=None, starts=array("q"), ends=array("q"), replacements=[])
+            raw("tag", "remove", "match", "1.0", "end")
+            find_status_var.set("")
+
+    def start_search(replace=False):
+        clear_matches()
+        document = state["document"]
+        try:
+            pattern = compile_pattern(find_var.get(), regex_var.get(), case_var.get(), document.encoding)
+            replacement = replacement_for(pattern, replace_var.get(), regex_var.get(), document.encoding) if replace else None
+        except re.error as e:
+            messagebox.showerror("Error", f"Invalid pattern: {str(e)}")
+            return
+        job = SearchJob(document.snapshot(), pattern, replacement, document.version).start()
+        matches.update(job=job, replace=replace)
+        poll_search(job)
+
+    def add_matches(starts, ends, replacements):
+        window = state["window"]
+        first = len(matches["starts"])
+        matches["starts"].extend(starts)
+        matches["ends"].extend(ends)
+        matches["replacements"].extend(replacements)
+        # Highlight the new matches that are in the widget
+        lo = bisect_left(matches["starts"], window.start, first)
+        hi = bisect_left(matches["starts"], window.end, lo)
+        tag_matches(lo, hi)
+
+    def tag_matches(lo, hi):
+        window = state["window"]
+        for i in range(lo, hi):
+            end = min(matches["ends"][i], window.end)
+            raw("tag", "add", "match", index_of(matches["starts"][i]), index_of(end))
+
+    def highlight_window():
+        """Tag the matches inside the window after it was loaded or paged."""
+        if len(matches["starts"]):
+            window = state["window"]
+            raw("tag", "remove", "match", "1.0", "end")
+            lo = bisect_left(matches["starts"], window.start)
+            tag_matches(lo, bisect_left(matches["starts"], window.end, lo))
+
+    def poll_search(job):
+        if matches["job"] is not job:
+            # Cancelled by clear_matches()
+            return
+        result = job.poll(add_matches)
+        find_status_var.set(f"Searching... {job.fraction:.0%} ({len(matches['starts']):,} matches)")
+        if result is None:
+            root.after(15, poll_search, job)
+            return
+        matches["job"] = None
+        kind, value = result
+        if kind == FIND_ERROR:
+            messagebox.showerror("Error", f"Could not search: {value}")
+        elif kind == FOUND and matches["replace"]:
+            replace_matches(job)
+        elif kind == FOUND:
+            find_status_var.set(f"{value:,} matches")
+
+    def replace_matches(job):
+        document = state["document"]
+        if document.version != job.version:
+            # clear_matches() cancels searches on edits, so this is a safety net
+            find_status_var.set("The document changed during the search")
+            return
+        count = len(matches["starts"])
+        if not count:
+            find_status_var.set("0 matches")
+            return
+        document.replace_ranges(zip(matches["starts"], matches["ends"]), matches["replacements"])
+        clear_matches()
+        show_window(*state["window"].load(state["window"].start))
+        update_title()
+        find_status_var.set(f"Replaced {count:,} matches")
+
+    def exit_editor():
+        close_document()
+        root.quit()
+
+    # Create menu bar
+    menubar = tk.Menu(root)
+    root.config(menu=menubar)
+
+    file_menu = tk.Menu(menubar, tearoff=0)
+    menubar.add_cascade(label="File", menu=file_menu)
+    file_menu.add_command(label="New", command=new_file)
+    file_menu.add_command(label="Open", command=open_file)
+    file_menu.add_command(label="Save", command=save_file)
+    file_menu.add_separator()
+    file_menu.add_command(label="Exit", command=exit_editor)
+
+    edit_menu = tk.Menu(menubar, tearoff=0)
+    menubar.add_cascade(label="Edit", menu=edit_menu)
+    edit_menu.add_command(label="Undo", command=undo, accelerator="Ctrl+Z")
+    edit_menu.add_command(label="Redo", command=redo, accelerator="Ctrl+Y")
+    edit_menu.add_separator()
+    edit_menu.add_command(label="Find...", command=find, accelerator="Ctrl+F")
+    edit_menu.add_command(label="Find Next", command=find_next, accelerator="F3")
+    edit_menu.add_command(label="Find and Replace...", command=toggle_find_panel, accelerator="Ctrl+H")
+
+    # Status bar
+    status_frame = tk.Frame(root)
+    status_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10)
+    status_var = tk.StringVar()
+    tk.Label(status_frame, textvariable=status_var, anchor=tk.W, font=("Arial", 9)).pack(
+        side=tk.LEFT, fill=tk.X, expand=True)
+    # Shown while a save runs
+    progress_var = tk.DoubleVar()
+    progress_bar = ttk.Progressbar(status_frame, variable=progress_var, maximum=100, length=150)
+
+    # Find and replace panel, shown above the text by toggle_find_panel
+    find_panel = tk.Frame(root)
+    find_var = tk.StringVar()
+    replace_var = tk.StringVar()
+    regex_var = tk.BooleanVar(value=True)
+    case_var = tk.BooleanVar(value=True)
+    find_status_var = tk.StringVar()
+
+    tk.Label(find_panel, text="Find:", font=("Arial", 10)).grid(row=0, column=0, sticky=tk.W)
+    find_entry = tk.Entry(find_panel, textvariable=find_var, font=("Arial", 10))
+    find_entry.grid(row=0, column=1, sticky=tk.EW, padx=5)
+    tk.Button(find_panel, text="Find All", command=start_search,
+              font=("Arial", 10)).grid(row=0, column=2, sticky=tk.EW)
+    tk.Checkbutton(find_panel, text="Regex", variable=regex_var).grid(row=0, column=3, sticky=tk.W)
+    tk.Label(find_panel, text="Replace:", font=("Arial", 10)).grid(row=1, column=0, sticky=tk.W)
+    tk.Entry(find_panel, textvariable=replace_var, font=("Arial", 10)).grid(row=1, column=1, sticky=tk.EW, padx=5)
+    tk.Button(find_panel, text="Replace All", command=lambda: start_search(replace=True),
+              font=("Arial", 10)).grid(row=1, column=2, sticky=tk.EW)
+    tk.Checkbutton(find_panel, text="Match case", variable=case_var).grid(row=1, column=3, sticky=tk.W)
+    tk.Label(find_panel, textvariable=find_status_var, anchor=tk.W, font=("Arial", 9)).grid(
+        row=2, column=0, columnspan=3, sticky=tk.W)
+    tk.Button(find_panel, text="Close", command=toggle_find_panel,
+              font=("Arial", 10)).grid(row=2, column=3, sticky=tk.E)
+    find_panel.columnconfigure(1, weight=1)
+    find_entry.bind("<Return>", lambda event: start_search())
+
+    # Create text area with scrollbar
+    text_frame = tk.Frame(root)
+    text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    text_area = tk.Text(text_frame, wrap=tk.WORD, font=("Arial", 11))
+    text_area.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    text_area.tag_config("match", background="yellow")
+
+    scrollbar = tk.Scrollbar(text_frame)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    text_area.config(yscrollcommand=text_scrolled)
+    scrollbar.config(command=scroll)
+
+    # Route the widget's Tcl command through text_command so every edit,
+    # whatever binding made it, reaches the buffer
+    original_command = str(text_area) + "_widget"
+    root.tk.call("rename", str(text_area), original_command)
+    root.tk.createcommand(str(text_area), text_command)
+
+    for sequence, handler in (("<Control-z>", undo), ("<Control-y>", redo),
+                              ("<Control-f>", find), ("<F3>", find_next), ("<Control-h>", toggle_find_panel)):
+        text_area.bind(sequence, handler)
+
+    document = PieceTable()
+    offer_recovery(document, None)
+    load_document(document)
+    flush_journal()
+    root.protocol("WM_DELETE_WINDOW", exit_editor)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    create_text_editor()
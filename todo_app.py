@@ -0,0 +1,237 @@
+"""To-do list from Example 3 of GUI_implementation_1, on the todo_model layer.
+
+The tutorial version rebuilt the whole Listbox after every add or delete.
+Here the tasks are kept in an SQLite TaskStore (todo.db by default), so
+they survive restarts, and are shown by a VirtualList, which only draws
+the rows in view. Adding, deleting and scrolling stay fast with a million
+tasks. The filter box narrows the list as you type, using the incremental
+index in todo_search (built in the background at startup). Import...
+loads a large text or CSV file on a worker thread (see todo_import) while
+the window stays usable. Try it with:
+
+    python todo_app.py --db big.db --generate 1000000
+"""
+
+import argparse
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+
+from todo_import import CANCELLED, DONE, ImportJob
+from todo_search import FilteredTasks, SearchIndex
+from todo_store import TaskStore, read_tasks
+from todo_view import VirtualList
+
+DEFAULT_DB = "todo.db"
+
+
+def create_todo_app(path=DEFAULT_DB, generate=0):
+
+    root = tk.Tk()
+    root.title("To-Do List")
+    root.geometry("400x640")
+
+    # Persistent task store
+    tasks = TaskStore(path)
+    if generate:
+        tasks.extend(f"Task {number:,}" for number in range(len(tasks) + 1, len(tasks) + generate + 1))
+        tasks.commit()
+
+    # Search index, filled from the database in the background
+    index = SearchIndex()
+    index.load_in_background(read_tasks(path))
+    filter_state = {"scheduled": False}
+
+    def filtering():
+        return bool(filter_var.get().strip())
+
+    def apply_filter():
+        filter_state["scheduled"] = False
+        if filtering():
+            task_listbox.set_source(FilteredTasks(index, index.search(filter_var.get(), tasks.in_order)))
+        elif task_listbox.viewport.source is not tasks:
+            task_listbox.set_source(tasks)
+        update_status()
+
+    def schedule_filter(*args):
+        # One search per idle cycle, however fast the keys come in
+        if not filter_state["scheduled"]:
+            filter_state["scheduled"] = True
+            root.after_idle(apply_filter)
+
+    def update_status():
+        shown = len(task_listbox.viewport.source)
+        text = f"{shown:,} of {len(tasks):,} tasks" if filtering() else f"{len(tasks):,} tasks"
+        if index.loading:
+            text += " (indexing...)"
+        status_var.set(text)
+
+    def wait_for_index():
+        if index.loading:
+            root.after(200, wait_for_index)
+        else:
+            # Results computed on the partial index may be incomplete
+            apply_filter()
+
+    def selected_index():
+        selection = task_listbox.curselection()
+        return selection[0] if selection else None
+
+    def selected_id():
+        selected = selected_index()
+        return None if selected is None else task_listbox.viewport.source.id_at(selected)
+
+    def add_task():
+        task = task_entry.get()
+        if task:
+            index.add(tasks.append(task), task)
+            task_entry.delete(0, tk.END)
+            if filtering():
+                schedule_filter()
+            else:
+                task_listbox.see(tk.END)
+                update_status()
+
+    def delete_task():
+        task_id = selected_id()
+        if task_id is not None:
+            tasks.remove(task_id)
+            index.remove(task_id)
+            if filtering():
+                schedule_filter()
+            else:
+                update_status()
+
+    def move_task(offset):
+        position = selected_index()
+        if filtering():
+            return
+        if position is not None and 0 <= position + offset < len(tasks):
+            tasks.move(position, position + offset)
+            task_listbox.see(position + offset)
+
+    # Create GUI elements
+    tk.Label(root, text="To-Do List", font=("Arial", 16, "bold")).pack(pady=10)
+
+    # Task entry frame
+    entry_frame = tk.Frame(root)
+    entry_frame.pack(pady=10)
+
+    task_entry = tk.Entry(entry_frame, font=("Arial", 12), width=25)
+    task_entry.pack(side=tk.LEFT, padx=5)
+
+    add_button = tk.Button(entry_frame, text="Add Task", command=add_task,
+                           font=("Arial", 10))
+    add_button.pack(side=tk.LEFT, padx=5)
+
+    # Filter box
+    filter_frame = tk.Frame(root)
+    filter_frame.pack(padx=10, fill=tk.X)
+    tk.Label(filter_frame, text="Filter:", font=("Arial", 10)).pack(side=tk.LEFT)
+    filter_var = tk.StringVar()
+    filter_var.trace_add("write", schedule_filter)
+    tk.Entry(filter_frame, textvariable=filter_var, font=("Arial", 10)).pack(
+        side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+    status_var = tk.StringVar()
+    tk.Label(root, textvariable=status_var, font=("Arial", 9), fg="gray").pack()
+
+    # Task list
+    task_listbox = VirtualList(root, tasks, font=("Arial", 10))
+    task_listbox.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)
+
+    # Task buttons
+    button_frame = tk.Frame(root)
+    button_frame.pack(pady=10)
+
+    tk.Button(button_frame, text="Delete Selected Task", command=delete_task,
+              font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+    tk.Button(button_frame, text="Move Up", command=lambda: move_task(-1),
+              font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+    tk.Button(button_frame, text="Move Down", command=lambda: move_task(1),
+              font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+
+    # Bind Enter key to add task
+    task_entry.bind("<Return>", lambda event: add_task())
+
+    # Import
+    import_state = {"job": None}
+
+    def import_chunk(texts):
+        index.add_many(zip(tasks.extend(texts), texts))
+
+    def poll_import():
+        job = import_state["job"]
+        result = job.poll(import_chunk)
+        progress_var.set(job.fraction * 100)
+        update_status()
+        if result is None:
+            root.after(15, poll_import)
+            return
+        import_state["job"] = None
+        import_button.config(state=tk.NORMAL)
+        cancel_button.config(state=tk.DISABLED)
+        if filtering():
+            schedule_filter()
+        kind, value = result
+        if kind == DONE:
+            progress_var.set(100)
+            messagebox.showinfo("Import", f"Imported {value:,} task(s).")
+        elif kind == CANCELLED:
+            messagebox.showinfo("Import", f"Import cancelled after {value:,} task(s).")
+        else:
+            messagebox.showerror("Error", f"Could not import file: {value}")
+
+    def import_tasks():
+        file_path = filedialog.askopenfilename(
+            title="Import Tasks",
+            filetypes=[("Text files", "*.txt"), ("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        try:
+            import_state["job"] = ImportJob(file_path).start()
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not open file: {str(e)}")
+            return
+        import_button.config(state=tk.DISABLED)
+        cancel_button.config(state=tk.NORMAL)
+        progress_var.set(0)
+        poll_import()
+
+    def cancel_import():
+        if import_state["job"] is not None:
+            import_state["job"].cancel()
+
+    import_frame = tk.Frame(root)
+    import_frame.pack(pady=(0, 10), padx=10, fill=tk.X)
+    import_button = tk.Button(import_frame, text="Import...", command=import_tasks, font=("Arial", 10))
+    import_button.pack(side=tk.LEFT)
+    progress_var = tk.DoubleVar()
+    ttk.Progressbar(import_frame, variable=progress_var, maximum=100).pack(
+        side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+    cancel_button = tk.Button(import_frame, text="Cancel", command=cancel_import,
+                              font=("Arial", 10), state=tk.DISABLED)
+    cancel_button.pack(side=tk.LEFT)
+
+    def on_close():
+        cancel_import()
+        tasks.close()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
+    update_status()
+    wait_for_index()
+    root.mainloop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="To-do list.")
+    parser.add_argument("--db", default=DEFAULT_DB, help="SQLite file holding the tasks")
+    parser.add_argument("--generate", type=int, default=0, metavar="N",
+                        help="append N generated tasks first (for trying out large lists)")
+    args = parser.parse_args()
+    create_todo_app(args.db, args.generate)
+
+
+if __name__ == "__main__":
+    main()
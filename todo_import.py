@@ -0,0 +1,141 @@
+"""Background import of tasks from text and CSV files.
+
+ImportJob reads the file on a worker thread, one line at a time, and puts
+chunks of task texts on a bounded queue. The Tk thread drains the queue
+from a root.after callback (see poll()), so mainloop never waits for the
+disk. At most QUEUE_CHUNKS chunks are in flight, which bounds memory
+whatever the file size: a reader that gets ahead of the UI simply waits.
+
+Text files give one task per non-empty line. CSV files give the first
+column of each row; a first row reading "task", "text" or "title" is
+taken as a header and skipped.
+"""
+
+import codecs
+import csv
+import os
+import queue
+import threading
+import time
+
+CHUNK_ROWS = 1000
+QUEUE_CHUNKS = 8
+# UI time one poll() may spend handling chunks
+POLL_BUDGET = 0.02
+HEADERS = {"task", "text", "title"}
+
+# Messages from the worker
+CHUNK = "chunk"
+DONE = "done"
+CANCELLED = "cancelled"
+ERROR = "error"
+
+
+def _lines(file, progress):
+    """Decoded lines of a binary file, counting bytes read into progress[0]."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    for raw in file:
+        progress[0] += len(raw)
+        yield decoder.decode(raw)
+
+
+def read_task_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Yield (texts, bytes_read) for path, chunk_rows tasks at a time."""
+    progress = [0]
+    with open(path, "rb") as file:
+        lines = _lines(file, progress)
+        if path.lower().endswith(".csv"):
+            rows = (row[0].strip() for row in csv.reader(lines) if row)
+            first = next(rows, None)
+            if first is not None and first.lower() not in HEADERS:
+                rows = _prepend(first, rows)
+        else:
+            rows = (line.strip() for line in lines)
+
+        chunk = []
+        for text in rows:
+            if text:
+                chunk.append(text)
+                if len(chunk) == chunk_rows:
+                    yield chunk, progress[0]
+                    chunk = []
+        if chunk:
+            yield chunk, progress[0]
+
+
+def _prepend(first, rows):
+    yield first
+    yield from rows
+
+
+class ImportJob:
+    """Read a task file on a worker thread; the UI thread consumes chunks."""
+
+    def __init__(self, path, chunk_rows=CHUNK_ROWS, queue_chunks=QUEUE_CHUNKS):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.total_bytes = os.path.getsize(path)
+        self.bytes_read = 0
+        self.rows = 0
+        self.queue = queue.Queue(maxsize=queue_chunks)
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="task-import", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    @property
+    def fraction(self):
+        return self.bytes_read / self.total_bytes if self.total_bytes else 1.0
+
+    def _put(self, message):
+        # A full queue means the UI is behind; wait, but stay cancellable
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run(self):
+        rows = 0
+        try:
+            for texts, bytes_read in read_task_chunks(self.path, self.chunk_rows):
+                if not self._put((CHUNK, texts, bytes_read)):
+                    break
+                rows += len(texts)
+        except Exception as error:
+            # Whatever went wrong, poll() must report it or the UI waits forever
+            self._put((ERROR, str(error) or type(error).__name__, None))
+            return
+        # After cancel() the UI stops reading; poll() reports CANCELLED itself
+        self._put((DONE, rows, None))
+
+    def poll(self, handle_chunk, budget=POLL_BUDGET):
+        """Hand waiting chunks to handle_chunk(texts) for about budget seconds.
+
+        Call from the UI thread. Returns None while the import is running,
+        else the final message: (DONE, rows), (CANCELLED, rows) or
+        (ERROR, message).
+        """
+        deadline = time.perf_counter() + budget
+        while time.perf_counter() < deadline:
+            try:
+                kind, value, bytes_read = self.queue.get_nowait()
+            except queue.Empty:
+                if self.cancelled.is_set():
+                    return CANCELLED, self.rows
+                return None
+            if kind != CHUNK:
+                return kind, value
+            if self.cancelled.is_set():
+                return CANCELLED, self.rows
+            handle_chunk(value)
+            self.rows += len(value)
+            self.bytes_read = bytes_read
+        return None
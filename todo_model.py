@@ -0,0 +1,189 @@
+"""Model/view layer for the to-do app.
+
+TaskList holds the tasks and tells its observers exactly what changed
+(one insert, one delete, one move...) instead of "everything changed".
+ListboxView turns those changes into the smallest set of Listbox calls:
+changes made in a burst are queued and applied together once Tk is idle,
+runs of adjacent inserts or deletes become a single Tk call, and if a burst
+touches most of the list it falls back to one full redraw.
+
+ListboxView only needs the insert/delete/size/selection methods of a
+Listbox and a scheduler such as root.after_idle, so it can be driven
+without a display.
+"""
+
+INSERT = "insert"
+DELETE = "delete"
+MOVE = "move"
+UPDATE = "update"
+RESET = "reset"
+EXTEND = "extend"
+
+
+class TaskList:
+    """Ordered task texts with change notification."""
+
+    def __init__(self, tasks=()):
+        self.tasks = list(tasks)
+        self.observers = []
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __getitem__(self, index):
+        return self.tasks[index]
+
+    def __iter__(self):
+        return iter(self.tasks)
+
+    def subscribe(self, observer):
+        """observer(change, index, value) is called after every change."""
+        self.observers.append(observer)
+
+    def unsubscribe(self, observer):
+        self.observers.remove(observer)
+
+    def _notify(self, change, index=None, value=None):
+        for observer in self.observers:
+            observer(change, index, value)
+
+    def append(self, text):
+        self.insert(len(self.tasks), text)
+
+    def insert(self, index, text):
+        index = max(0, min(index, len(self.tasks)))
+        self.tasks.insert(index, text)
+        self._notify(INSERT, index, text)
+
+    def delete(self, index):
+        text = self.tasks.pop(index)
+        self._notify(DELETE, index, text)
+        return text
+
+    def move(self, old_index, new_index):
+        """Move one task; new_index is its position afterwards."""
+        if not 0 <= new_index < len(self.tasks):
+            raise IndexError("task index out of range")
+        text = self.tasks.pop(old_index)
+        self.tasks.insert(new_index, text)
+        self._notify(MOVE, old_index, new_index)
+
+    def update(self, index, text):
+        self.tasks[index] = text
+        self._notify(UPDATE, index, text)
+
+    def extend(self, texts):
+        """Append many tasks; observers see one EXTEND with all the texts."""
+        texts = list(texts)
+        if texts:
+            start = len(self.tasks)
+            self.tasks.extend(texts)
+            self._notify(EXTEND, start, texts)
+
+    def replace(self, tasks):
+        """Swap in a whole new task list (one RESET instead of n changes)."""
+        self.tasks = list(tasks)
+        self._notify(RESET)
+
+
+class ListboxView:
+    """Keeps a Listbox in sync with a TaskList using minimal diffs."""
+
+    # A burst with more changes than this fraction of the list is redrawn
+    # from scratch, which is one delete and one insert call
+    REDRAW_RATIO = 0.5
+
+    def __init__(self, listbox, model, schedule):
+        self.listbox = listbox
+        self.model = model
+        self.schedule = schedule
+        self.pending = []
+        self.scheduled = False
+        self.redraws = 0
+        self.tk_calls = 0
+        model.subscribe(self.changed)
+        self.redraw()
+
+    def changed(self, change, index, value):
+        if change == RESET:
+            self.pending = [(RESET, None, None)]
+        elif not self.pending or self.pending[0][0] != RESET:
+            self.pending.append((change, index, value))
+        if not self.scheduled:
+            self.scheduled = True
+            self.schedule(self.flush)
+
+    def redraw(self):
+        self.listbox.delete(0, "end")
+        if len(self.model):
+            self.listbox.insert("end", *self.model)
+        self.redraws += 1
+        self.tk_calls += 2
+
+    def flush(self):
+        """Apply the queued changes; called once per idle cycle."""
+        pending, self.pending = self.pending, []
+        self.scheduled = False
+        if not pending:
+            return
+        if pending[0][0] == RESET or len(pending) > max(16, len(self.model) * self.REDRAW_RATIO):
+            self.redraw()
+            return
+
+        listbox = self.listbox
+        run_change, run_start, run_values = None, 0, []
+
+        def close_run():
+            if run_change == INSERT:
+                listbox.insert(run_start, *run_values)
+            elif run_change == DELETE:
+                listbox.delete(run_start, run_start + len(run_values) - 1)
+            self.tk_calls += 1
+
+        for change, index, value in pending:
+            if change == INSERT and run_change == INSERT and index == run_start + len(run_values):
+                run_values.append(value)
+                continue
+            if change == EXTEND and run_change == INSERT and index == run_start + len(run_values):
+                run_values.extend(value)
+                continue
+            if change == DELETE and run_change == DELETE:
+                if index == run_start:
+                    run_values.append(value)
+                    continue
+                if index == run_start - 1:
+                    run_start = index
+                    run_values.append(value)
+                    continue
+            if run_change is not None:
+                close_run()
+                run_change = None
+            if change in (INSERT, DELETE):
+                run_change, run_start, run_values = change, index, [value]
+            elif change == EXTEND:
+                run_change, run_start, run_values = INSERT, index, list(value)
+            elif change == MOVE:
+                self._move(index, value)
+            elif change == UPDATE:
+                self._update(index, value)
+        if run_change is not None:
+            close_run()
+
+    def _move(self, old_index, new_index):
+        listbox = self.listbox
+        selected = listbox.selection_includes(old_index)
+        text = listbox.get(old_index)
+        listbox.delete(old_index)
+        listbox.insert(new_index, text)
+        if selected:
+            listbox.selection_set(new_index)
+        self.tk_calls += 2
+
+    def _update(self, index, text):
+        listbox = self.listbox
+        selected = listbox.selection_includes(index)
+        listbox.delete(index)
+        listbox.insert(index, text)
+        if selected:
+            listbox.selection_set(index)
+        self.tk_calls += 2
@@ -0,0 +1,433 @@
+"""SQLite persistence for the to-do app.
+
+TaskStore has the same interface as todo_model.TaskList (len, indexing,
+subscribe, append, delete, move, update...), so VirtualList can show it
+directly, but the tasks live in an SQLite database in WAL mode:
+
+* Every task has a stable integer id. Order is kept in a separate
+  position column, so deleting a task never renumbers others, and moving
+  one gives it the midpoint of its new neighbours. Only when repeated
+  moves into one gap have halved it below MIN_GAP are all positions
+  renumbered, in one pass.
+* Rows are read lazily, one page at a time, and kept in a small LRU page
+  cache. Opening a store with a million tasks reads one COUNT and nothing
+  else; pages are fetched as the list scrolls, using the previous page's
+  last position as a key when possible instead of an OFFSET scan.
+* in_order() puts search results in task order without SQLite: the
+  first call loads every (id, position) once into a TaskOrder, which
+  later edits keep up to date. Large results are ordered lazily, only as
+  far as the rows being drawn.
+* Edits run as plain statements in an open transaction, which is cheap,
+  and a background thread commits them in batches: every FLUSH_INTERVAL
+  seconds, or as soon as BATCH_SIZE edits are pending. With WAL and
+  synchronous=NORMAL a commit does not wait for the disk.
+
+All access to the connection goes through one lock, so reads on the UI
+thread always see the edits that are not committed yet.
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from todo_model import DELETE, EXTEND, INSERT, MOVE, RESET, UPDATE
+
+PAGE_SIZE = 256
+CACHED_PAGES = 64
+BATCH_SIZE = 1000
+FLUSH_INTERVAL = 0.5
+# Closer neighbours than this get all positions renumbered before a move
+MIN_GAP = 1e-6
+# in_order() sorts up to count / ORDER_SCAN_RATIO ids, and above that
+# walks the order ORDER_WALK ids at a time as rows are read
+ORDER_SCAN_RATIO = 16
+ORDER_WALK = 4096
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    position REAL NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_position ON tasks (position);
+"""
+
+
+def read_tasks(path, chunk_rows=5000):
+    """Yield lists of committed (id, text) rows, on a connection of its own.
+
+    Safe to run in another thread while a TaskStore is writing: WAL gives
+    the reader a consistent snapshot.
+    """
+    connection = sqlite3.connect(path)
+    try:
+        cursor = connection.execute("SELECT id, text FROM tasks")
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield rows
+    finally:
+        connection.close()
+
+
+class TaskOrder:
+    """Every task id in list order, and the position of each.
+
+    ids is shared with the OrderedIds handed out since the last edit, so
+    it is copied before a delete or move changes it.
+    """
+
+    def __init__(self, rows=()):
+        self.positions = {}
+        self.ids = []
+        self.shared = False
+        # Ids deleted since the order was loaded
+        self.removed = set()
+        self.extend(rows)
+
+    def extend(self, rows):
+        """Add (id, position) rows at the end."""
+        for task_id, position in rows:
+            self.positions[task_id] = position
+            self.ids.append(task_id)
+
+    def _own(self):
+        if self.shared:
+            self.ids = list(self.ids)
+            self.shared = False
+
+    def delete(self, index, task_id):
+        self._own()
+        del self.ids[index]
+        del self.positions[task_id]
+        self.removed.add(task_id)
+
+    def move(self, old_index, new_index, position):
+        self._own()
+        task_id = self.ids.pop(old_index)
+        self.ids.insert(new_index, task_id)
+        self.positions[task_id] = position
+
+    def clear(self):
+        self.removed.update(self.ids)
+        self.ids = []
+        self.positions = {}
+        self.shared = False
+
+    def renumber(self):
+        self.positions = {task_id: float(number) for number, task_id in enumerate(self.ids, 1)}
+
+    def sort(self, ids):
+        wanted = ids if isinstance(ids, (set, frozenset)) else set(ids)
+        if len(wanted) * ORDER_SCAN_RATIO < len(self.ids):
+            positions = self.positions
+            return sorted((task_id for task_id in wanted if task_id in positions), key=positions.__getitem__)
+        self.shared = True
+        return OrderedIds(self.ids, wanted, len(wanted) - len(wanted & self.removed))
+
+
+class OrderedIds:
+    """Sequence of the wanted ids in task order, found as they are read.
+
+    Reading the first rows of a large result only walks the first few
+    thousand tasks; reading the last walks them all, once.
+    """
+
+    def __init__(self, order, wanted, count):
+        self.order = order
+        self.wanted = wanted
+        self.count = count
+        self.found = []
+        self.walked = 0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += self.count
+        if not 0 <= position < self.count:
+            raise IndexError("result index out of range")
+        while len(self.found) <= position:
+            if self.walked >= len(self.order):
+                raise IndexError("result index out of range")
+            end = self.walked + ORDER_WALK
+            self.found.extend(filter(self.wanted.__contains__, self.order[self.walked:end]))
+            self.walked = end
+        return self.found[position]
+
+    def __iter__(self):
+        for position in range(self.count):
+            yield self[position]
+
+
+class TaskStore:
+    """Persistent, lazily loaded task list with batched background commits."""
+
+    def __init__(self, path, page_size=PAGE_SIZE, cached_pages=CACHED_PAGES,
+                 batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.page_size = page_size
+        self.cached_pages = cached_pages
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.observers = []
+        self.pages = OrderedDict()
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.commits = 0
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.count, last_position = self.connection.execute(
+            "SELECT COUNT(*), MAX(position) FROM tasks").fetchone()
+        self.last_position = last_position or 0.0
+        # Loaded by the first in_order()
+        self.order = None
+
+        self.wake = threading.Event()
+        self.closed = False
+        self.writer = threading.Thread(target=self._write_loop, name="task-store-writer", daemon=True)
+        self.writer.start()
+
+    # TaskList interface
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return self._row(index)[1]
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def subscribe(self, observer):
+        """observer(change, index, value) is called after every change."""
+        self.observers.append(observer)
+
+    def unsubscribe(self, observer):
+        self.observers.remove(observer)
+
+    def _notify(self, change, index=None, value=None):
+        for observer in self.observers:
+            observer(change, index, value)
+
+    def append(self, text):
+        """Add a task at the end and return its id."""
+        self.last_position += 1.0
+        with self.lock:
+            task_id = self.connection.execute(
+                "INSERT INTO tasks (position, text) VALUES (?, ?)", (self.last_position, text)).lastrowid
+        if self.order is not None:
+            self.order.extend([(task_id, self.last_position)])
+        self.count += 1
+        self._invalidate(self.count - 1)
+        self._written(1)
+        self._notify(INSERT, self.count - 1, text)
+        return task_id
+
+    def extend(self, texts):
+        """Append many tasks in one statement and return their ids (a range).
+
+        Observers see a single EXTEND with all the texts.
+        """
+        texts = list(texts)
+        if not texts:
+            return range(0)
+        start = self.last_position
+        rows = [(start + number, text) for number, text in enumerate(texts, 1)]
+        with self.lock:
+            self.connection.executemany("INSERT INTO tasks (position, text) VALUES (?, ?)", rows)
+            # The lock keeps other inserts out, so the new ids are consecutive
+            last_id = self.connection.execute("SELECT last_insert_rowid()").fetchone()[0]
+        self.last_position = rows[-1][0]
+        ids = range(last_id - len(rows) + 1, last_id + 1)
+        if self.order is not None:
+            self.order.extend(zip(ids, (position for position, _ in rows)))
+        first_index = self.count
+        self.count += len(rows)
+        self._invalidate(first_index)
+        self._written(len(rows))
+        self._notify(EXTEND, first_index, texts)
+        return ids
+
+    def delete(self, index):
+        """Delete the task at index and return its text."""
+        task_id, text, _ = self._row(index)
+        self._delete(index, task_id, text)
+        return text
+
+    def move(self, old_index, new_index):
+        """Move one task; new_index is its position afterwards."""
+        if not 0 <= new_index < self.count:
+            raise IndexError("task index out of range")
+        if old_index == new_index:
+            return
+        task_id = self._row(old_index)[0]
+        # Neighbours at the destination, as seen once the task is gone
+        if new_index > old_index:
+            before, after = new_index, new_index + 1
+        else:
+            before, after = new_index - 1, new_index
+        low = self._row(before)[2] if before >= 0 else self._row(0)[2] - 1.0
+        high = self._row(after)[2] if after < self.count else low + 2.0
+        position = (low + high) / 2
+        if high - low < MIN_GAP or not low < position < high:
+            # Floats cannot split this gap much further; tied positions
+            # would break index_of() and keyset paging
+            self._renumber()
+            self.move(old_index, new_index)
+            return
+        with self.lock:
+            self.connection.execute("UPDATE tasks SET position = ? WHERE id = ?", (position, task_id))
+        self.last_position = max(self.last_position, position)
+        if self.order is not None:
+            self.order.move(old_index, new_index, position)
+        self._invalidate(min(old_index, new_index), max(old_index, new_index))
+        self._written(1)
+        self._notify(MOVE, old_index, new_index)
+
+    def update(self, index, text):
+        task_id = self._row(index)[0]
+        with self.lock:
+            self.connection.execute("UPDATE tasks SET text = ? WHERE id = ?", (text, task_id))
+        self._invalidate(index, index)
+        self._written(1)
+        self._notify(UPDATE, index, text)
+
+    def replace(self, tasks):
+        """Replace every task (one RESET instead of n changes)."""
+        with self.lock:
+            self.connection.execute("DELETE FROM tasks")
+        self.count = 0
+        self.last_position = 0.0
+        if self.order is not None:
+            self.order.clear()
+        self.pages.clear()
+        self._written(1)
+        self._notify(RESET)
+        self.extend(tasks)
+
+    def _renumber(self):
+        """Give the tasks positions 1, 2, 3... in their current order."""
+        with self.lock:
+            ids = self.connection.execute("SELECT id FROM tasks ORDER BY position, id").fetchall()
+            self.connection.executemany("UPDATE tasks SET position = ? WHERE id = ?",
+                                        ((float(number), task_id) for number, (task_id,) in enumerate(ids, 1)))
+        self.last_position = float(len(ids))
+        if self.order is not None:
+            self.order.renumber()
+        self.pages.clear()
+        self._written(len(ids))
+
+    # Stable ids
+    def id_at(self, index):
+        return self._row(index)[0]
+
+    def index_of(self, task_id):
+        """Current index of a task id, or None if it was deleted."""
+        with self.lock:
+            row = self.connection.execute("SELECT position FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                return None
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM tasks WHERE position < ?", row).fetchone()[0]
+
+    def in_order(self, ids):
+        """ids sorted by the current order of their tasks; deleted ones are dropped.
+
+        The first call reads the whole order; later ones do not touch
+        the database. A large result is an OrderedIds, which stays valid
+        (as of this call) while the store is edited.
+        """
+        if self.order is None:
+            with self.lock:
+                rows = self.connection.execute("SELECT id, position FROM tasks ORDER BY position").fetchall()
+            self.order = TaskOrder(rows)
+        return self.order.sort(ids)
+
+    def remove(self, task_id):
+        """Delete a task by id; returns False if it no longer exists."""
+        index = self.index_of(task_id)
+        if index is None:
+            return False
+        self._delete(index, task_id, self[index])
+        return True
+
+    def _delete(self, index, task_id, text):
+        with self.lock:
+            self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        if self.order is not None:
+            self.order.delete(index, task_id)
+        self.count -= 1
+        self._invalidate(index)
+        self._written(1)
+        self._notify(DELETE, index, text)
+
+    # Lazy paging
+    def _row(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError("task index out of range")
+        page_number, offset = divmod(index, self.page_size)
+        page = self.pages.get(page_number)
+        if page is None:
+            page = self._load_page(page_number)
+        else:
+            self.pages.move_to_end(page_number)
+        return page[offset]
+
+    def _load_page(self, page_number):
+        previous = self.pages.get(page_number - 1)
+        with self.lock:
+            if previous is not None and len(previous) == self.page_size:
+                # Keyset continuation: an index seek instead of an OFFSET scan
+                rows = self.connection.execute(
+                    "SELECT id, text, position FROM tasks WHERE position > ? ORDER BY position LIMIT ?",
+                    (previous[-1][2], self.page_size)).fetchall()
+            else:
+                rows = self.connection.execute(
+                    "SELECT id, text, position FROM tasks ORDER BY position LIMIT ? OFFSET ?",
+                    (self.page_size, page_number * self.page_size)).fetchall()
+        self.pages[page_number] = rows
+        if len(self.pages) > self.cached_pages:
+            self.pages.popitem(last=False)
+        return rows
+
+    def _invalidate(self, first_index, last_index=None):
+        """Drop cached pages holding first_index..last_index (default: to the end)."""
+        first_page = first_index // self.page_size
+        last_page = None if last_index is None else last_index // self.page_size
+        for page_number in list(self.pages):
+            if page_number >= first_page and (last_page is None or page_number <= last_page):
+                del self.pages[page_number]
+
+    # Batched commits
+    def _written(self, edits):
+        with self.lock:
+            self.pending += edits
+        if self.pending >= self.batch_size:
+            self.wake.set()
+
+    def _write_loop(self):
+        while not self.closed:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.commit()
+
+    def commit(self):
+        with self.lock:
+            if self.pending:
+                self.connection.commit()
+                self.pending = 0
+                self.commits += 1
+
+    def close(self):
+        """Commit what is pending and close the database."""
+        self.closed = True
+        self.wake.set()
+        self.writer.join()
+        self.commit()
+        self.connection.close()
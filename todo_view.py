@@ -0,0 +1,231 @@
+"""Virtualized list widget for the to-do app.
+
+VirtualList draws its rows on a Canvas from a fixed pool of text items,
+one per visible row, and fills them from a data source on demand. Any
+object with len() and indexing works as the source (a plain list, a
+TaskList...); if it also has subscribe(), like TaskList, the widget follows
+its changes. Scrolling, resizing and edits cost O(visible rows) in Tk,
+whatever the length of the list, and the widget holds the same number of
+canvas items for 10 tasks as for 1,000,000.
+
+The scrolling and selection arithmetic is in Viewport, which has no Tk
+dependency.
+"""
+
+import tkinter as tk
+
+from todo_model import DELETE, INSERT, MOVE, RESET
+
+
+class Viewport:
+    """Which rows of a source are visible, and which one is selected."""
+
+    def __init__(self, source, rows=1):
+        self.source = source
+        self.rows = rows
+        self.first = 0
+        self.selected = None
+
+    def __len__(self):
+        return len(self.source)
+
+    def visible(self):
+        return range(self.first, min(len(self.source), self.first + self.rows))
+
+    def scroll_to(self, first):
+        self.first = max(0, min(int(first), len(self.source) - self.rows))
+
+    def scroll(self, rows):
+        self.scroll_to(self.first + rows)
+
+    def moveto(self, fraction):
+        self.scroll_to(float(fraction) * len(self.source))
+
+    def fractions(self):
+        """(top, bottom) for Scrollbar.set."""
+        count = len(self.source)
+        if count <= self.rows:
+            return 0.0, 1.0
+        return self.first / count, min(1.0, (self.first + self.rows) / count)
+
+    def see(self, index):
+        if index < self.first:
+            self.scroll_to(index)
+        elif index >= self.first + self.rows:
+            self.scroll_to(index - self.rows + 1)
+
+    def select(self, index):
+        if index is not None and not 0 <= index < len(self.source):
+            index = None
+        self.selected = index
+        return index
+
+    def changed(self, change, index, value):
+        """Keep the selection and the top row on the same tasks after an edit.
+
+        EXTEND only appends at the end, so it moves neither.
+        """
+        selected = self.selected
+        if change == RESET:
+            self.selected = None
+            self.scroll_to(self.first)
+            return
+        if change == INSERT:
+            if selected is not None and index <= selected:
+                self.selected += 1
+            if index < self.first:
+                self.first += 1
+        elif change == DELETE:
+            if selected == index:
+                self.selected = None
+            elif selected is not None and index < selected:
+                self.selected -= 1
+            if index < self.first:
+                self.first -= 1
+        elif change == MOVE:
+            old_index, new_index = index, value
+            if selected == old_index:
+                self.selected = new_index
+            elif selected is not None:
+                if old_index < selected <= new_index:
+                    self.selected -= 1
+                elif new_index <= selected < old_index:
+                    self.selected += 1
+        self.scroll_to(self.first)
+
+
+class VirtualList(tk.Frame):
+    """Listbox-like widget that only renders the rows in view."""
+
+    def __init__(self, master, source, font=("Arial", 10), row_height=20, **kwargs):
+        super().__init__(master, **kwargs)
+        self.viewport = Viewport(source)
+        self.font = font
+        self.row_height = row_height
+        self.rows = []
+        self.redraw_pending = False
+        self.observer = None
+
+        self.canvas = tk.Canvas(self, bg="white", highlightthickness=0, takefocus=True)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = tk.Scrollbar(self, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.canvas.bind("<Configure>", self._resize)
+        self.canvas.bind("<Button-1>", self._click)
+        self.canvas.bind("<MouseWheel>", lambda event: self._scroll(-1 if event.delta > 0 else 1, "units"))
+        self.canvas.bind("<Button-4>", lambda event: self._scroll(-1, "units"))
+        self.canvas.bind("<Button-5>", lambda event: self._scroll(1, "units"))
+        self.canvas.bind("<Up>", lambda event: self._step(-1))
+        self.canvas.bind("<Down>", lambda event: self._step(1))
+        self.canvas.bind("<Prior>", lambda event: self._scroll(-1, "pages"))
+        self.canvas.bind("<Next>", lambda event: self._scroll(1, "pages"))
+
+        self._follow(source)
+
+    # Listbox-compatible API used by the app
+    def size(self):
+        return len(self.viewport)
+
+    def curselection(self):
+        selected = self.viewport.selected
+        return () if selected is None else (selected,)
+
+    def selection_set(self, index):
+        self.viewport.select(index)
+        self.viewport.see(index)
+        self.redraw()
+
+    def selection_clear(self, first=0, last=None):
+        self.viewport.select(None)
+        self.redraw()
+
+    def see(self, index):
+        if index == tk.END:
+            index = len(self.viewport) - 1
+        self.viewport.see(index)
+        self.redraw()
+
+    def yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"/"pages")."""
+        if args[0] == tk.MOVETO:
+            self.viewport.moveto(args[1])
+            self.redraw()
+        elif args[0] == tk.SCROLL:
+            self._scroll(int(args[1]), args[2])
+
+    def set_source(self, source):
+        """Show a different source, e.g. a filtered view of the tasks."""
+        self._follow(source)
+        self.viewport.source = source
+        self.viewport.changed(RESET, None, None)
+        self.redraw()
+
+    # Internals
+    def _scroll(self, amount, what):
+        if what == tk.PAGES:
+            amount *= max(1, self.viewport.rows - 1)
+        self.viewport.scroll(amount)
+        self.redraw()
+
+    def _step(self, offset):
+        selected = self.viewport.selected
+        index = 0 if selected is None else selected + offset
+        if 0 <= index < len(self.viewport):
+            self.selection_set(index)
+            self.event_generate("<<ListboxSelect>>")
+
+    def _click(self, event):
+        self.canvas.focus_set()
+        index = self.viewport.first + int(event.y) // self.row_height
+        self.viewport.select(index)
+        self.redraw()
+        self.event_generate("<<ListboxSelect>>")
+
+    def _resize(self, event):
+        rows = max(1, event.height // self.row_height)
+        self.viewport.rows = rows
+        self.viewport.scroll_to(self.viewport.first)
+        # Grow the pool of canvas items; it never exceeds the visible rows + 1
+        while len(self.rows) < rows + 1:
+            y = len(self.rows) * self.row_height
+            background = self.canvas.create_rectangle(0, y, 0, y + self.row_height, width=0, fill="")
+            text = self.canvas.create_text(4, y + self.row_height // 2, anchor=tk.W, font=self.font)
+            self.rows.append((background, text))
+        for background, _ in self.rows:
+            coords = self.canvas.coords(background)
+            self.canvas.coords(background, 0, coords[1], event.width, coords[3])
+        self.redraw()
+
+    def _follow(self, source):
+        if self.observer is not None:
+            old_source, observer = self.observer
+            old_source.unsubscribe(observer)
+            self.observer = None
+        if hasattr(source, "subscribe"):
+            source.subscribe(self._changed)
+            self.observer = (source, self._changed)
+
+    def _changed(self, change, index, value):
+        self.viewport.changed(change, index, value)
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.after_idle(self.redraw)
+
+    def redraw(self):
+        """Fill the row pool from the source: O(visible rows)."""
+        self.redraw_pending = False
+        viewport = self.viewport
+        source = viewport.source
+        visible = viewport.visible()
+        for offset, (background, text) in enumerate(self.rows):
+            index = viewport.first + offset
+            if index in visible:
+                selected = index == viewport.selected
+                self.canvas.itemconfigure(text, text=str(source[index]),
+                                          fill="white" if selected else "black")
+                self.canvas.itemconfigure(background, fill="#3875d7" if selected else "")
+            else:
+                self.canvas.itemconfigure(text, text="")
+                self.canvas.itemconfigure(background, fill="")
+        self.scrollbar.set(*viewport.fractions())
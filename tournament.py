@@ -0,0 +1,128 @@
+"""Process-pool tournament between guessing strategies.
+
+Every (strategy, difficulty) pairing is split into work units of
+--chunk-size games. Units are fanned out over a concurrent.futures process
+pool and their GameStats merged afterwards. Each unit draws its secrets from
+the SecretStream substream (difficulty, unit index) of seed and seeds its
+strategy RNG from (seed, strategy, difficulty, unit index), so results for
+a given seed are identical whatever the number of workers or the order
+units finish in. All strategies face the same secrets, which makes their
+differences less noisy.
+
+Example:
+    python tournament.py --games 2000000 --workers 8 --seed 42
+"""
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_simulator import STRATEGIES, simulate
+from secret_stream import SecretStream
+from simple_game import DIFFICULTIES, MAX_ATTEMPTS, GameStats
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def unit_seed(seed, strategy, difficulty, index):
+    """Deterministic strategy RNG seed for one work unit."""
+    return f"{seed}/{strategy}/{difficulty}/{index}"
+
+
+def make_units(strategies, difficulties, games, chunk_size, seed):
+    """Split every pairing into (strategy, difficulty, games, seed, index) units."""
+    units = []
+    for strategy in strategies:
+        for difficulty in difficulties:
+            for index, start in enumerate(range(0, games, chunk_size)):
+                units.append((strategy, difficulty, min(chunk_size, games - start), seed, index))
+    return units
+
+
+def run_unit(unit):
+    """Worker entry point: play one unit, return its stats and timing."""
+    strategy, difficulty, games, seed, index = unit
+    _, max_number = DIFFICULTIES[difficulty]
+    secrets = SecretStream(max_number, seed).substream(int(difficulty), index)
+    start = time.perf_counter()
+    stats = simulate(STRATEGIES[strategy], games, max_number,
+                     seed=unit_seed(seed, strategy, difficulty, index), secrets=secrets)
+    return strategy, difficulty, stats, os.getpid(), time.perf_counter() - start
+
+
+class TournamentResult:
+    """Merged stats per (strategy, difficulty) and throughput per worker."""
+
+    def __init__(self):
+        self.stats = {}
+        # pid -> [games, busy seconds]
+        self.workers = {}
+        self.elapsed = 0.0
+
+    def add(self, strategy, difficulty, stats, pid, elapsed):
+        key = (strategy, difficulty)
+        self.stats.setdefault(key, GameStats(MAX_ATTEMPTS)).merge(stats)
+        worker = self.workers.setdefault(pid, [0, 0.0])
+        worker[0] += stats.games
+        worker[1] += elapsed
+
+    @property
+    def games(self):
+        return sum(stats.games for stats in self.stats.values())
+
+    def standings(self, difficulty):
+        """Strategies for one difficulty, best first: highest win rate, then fewest attempts."""
+        rows = [(strategy, stats) for (strategy, key), stats in self.stats.items() if key == difficulty]
+        return sorted(rows, key=lambda row: (-row[1].win_rate, row[1].average_attempts))
+
+    def worker_report(self):
+        """[(pid, games, games/sec while busy)] sorted by pid."""
+        return [(pid, games, games / busy if busy else 0.0)
+                for pid, (games, busy) in sorted(self.workers.items())]
+
+
+def run_tournament(strategies, difficulties, games, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, seed=0):
+    """Play games per (strategy, difficulty) over a process pool."""
+    units = make_units(strategies, difficulties, games, chunk_size, seed)
+    # Shuffle deterministically so slow strategies do not all land at the end
+    random.Random(seed).shuffle(units)
+
+    result = TournamentResult()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for outcome in pool.map(run_unit, units):
+            result.add(*outcome)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a guessing strategy tournament over a process pool.")
+    parser.add_argument("--strategy", action="append", dest="strategies", choices=sorted(STRATEGIES),
+                        help="strategy to enter (default: all)")
+    parser.add_argument("--games", type=int, default=500_000, help="games per strategy and difficulty")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    strategies = args.strategies or sorted(STRATEGIES)
+    result = run_tournament(strategies, list(DIFFICULTIES), args.games, args.workers, args.chunk_size, args.seed)
+
+    for difficulty, (name, max_number) in DIFFICULTIES.items():
+        print(f"\n{name} (1-{max_number})")
+        for rank, (strategy, stats) in enumerate(result.standings(difficulty), 1):
+            print(f"  {rank}. {strategy:<16} win rate {stats.win_rate:8.4%}  "
+                  f"average attempts {stats.average_attempts:.3f}")
+
+    print("\nWorkers:")
+    for pid, games, rate in result.worker_report():
+        print(f"  pid {pid}: {games:,} games, {rate:,.0f} games/sec")
+    print(f"\nTotal: {result.games:,} games in {result.elapsed:.2f}s "
+          f"({result.games / result.elapsed:,.0f} games/sec)")
+
+
+if __name__ == "__main__":
+    main()